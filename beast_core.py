@@ -3,11 +3,21 @@ import json
 import os
 import collections
 import traceback
+import argparse
 from datetime import datetime
 from utils.config import Config
-from handtracker import HandTracker
+from handtracker import HandTracker, INFERENCE_MODES
+from multi_camera import MultiCameraTracker
 from gesturelogic import GestureEngine
 from eventmapper import EventMapper
+from idle import IdleStateMachine
+from governor import LatencyGovernor, build_levels
+from latency import LatencyTracer
+from cursor import CursorController
+from dispatcher import GestureDispatcher
+from frame_sources import open_source
+from frame_bus import FrameBusWriter
+from features import hand_features
 
 # File paths
 BASE_DIR = os.path.dirname(__file__)
@@ -71,7 +81,7 @@ def write_status(data):
         pass
 
 def capture_debug_snapshot(hands, gestures, frame_info=None):
-    """Capture snapshot for debugging"""
+    """Capture snapshot for debugging (hands are serialized only when dumped)"""
     snapshot = {
         'timestamp': time.time(),
         'datetime': datetime.now().isoformat(),
@@ -87,7 +97,13 @@ def save_debug_dump():
         data = {
             'dump_time': datetime.now().isoformat(),
             'snapshot_count': len(DEBUG_SNAPSHOTS),
-            'snapshots': list(DEBUG_SNAPSHOTS)
+            'snapshots': [
+                dict(snap,
+                     hands=snap['hands'].to_list() if snap['hands'] else None,
+                     # Cached by the gesture engine for that frame
+                     features=hand_features(snap['hands']).to_dict() if snap['hands'] else None)
+                for snap in DEBUG_SNAPSHOTS
+            ]
         }
         
         with open(DEBUG_DUMP_FILE, 'w', encoding='utf-8') as f:
@@ -112,6 +128,29 @@ def print_startup_banner():
     print("\nPress Ctrl+C to stop gracefully")
     print("="*60 + "\n")
 
+def parse_args(argv=None):
+    """Parse command line: [source] [model_complexity] [options]"""
+    parser = argparse.ArgumentParser(description='AirTouchPad gesture processing core')
+    parser.add_argument('source', nargs='?', default='0',
+                        help="Camera index, video file, image directory or 'synthetic' (default: 0)")
+    parser.add_argument('model_complexity', nargs='?', default='0',
+                        help='MediaPipe model complexity, 0=Lite 1=Full (default: 0)')
+    parser.add_argument('--source', dest='extra_sources', action='append', default=[],
+                        metavar='SOURCE',
+                        help='Additional camera or source to track concurrently; '
+                             'repeat for more (hands are taken from the best camera)')
+    parser.add_argument('--inference', choices=INFERENCE_MODES, default=None,
+                        help='Run MediaPipe in this process or in a shared-memory '
+                             'worker process (default: config INFERENCE_MODE)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Playback speed for video/image sources, 0 = as fast as possible')
+    parser.add_argument('--loop', action='store_true',
+                        help='Restart video/image sources when they end')
+    parser.add_argument('--publish', action='store_true',
+                        help='Publish frames and landmarks on the shared-memory frame bus '
+                             'for the preview, debug overlay and calibration tools')
+    return parser.parse_args(argv)
+
 def main():
     # Setup
     setup_logging()
@@ -121,39 +160,77 @@ def main():
     log("AirTouchPad Starting", 'INFO')
     log("="*50, 'INFO')
     
-    # Check for command-line arguments (camera index, model complexity)
-    import sys
-    camera_index = 0
+    args = parse_args()
     model_complexity = 0
+    log(f"Using frame source: {args.source}", 'INFO')
     
-    if len(sys.argv) > 1:
-        try:
-            camera_index = int(sys.argv[1])
-            log(f"Using camera index: {camera_index}", 'INFO')
-        except ValueError:
-            log(f"Invalid camera index: {sys.argv[1]}, using default (0)", 'WARN')
-    
-    if len(sys.argv) > 2:
-        try:
-            model_complexity = int(sys.argv[2])
-            log(f"Using model complexity: {model_complexity}", 'INFO')
-        except ValueError:
-            log(f"Invalid model complexity: {sys.argv[2]}, using default (0)", 'WARN')
+    try:
+        model_complexity = int(args.model_complexity)
+        log(f"Using model complexity: {model_complexity}", 'INFO')
+    except ValueError:
+        log(f"Invalid model complexity: {args.model_complexity}, using default (0)", 'WARN')
     
     # Initialize components
     try:
         log("Initializing configuration...", 'INFO')
         cfg = Config()
         
-        log(f"Initializing hand tracker (camera: {camera_index}, model: {model_complexity})...", 'INFO')
-        tracker = HandTracker(cfg, camera_index, model_complexity)
-        
-        log("Initializing gesture engine...", 'INFO')
-        engine = GestureEngine(cfg)
+        inference = args.inference or cfg.INFERENCE_MODE
+        log(f"Initializing hand tracker (source: {', '.join([args.source] + args.extra_sources)}, model: {model_complexity}, "
+            f"inference: {inference})...", 'INFO')
+        sources = [open_source(spec, cfg, speed=args.speed, loop=args.loop)
+                   for spec in [args.source] + args.extra_sources]
+        if len(sources) > 1:
+            tracker = MultiCameraTracker(cfg, sources, model_complexity, inference=inference)
+        else:
+            tracker = HandTracker(cfg, sources[0], model_complexity, inference=inference)
         
         log("Initializing event mapper...", 'INFO')
         mapper = EventMapper(cfg)
         
+        log("Initializing gesture engine...", 'INFO')
+        # Gestures the mapper cannot act on here are never recognized
+        engine = GestureEngine(cfg, supported=mapper.supported_gestures())
+        log(f"Gesture rules: {len(engine.rules)} active", 'INFO')
+        
+        def injected(g):
+            """Runs on the dispatch thread once a gesture was injected"""
+            latency = ''
+            if 'trace' in g:
+                # Monotonic stage timestamps travel with the event
+                g['trace']['injection'] = time.monotonic()
+                tracer.record_injection(g['trace'])
+                latency = f", {(g['trace']['injection'] - g['trace']['capture']) * 1000:.1f} ms"
+            log(f"Gesture: {g.get('type')} (conf: {g.get('confidence', 1.0):.2f}{latency})", 'GESTURE')
+        
+        # Input injection runs off the tracking loop
+        dispatcher = GestureDispatcher.from_config(cfg, mapper.handle, on_done=injected)
+        
+        power = IdleStateMachine(cfg.IDLE_TIMEOUT) if cfg.IDLE_MODE else None
+        dispatcher.start()
+        
+        cursor = None
+        if cfg.CURSOR_MODE:
+            injection = mapper.pointer_injection()
+            if injection is not None:
+                cursor = CursorController.from_config(cfg, **injection).start()
+                log(f"Cursor mode: {cfg.CURSOR_HAND} hand, injecting at {cfg.CURSOR_RATE} Hz", 'INFO')
+        tracer = LatencyTracer()
+        
+        # Adaptive quality only makes sense for live cameras
+        governor = None
+        if cfg.LATENCY_GOVERNOR and tracker.source.live:
+            levels = build_levels(cfg.CAP_WIDTH, cfg.CAP_HEIGHT, model_complexity,
+                                  tracker.max_num_hands, cfg.GOVERNOR_MIN_FPS)
+            governor = LatencyGovernor(levels, cfg.LATENCY_BUDGET_MS,
+                                       log=lambda m: log(m, 'GOVERNOR'))
+            log(f"Latency governor: {cfg.LATENCY_BUDGET_MS} ms budget, {len(levels)} levels", 'INFO')
+        
+        bus = None
+        if args.publish or cfg.PUBLISH_FRAMES:
+            log("Starting frame bus...", 'INFO')
+            bus = FrameBusWriter(max_width=cfg.CAP_WIDTH, max_height=cfg.CAP_HEIGHT)
+        
         log("Initialization complete - Starting main loop", 'INFO')
         
     except Exception as e:
@@ -188,10 +265,50 @@ def main():
             try:
                 # Get hand tracking data
                 hands, frame = tracker.step()
+                if frame is None and tracker.exhausted:
+                    log("Frame source finished", 'INFO')
+                    break
                 frame_count += 1
+                stepped = time.perf_counter()
                 
-                # Process gestures
-                gestures = engine.update(hands)
+                # Share frame and landmarks with attached tools
+                if bus is not None:
+                    if frame is not None:
+                        bus.publish(frame, hands, tracker.latest_timestamp)
+                    else:
+                        bus.beat()
+                
+                # Power state: low rate/resolution while no hands are present
+                if power is not None:
+                    if not power.idle:
+                        power.frame_processed()
+                    transition = power.update(bool(hands), tracker.latest_timestamp)
+                    if transition == 'sleep':
+                        tracker.set_capture_mode(cfg.IDLE_WIDTH, cfg.IDLE_HEIGHT, cfg.IDLE_FPS)
+                        log(f"No hands for {cfg.IDLE_TIMEOUT}s - entering idle mode", 'INFO')
+                    elif transition == 'wake':
+                        if governor is not None:
+                            governor.apply(tracker, force=True)
+                        else:
+                            tracker.set_capture_mode(cfg.CAP_WIDTH, cfg.CAP_HEIGHT, tracker.nominal_fps)
+                        log("Hand detected - leaving idle mode", 'INFO')
+                
+                # Process gestures (idle frames are detection only)
+                trace = None
+                if power is not None and power.idle:
+                    # No hands: nothing may stay pressed while idle
+                    gestures = engine.release()
+                    if cursor is not None:
+                        cursor.feed(None)
+                else:
+                    # A hand handed to another camera jumps; restart its motion state
+                    engine.forget(tracker.switched)
+                    gestures = engine.update(hands)
+                    if cursor is not None and frame is not None:
+                        cursor.feed(engine.pointer(cfg.CURSOR_HAND, cfg.CURSOR_LANDMARK))
+                    if frame is not None:
+                        trace = tracer.trace(tracker.latest_timestamp, tracker.latest_inferred)
+                        tracer.record_frame(trace)
                 
                 # Capture debug snapshot every 10th frame or when gesture detected
                 if gestures or frame_count % 10 == 0:
@@ -205,8 +322,16 @@ def main():
                 if gestures:
                     for g in gestures:
                         gesture_count += 1
-                        mapper.handle(g)
-                        log(f"Gesture #{gesture_count}: {g.get('type')} (conf: {g.get('confidence', 1.0):.2f})", 'GESTURE')
+                        if trace is not None:
+                            g['trace'] = dict(trace)
+                        dispatcher.submit(g)
+                
+                # Keep inference + gesture handling within the latency budget
+                idle = power is not None and power.idle
+                if governor is not None and frame is not None and not idle:
+                    pipeline_ms = (tracker.last_process_time + time.perf_counter() - stepped) * 1000
+                    if governor.update(pipeline_ms):
+                        governor.apply(tracker)
                 
                 # Update status file periodically (every 5 seconds)
                 if time.time() - last_status_update > 5:
@@ -220,7 +345,15 @@ def main():
                         'error_count': error_count,
                         'fps': frame_count / runtime if runtime > 0 else 0,
                         'recent_gestures': gestures,
-                        'hand_count': len(hands) if hands else 0
+                        'hand_count': len(hands) if hands else 0,
+                        'capture': tracker.capture_stats(),
+                        'roi': tracker.roi.stats() if tracker.roi else None,
+                        'power': power.stats() if power else None,
+                        'governor': governor.stats() if governor else None,
+                        'cameras': tracker.camera_stats() if isinstance(tracker, MultiCameraTracker) else None,
+                        'latency_ms': tracer.stats(),
+                        'cursor': cursor.stats() if cursor else None,
+                        'dispatch': dispatcher.stats()
                     }
                     write_status(status)
                     last_status_update = time.time()
@@ -234,7 +367,13 @@ def main():
             
             # Frame timing
             loop_time = time.time() - loop_start
-            sleep_time = max(0, 0.01 - loop_time)  # Target ~100 FPS max
+            if power is not None and power.idle:
+                frame_interval = 1.0 / cfg.IDLE_FPS
+            elif governor is not None and governor.level.fps:
+                frame_interval = 1.0 / governor.level.fps
+            else:
+                frame_interval = 0.01
+            sleep_time = max(0, frame_interval - loop_time)  # Target ~100 FPS max when active
             time.sleep(sleep_time)
             
     except KeyboardInterrupt:
@@ -258,7 +397,19 @@ def main():
         print(f"  Frames Processed: {frame_count}")
         print(f"  Gestures Detected: {gesture_count}")
         print(f"  Errors: {error_count}")
+        try:
+            print(f"  Dropped Camera Frames: {tracker.capture_stats()['dropped']}")
+        except Exception:
+            pass
         print(f"  Average FPS: {frame_count/runtime:.1f}" if runtime > 0 else "  Average FPS: N/A")
+        try:
+            for stage in ('capture_to_engine', 'end_to_end'):
+                summary = tracer.stats()[stage]
+                if summary:
+                    print(f"  Latency {stage}: p50 {summary['p50']:.1f} ms, "
+                          f"p95 {summary['p95']:.1f} ms, p99 {summary['p99']:.1f} ms")
+        except Exception:
+            pass
         print("="*60)
         
         # Save debug dump
@@ -266,6 +417,16 @@ def main():
             print("\nSaving debug information...")
             save_debug_dump()
         
+        if bus is not None:
+            bus.close()
+        
+        if cursor is not None:
+            cursor.stop()
+        
+        # Let queued gestures finish before the tracker goes away
+        dispatcher.stop()
+        mapper.close()
+        
         # Shutdown tracker
         try:
             tracker.shutdown()
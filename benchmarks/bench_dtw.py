@@ -0,0 +1,85 @@
+"""
+Per-frame cost of streaming DTW template matching.
+
+Usage:
+    python benchmarks/bench_dtw.py [--templates 12,24,48] [--length 32] [--frames 3000]
+
+Random smooth templates are matched against a random smooth trajectory (the
+usual case: nothing matches most of the time). "pruned" is TemplateMatcher as
+used by the gesture engine; "full" sweeps every cell of every template each
+frame, i.e. plain incremental DTW without abandoning.
+"""
+import os
+import sys
+import math
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dtw import StreamingDTW, Template, TemplateMatcher, direction, INF
+
+
+class FullDTW(StreamingDTW):
+    """Same recurrence, no budget: every cell is computed every frame"""
+
+    __slots__ = ()
+
+    def push(self, feature):
+        fx, fy = feature
+        prev = self.column
+        column = []
+        for j, (px, py) in enumerate(self.points):
+            d = (fx - px) ** 2 + (fy - py) ** 2
+            if j == 0:
+                column.append(d)
+            else:
+                column.append(min(min(prev[j], prev[j - 1]) + d, (prev[j - 2] if j > 1 else INF) + 2 * d))
+        self.column = column
+        if column[-1] <= self.budget:
+            self.reset()
+            return column[-1] / len(self.points)
+        return None
+
+
+def trajectory(rng, n):
+    heading = rng.uniform(0, 2 * math.pi)
+    out = []
+    for _ in range(n):
+        heading += rng.gauss(0, 0.3)
+        speed = abs(rng.gauss(1.0, 0.8))
+        out.append(direction(speed * math.cos(heading), speed * math.sin(heading)))
+    return out
+
+
+def measure(matcher, frames):
+    start = time.perf_counter()
+    matches = 0
+    for f in frames:
+        matches += len(matcher.push('right', f))
+    return (time.perf_counter() - start) / len(frames) * 1e6, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--templates', default='12,24,48', help='Comma-separated template counts')
+    parser.add_argument('--length', type=int, default=32, help='Points per template')
+    parser.add_argument('--frames', type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    frames = trajectory(rng, args.frames)
+
+    print(f"{'templates':>9} {'pruned us/frame':>16} {'full us/frame':>14} {'matches':>8}")
+    for count in (int(c) for c in args.templates.split(',')):
+        templates = [Template(f't{i}', 'screenshot', trajectory(rng, args.length)) for i in range(count)]
+        pruned, matches = measure(TemplateMatcher(templates), frames)
+        full_matcher = TemplateMatcher(templates)
+        full_matcher._state['right'] = [FullDTW(t, full_matcher.threshold) for t in templates]
+        full, _ = measure(full_matcher, frames)
+        print(f"{count:>9} {pruned:>16.1f} {full:>14.1f} {matches:>8}")
+
+
+if __name__ == '__main__':
+    main()
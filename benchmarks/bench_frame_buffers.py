@@ -0,0 +1,106 @@
+"""
+Allocation and time per frame for the capture/convert path, fresh vs reused buffers.
+
+Usage:
+    python benchmarks/bench_frame_buffers.py [--source video.mp4] [--frames 300] [--size 1280x720]
+
+Without --source a temporary MJPG clip is generated, so no camera is needed.
+"fresh" is the old path: read() and cvtColor() allocate every frame.
+"reused" decodes with read(image=...) and converts with cvtColor(dst=...).
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from frame_sources import synthetic_frames
+
+
+def make_clip(path, width, height, frames):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    for frame in synthetic_frames(width, height, frames):
+        writer.write(frame)
+    writer.release()
+
+
+def fresh_path(cap, state):
+    ret, frame = cap.read()
+    if not ret:
+        return False
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return True
+
+
+def reused_path(cap, state):
+    ret, frame = cap.read(state.get('frame'))
+    if not ret:
+        return False
+    state['frame'] = frame
+    rgb = state.get('rgb')
+    if rgb is None or rgb.shape != frame.shape:
+        rgb = state['rgb'] = np.empty_like(frame)
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+    return True
+
+
+def measure(path, fn, frames, trace):
+    cap = cv2.VideoCapture(path)
+    state = {}
+    fn(cap, state)  # warm-up: first frame allocates in both paths
+
+    per_frame = []
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        if not fn(cap, state):
+            break
+        if trace:
+            per_frame.append(tracemalloc.get_traced_memory()[1] - before)
+        else:
+            per_frame.append(None)
+    elapsed = time.perf_counter() - t0
+    if trace:
+        tracemalloc.stop()
+    cap.release()
+    return len(per_frame), elapsed, per_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', help='Video file (default: generated clip)')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--size', default='1280x720', help='Generated clip size WxH')
+    args = parser.parse_args()
+
+    tmpdir = None
+    path = args.source
+    if path is None:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, 'clip.avi')
+        make_clip(path, width, height, args.frames + 1)
+
+    print(f"{'path':<8} {'frames':>6} {'us/frame':>9} {'alloc KiB/frame':>16}")
+    for name, fn in (('fresh', fresh_path), ('reused', reused_path)):
+        n, elapsed, _ = measure(path, fn, args.frames, trace=False)
+        _, _, allocs = measure(path, fn, args.frames, trace=True)
+        alloc = sum(allocs) / len(allocs) / 1024 if allocs else 0.0
+        print(f"{name:<8} {n:>6} {elapsed / max(n, 1) * 1e6:>9.1f} {alloc:>16.1f}")
+
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
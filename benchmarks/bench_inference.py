@@ -0,0 +1,93 @@
+"""
+Compare in-process and worker-process MediaPipe inference.
+
+Usage:
+    python benchmarks/bench_inference.py [--source 0|video.mp4|images/|synthetic] [--frames 300] [--load 0.5]
+
+--load starts a pure-Python background thread that holds the GIL for the
+given fraction of the time, standing in for logging, status writes and
+pyautogui dispatch in beast_core.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.config import Config
+from handtracker import HandTracker, INFERENCE_MODES
+from frame_sources import open_source
+
+
+def gil_load(stop, duty):
+    """Spin in Python code for `duty` of every 10 ms slice"""
+    while not stop.is_set():
+        t_end = time.perf_counter() + 0.01 * duty
+        x = 0
+        while time.perf_counter() < t_end:
+            x += 1
+        time.sleep(0.01 * (1 - duty))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+def run(mode, source, frames, model_complexity, load):
+    cfg = Config()
+    # Recorded sources are replayed as fast as possible
+    tracker = HandTracker(cfg, open_source(source, cfg, speed=0), model_complexity,
+                          threaded=False, inference=mode)
+
+    stop = threading.Event()
+    if load > 0:
+        threading.Thread(target=gil_load, args=(stop, load), daemon=True).start()
+
+    # Warm-up (model load, first-frame allocation)
+    for _ in range(10):
+        tracker.step()
+
+    times = []
+    try:
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            hands, frame = tracker.step()
+            if frame is None:
+                break
+            times.append((time.perf_counter() - t0) * 1000)
+    finally:
+        stop.set()
+        tracker.shutdown()
+
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default='0',
+                        help="Camera index, video file, image directory or 'synthetic'")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--model', type=int, default=0, help='Model complexity')
+    parser.add_argument('--load', type=float, default=0.0,
+                        help='Fraction of time a background thread holds the GIL (0-1)')
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'frames':>6} {'mean ms':>8} {'p50':>7} {'p95':>7} {'fps':>6}")
+    for mode in INFERENCE_MODES:
+        times = run(mode, args.source, args.frames, args.model, args.load)
+        if not times:
+            print(f"{mode:<10} no frames")
+            continue
+        mean = sum(times) / len(times)
+        print(f"{mode:<10} {len(times):>6} {mean:>8.2f} {percentile(times, 50):>7.2f} "
+              f"{percentile(times, 95):>7.2f} {1000 / mean:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
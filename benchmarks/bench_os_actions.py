@@ -0,0 +1,83 @@
+"""
+Per-action latency of OS action backends against the shell-spawn path.
+
+Usage:
+    python benchmarks/bench_os_actions.py [--steps 1,4] [--repeat 30]
+
+Stand-in `pactl` and `amixer` scripts (which do nothing) and a fake sysfs
+backlight directory are used, so this measures the dispatch overhead only and
+runs without audio or display hardware. "spawn" is the previous path: a
+shutil.which() lookup and a shell per step. "pactl" runs the tool resolved
+once, without a shell, with all steps in one call; "amixer -s" writes to one
+long-lived process; "sysfs" compares re-opening the brightness files per step
+with the held-open handle.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from os_handlers import _run_cmd, PactlAudio, AmixerSession, SysfsBacklight
+from synthetic import fake_tool, fake_backlight
+
+if os.name == 'nt':
+    sys.exit('Needs a POSIX shell for the stand-in tools')
+
+
+def spawn_volume_up():
+    """The pre-backend os_handlers.volume_up Linux path"""
+    if shutil.which('pactl'):
+        return _run_cmd('pactl set-sink-volume @DEFAULT_SINK@ +5%')
+    return False
+
+
+def reopen_backlight(device, percent):
+    """The pre-backend sysfs fallback: open both files on every call"""
+    with open(os.path.join(device, 'max_brightness')) as f:
+        max_bright = int(f.read().strip())
+    with open(os.path.join(device, 'brightness'), 'w') as f:
+        f.write(str(int(max_bright * percent / 100)))
+
+
+def measure(action, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--steps', default='1,4', help='Comma-separated steps per action (a coalesced burst)')
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pactl = fake_tool(tmp, 'pactl', 'exit 0')
+        amixer = AmixerSession(fake_tool(tmp, 'amixer', 'cat > /dev/null'))
+        os.environ['PATH'] = tmp + os.pathsep + os.environ.get('PATH', '')
+        device = fake_backlight(tmp, level=500, name='backlight')
+        backlight = SysfsBacklight(device)
+        pactl_audio = PactlAudio(pactl)
+
+        print(f"{'backend':>16} {'steps':>6} {'ms/action':>10}")
+        for steps in (int(s) for s in args.steps.split(',')):
+            rows = [
+                ('spawn (shell)', lambda: [spawn_volume_up() for _ in range(steps)]),
+                ('pactl', lambda: pactl_audio.change(steps)),
+                ('amixer -s', lambda: amixer.change(steps)),
+                ('sysfs reopen', lambda: [reopen_backlight(device, 50) for _ in range(steps)]),
+                ('sysfs held', lambda: backlight.change(steps)),
+            ]
+            for name, action in rows:
+                print(f"{name:>16} {steps:>6} {measure(action, args.repeat):>10.3f}")
+        amixer.close()
+        backlight.close()
+
+
+if __name__ == '__main__':
+    main()
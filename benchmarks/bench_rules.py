@@ -0,0 +1,142 @@
+"""
+Per-frame rule evaluation cost as the rule table grows from 6 to 31 rules.
+
+Usage:
+    python benchmarks/bench_rules.py [--frames 3000] [--counts 6,12,18,24,31] [--repeat 3]
+
+A synthetic two-hand clip (pinches, swipes, open palms) is run through
+GestureEngine.update once with every rule loaded, recording each
+RuleSet.evaluate call (hand, flags, changed flags, variables). The calls are
+then replayed against the first N rules of gestures.json, so rule evaluation
+is timed on its own; past the end of the file rules are repeated under new
+names. "indexed" is the compiled RuleSet (candidate rules memoized per flag
+combination); "scan" re-checks every rule's preconditions each frame, as a
+hand-written if-chain would. "candidates" is how many rules per frame passed
+their flag preconditions and had their expressions evaluated.
+
+"engine" is the whole GestureEngine.update per frame, for scale: most of it
+is filtering and feature extraction, which does not depend on the rule
+count. Two-hand features are only computed once a 'both' rule is loaded.
+Each figure is the best of --repeat runs.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gesturelogic import GestureEngine
+from landmarks import HandLandmarks
+from rules import RuleSet, DEFAULT_RULES_FILE
+from utils.config import Config
+from synthetic import hand_points
+
+
+class ScanRuleSet(RuleSet):
+    def candidates(self, hand, state, changed):
+        return self.match(hand, state, changed)
+
+
+class RecordingRuleSet(RuleSet):
+    """Evaluates normally and keeps every call for replay"""
+
+    def __init__(self, specs, cfg):
+        super().__init__(specs, cfg)
+        self.calls = []
+
+    def evaluate(self, hand, state, changed, variables):
+        if callable(variables):
+            variables = variables()
+        self.calls.append((hand, state, changed, variables))
+        return super().evaluate(hand, state, changed, variables)
+
+
+def clip(frames):
+    out = []
+    for i in range(frames):
+        phase = i % 60
+        sway = 0.1 * np.sin(i / 7.0)
+        left = hand_points(0.05 + sway, 0.45, pinch=phase < 10)
+        right = hand_points(0.5 - sway, 0.45, pinch=20 <= phase < 35)
+        out.append(HandLandmarks(np.stack([left, right]), ['left', 'right']))
+    return out
+
+
+def rule_specs(count):
+    with open(DEFAULT_RULES_FILE, 'r', encoding='utf-8') as f:
+        base = json.load(f)['rules']
+    specs = []
+    while len(specs) < count:
+        for spec in base[:count - len(specs)]:
+            copy = dict(spec)
+            if len(specs) >= len(base):
+                copy['type'] = f"{spec['type']}_{len(specs) // len(base)}"
+            specs.append(copy)
+    return specs
+
+
+def run_engine(cfg, ruleset, frames):
+    """us/frame of GestureEngine.update over the clip"""
+    engine = GestureEngine(cfg)
+    engine.rules = ruleset
+    # Timestamps of a 30 fps camera so velocities and cooldowns are realistic
+    timestamps = [i / 30 for i in range(len(frames))]
+    for hands in frames:
+        hands._features = None
+    start = time.perf_counter()
+    engine.update_batch(frames, timestamps)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(frames) * 1e6
+
+
+def replay(ruleset, calls, frames):
+    """us/frame of RuleSet.evaluate over recorded calls"""
+    # The engine skips the two-hand context without 'both' rules
+    calls = [c for c in calls if c[0] != 'both' or ruleset.handles('both')]
+    # Lazy variables, as the engine passes them
+    calls = [(hand, state, changed, lambda v=v: v) for hand, state, changed, v in calls]
+    evaluate = ruleset.evaluate
+    start = time.perf_counter()
+    for hand, state, changed, variables in calls:
+        evaluate(hand, state, changed, variables)
+    elapsed = time.perf_counter() - start
+    evaluated = sum(len(ruleset.candidates(hand, state, changed)) for hand, state, changed, _ in calls)
+    return elapsed / frames * 1e6, evaluated / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--counts', default='6,12,18,24,31', help='Comma-separated rule counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per figure (best is shown)')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    cfg = Config(os.path.join(tmpdir.name, 'config.json'))
+    frames = clip(args.frames)
+
+    counts = [int(c) for c in args.counts.split(',')]
+    recorder = RecordingRuleSet(rule_specs(max(counts)), cfg)
+    run_engine(cfg, recorder, frames)
+
+    print(f"{'rules':>5} {'candidates':>10} {'indexed us/frame':>17} {'scan us/frame':>14} "
+          f"{'engine us/frame':>16}")
+    for count in counts:
+        specs = rule_specs(count)
+        indexed, evaluated = min(replay(RuleSet(specs, cfg), recorder.calls, len(frames))
+                                 for _ in range(args.repeat))
+        scan, _ = min(replay(ScanRuleSet(specs, cfg), recorder.calls, len(frames))
+                      for _ in range(args.repeat))
+        engine = min(run_engine(cfg, RuleSet(specs, cfg), frames) for _ in range(args.repeat))
+        print(f"{count:>5} {evaluated:>10.2f} {indexed:>17.1f} {scan:>14.1f} {engine:>16.1f}")
+
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Per-action cost of X11 input injection: XTEST on a held connection vs pyautogui.
+
+Usage:
+    python benchmarks/bench_xtest.py [--count 500] [--display :99]
+
+Runs against $DISPLAY, or starts a headless Xvfb server when no display is
+set (apt install xvfb). Each row injects `count` actions and then waits for
+the server to process them (one sync), so queued-but-unsent events are not
+counted as done. "xtest" flushes after every action, "xtest batch" sends the
+whole burst with one flush; pyautogui runs with _pause=False.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def start_xvfb(display):
+    """Start Xvfb on `display` and wait for its socket; returns the process"""
+    if not shutil.which('Xvfb'):
+        sys.exit('No X display and no Xvfb found (apt install xvfb)')
+    proc = subprocess.Popen(['Xvfb', display, '-screen', '0', '1280x720x24', '-nolisten', 'tcp'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket = f'/tmp/.X11-unix/X{display.lstrip(":")}'
+    deadline = time.time() + 10
+    while not os.path.exists(socket):
+        if proc.poll() is not None or time.time() > deadline:
+            proc.kill()
+            sys.exit(f'Xvfb {display} did not start')
+        time.sleep(0.05)
+    os.environ['DISPLAY'] = display
+    return proc
+
+
+def actions(count):
+    """name -> [args per action]"""
+    return {
+        'move': [(100 + i % 500, 100 + (i * 7) % 400) for i in range(count)],
+        'scroll': [(1 if i % 2 else -1,) for i in range(count)],
+        'click': [() for _ in range(count)],
+    }
+
+
+def measure(run, sync, calls):
+    start = time.perf_counter()
+    run(calls)
+    sync()
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500, help='Actions per row')
+    parser.add_argument('--display', default=':99', help='Xvfb display when $DISPLAY is unset')
+    args = parser.parse_args()
+
+    xvfb = None if os.environ.get('DISPLAY') else start_xvfb(args.display)
+    try:
+        from xtest_input import XTestInput
+        xtest = XTestInput(os.environ['DISPLAY'])
+
+        def each(method):
+            return lambda calls: [method(*a) for a in calls]
+
+        def batched(method):
+            def run(calls):
+                with xtest.batch():
+                    for a in calls:
+                        method(*a)
+            return run
+
+        backends = [
+            ('xtest', {'move': each(xtest.move_to), 'scroll': each(xtest.scroll),
+                       'click': each(xtest.click)}, xtest.sync),
+            ('xtest batch', {'move': batched(xtest.move_to), 'scroll': batched(xtest.scroll),
+                             'click': batched(xtest.click)}, xtest.sync),
+        ]
+        try:
+            import pyautogui
+            pyautogui.FAILSAFE = False
+            backends.append(('pyautogui', {
+                'move': each(lambda x, y: pyautogui.moveTo(x, y, _pause=False)),
+                'scroll': each(lambda n: pyautogui.scroll(n, _pause=False)),
+                'click': each(lambda: pyautogui.click(_pause=False)),
+            }, xtest.sync))
+        except Exception as e:
+            print(f'pyautogui unavailable: {e}')
+
+        print(f"{'backend':>12} {'action':>7} {'us/action':>10}")
+        for name, runs, sync in backends:
+            for action, calls in actions(args.count).items():
+                print(f"{name:>12} {action:>7} {measure(runs[action], sync, calls):>10.1f}")
+        xtest.close()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+if __name__ == '__main__':
+    main()
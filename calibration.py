@@ -1,15 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import time, threading, json, os
-from handtracker import HandTracker
+import time, threading, json, os, sys
+from frame_bus import open_tracker
+from features import hand_features
+from filters import LandmarkFilter
+from dtw import Template, direction, trim_still, resample, save_template
+from landmarks import THUMB_TIP, INDEX_TIP, MIDDLE_TIP
 from utils.config import Config
 
 CFG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+# Actions a recorded trajectory template can trigger (EventMapper event types)
+TEMPLATE_ACTIONS = ('app_switch', 'task_view', 'show_desktop', 'screenshot', 'media_toggle',
+                    'next_track', 'prev_track', 'mute_unmute', 'lock_screen', 'enter')
 
 class Calibrator:
-    def __init__(self):
+    def __init__(self, source=None):
         self.cfg = Config()
-        self.tracker = HandTracker(self.cfg)
+        # Attaches to the running core's frame bus when no source is given
+        self.tracker = open_tracker(self.cfg, source)
         self.samples = {'r_pinch':[], 'l_pinch':[], 'two_finger':[]}
         self.root = tk.Tk(); self.root.title('Calibration')
         ttk.Label(self.root, text='Calibration: follow prompts').pack(pady=6)
@@ -19,6 +27,13 @@ class Calibrator:
         ttk.Button(self.root, text='Calibrate Left Pinch', command=lambda: threading.Thread(target=self.record, args=('l_pinch',), daemon=True).start()).pack(pady=4)
         ttk.Button(self.root, text='Calibrate Two-Finger', command=lambda: threading.Thread(target=self.record, args=('two_finger',), daemon=True).start()).pack(pady=4)
         ttk.Button(self.root, text='Compute & Save', command=self.compute).pack(pady=8)
+        ttk.Separator(self.root).pack(fill='x', pady=4)
+        ttk.Label(self.root, text='Trajectory gesture (right index finger)').pack()
+        self.template_name = tk.StringVar(value='circle')
+        self.template_action = tk.StringVar(value=TEMPLATE_ACTIONS[0])
+        ttk.Entry(self.root, textvariable=self.template_name).pack(pady=2)
+        ttk.Combobox(self.root, textvariable=self.template_action, values=TEMPLATE_ACTIONS, state='readonly').pack(pady=2)
+        ttk.Button(self.root, text='Record Template', command=lambda: threading.Thread(target=self.record_template, daemon=True).start()).pack(pady=4)
         ttk.Button(self.root, text='Exit', command=self.close).pack(pady=4)
         self.root.mainloop()
     def record(self, key):
@@ -26,19 +41,43 @@ class Calibrator:
         t0 = time.time()
         while time.time() - t0 < 5:
             hands, frame = self.tracker.step()
+            if frame is None and self.tracker.exhausted: break
             if hands:
-                for lm,label in hands:
+                # Same cached per-frame features the gesture engine reads
+                feats = hand_features(hands)
+                d_ti_all = feats.pair(THUMB_TIP, INDEX_TIP).tolist()
+                d_im_all = feats.pair(INDEX_TIP, MIDDLE_TIP).tolist()
+                for d_ti, d_im, label in zip(d_ti_all, d_im_all, hands.labels):
                     if key=='r_pinch' and label.startswith('r'):
-                        d = ((lm[4][0]-lm[8][0])**2 + (lm[4][1]-lm[8][1])**2)**0.5
-                        self.samples[key].append(d)
+                        self.samples[key].append(d_ti)
                     if key=='l_pinch' and label.startswith('l'):
-                        d = ((lm[4][0]-lm[8][0])**2 + (lm[4][1]-lm[8][1])**2)**0.5
-                        self.samples[key].append(d)
+                        self.samples[key].append(d_ti)
                     if key=='two_finger':
                         # measure index-middle on first hand
-                        d = ((lm[8][0]-lm[12][0])**2 + (lm[8][1]-lm[12][1])**2)**0.5
-                        self.samples[key].append(d)
+                        self.samples[key].append(d_im)
         self.status.config(text=f'Recorded {len(self.samples[key])} samples for {key}')
+    def record_template(self, seconds=3.0):
+        name, action = self.template_name.get().strip() or 'gesture', self.template_action.get()
+        self.status.config(text=f'Draw "{name}" with your right index finger...')
+        # Same filtered velocities the gesture engine matches against
+        lm_filter = LandmarkFilter.from_config(self.cfg)
+        features = []
+        t0 = time.time()
+        while time.time() - t0 < seconds:
+            hands, frame = self.tracker.step()
+            if frame is None and self.tracker.exhausted: break
+            if not hands: continue
+            lm_filter(hands, time.time())
+            for idx, label in enumerate(hands.labels):
+                if label.startswith('r'):
+                    features.append(direction(*lm_filter.velocity[idx, INDEX_TIP, :2].tolist()))
+                    break
+        points = resample(trim_still(features))
+        if len(points) < 4:
+            self.status.config(text='No movement recorded, try again')
+            return
+        save_template(Template(name, action, points), self.cfg.TEMPLATE_FILE)
+        self.status.config(text=f'Saved template "{name}" ({len(points)} points) -> {action}')
     def compute(self):
         cfg = self.cfg
         # compute mean and set thresholds slightly above mean
@@ -56,4 +95,6 @@ class Calibrator:
         except: pass
         self.root.destroy()
 
-if __name__=='__main__': Calibrator()
+# Usage: python calibration.py [camera index | video file | image directory]
+# Without a source it attaches to a running core (beast_core.py --publish), else camera 0
+if __name__=='__main__': Calibrator(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,275 @@
+import os
+import sys
+import json
+import glob
+import struct
+import threading
+
+# ---------------------------------------------------------------------------
+# Linux: V4L2 ioctls on the device node (no capture stream is started)
+# ---------------------------------------------------------------------------
+
+def _IOC(direction, nr, size):
+    return (direction << 30) | (size << 16) | (ord('V') << 8) | nr
+
+_CAPABILITY = struct.Struct('16s32s32sIII3I')
+_FMTDESC = struct.Struct('III32sII3I')
+_FRMSIZE = struct.Struct('III6I2I')
+_FRMIVAL = struct.Struct('IIIII6I2I')
+
+VIDIOC_QUERYCAP = _IOC(2, 0, _CAPABILITY.size)
+VIDIOC_ENUM_FMT = _IOC(3, 2, _FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES = _IOC(3, 74, _FRMSIZE.size)
+VIDIOC_ENUM_FRAMEINTERVALS = _IOC(3, 75, _FRMIVAL.size)
+
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_FRMSIZE_TYPE_DISCRETE = 1
+V4L2_FRMIVAL_TYPE_DISCRETE = 1
+
+
+def _cstr(raw):
+    return raw.split(b'\0', 1)[0].decode('utf-8', 'replace')
+
+
+def _enum(fd, request, st, fields):
+    """Run an ENUM ioctl with index 0, 1, ... until the driver says stop"""
+    import fcntl
+    # The leading index and request fields are all u32; the rest starts zeroed
+    head = struct.Struct('I' * (1 + len(fields)))
+    index = 0
+    while True:
+        buf = bytearray(st.size)
+        head.pack_into(buf, 0, index, *fields)
+        try:
+            fcntl.ioctl(fd, request, buf)
+        except OSError:
+            return
+        yield st.unpack(buf)
+        index += 1
+
+
+def _v4l2_probe(path, known=None):
+    """
+    Identity and capture modes of one /dev/videoN node, None if not a capture device
+
+    Args:
+        path: Device node
+        known: Dict identity -> cached camera; modes of a known device are
+            reused instead of being enumerated again
+    """
+    import fcntl
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        buf = bytearray(_CAPABILITY.size)
+        try:
+            fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+        except OSError:
+            return None
+        driver, card, bus_info, _version, caps, device_caps = _CAPABILITY.unpack(buf)[:6]
+        if caps & V4L2_CAP_DEVICE_CAPS:
+            caps = device_caps
+        if not caps & V4L2_CAP_VIDEO_CAPTURE:
+            return None  # metadata / output node
+        identity = f"{_cstr(bus_info)}|{_cstr(card)}"
+        index = int(os.path.basename(path)[len('video'):])
+        info = {
+            'index': index,
+            'path': path,
+            'name': _cstr(card),
+            'driver': _cstr(driver),
+            'identity': identity,
+        }
+
+        # Same physical device as last scan: skip the format/size/interval ioctls
+        cached = (known or {}).get(identity)
+        if cached and cached.get('modes'):
+            info['modes'] = cached['modes']
+            return info
+
+        modes = set()
+        for fmt in _enum(fd, VIDIOC_ENUM_FMT, _FMTDESC, (V4L2_BUF_TYPE_VIDEO_CAPTURE,)):
+            pixfmt = fmt[4]
+            for size in _enum(fd, VIDIOC_ENUM_FRAMESIZES, _FRMSIZE, (pixfmt,)):
+                if size[2] == V4L2_FRMSIZE_TYPE_DISCRETE:
+                    width, height = size[3], size[4]
+                else:
+                    width, height = size[4], size[7]  # stepwise: report the maximum
+                for ival in _enum(fd, VIDIOC_ENUM_FRAMEINTERVALS, _FRMIVAL, (pixfmt, width, height)):
+                    # Discrete: one interval per entry; stepwise: first pair is the minimum interval
+                    if ival[5]:
+                        modes.add((width, height, round(ival[6] / ival[5], 2)))
+                    if ival[4] != V4L2_FRMIVAL_TYPE_DISCRETE:
+                        break
+
+        info['modes'] = sorted(modes, reverse=True)
+        return info
+    finally:
+        os.close(fd)
+
+
+class _LinuxScanner:
+    """Enumerates /dev/video* through V4L2 ioctls"""
+    can_watch = True
+
+    def signature(self):
+        """Changes whenever a video node is added, removed or re-created"""
+        sig = []
+        for path in sorted(glob.glob('/dev/video*')):
+            try:
+                st = os.stat(path)
+                sig.append((path, st.st_rdev, st.st_ctime_ns))
+            except OSError:
+                pass
+        return tuple(sig)
+
+    def scan(self, known):
+        cameras = []
+        for path, _rdev, _ctime in self.signature():
+            info = _v4l2_probe(path, known)
+            if info is not None:
+                cameras.append(info)
+        return sorted(cameras, key=lambda c: c['index'])
+
+
+class _OpenCVScanner:
+    """Windows/macOS fallback: opens indices with OpenCV (only ever off the UI thread)"""
+    can_watch = False
+
+    def __init__(self, max_index=4):
+        self.max_index = max_index
+
+    def signature(self):
+        return None
+
+    def scan(self, known):
+        import cv2
+        if sys.platform.startswith('win'):
+            backend, backend_name = cv2.CAP_MSMF, 'msmf'
+        elif sys.platform == 'darwin':
+            backend, backend_name = cv2.CAP_AVFOUNDATION, 'avfoundation'
+        else:
+            backend, backend_name = cv2.CAP_ANY, 'any'
+
+        cameras = []
+        for i in range(self.max_index):
+            cap = cv2.VideoCapture(i, backend)
+            try:
+                if not cap.isOpened():
+                    continue
+                mode = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                        round(cap.get(cv2.CAP_PROP_FPS), 2))
+                cameras.append({
+                    'index': i,
+                    'path': None,
+                    'name': f"Camera {i}",
+                    'driver': backend_name,
+                    'identity': f"{backend_name}:{i}",
+                    'modes': [mode]
+                })
+            finally:
+                cap.release()
+        return cameras
+
+
+class CameraDiscovery:
+    """
+    Background, cached camera enumeration for the GUI.
+
+    The last result is persisted to `cache_path` keyed by device identity,
+    so the camera list is available immediately on launch. A background
+    thread rescans; on Linux it also watches /dev/video* and rescans on
+    hot-plug. `on_change(cameras)` is called from that thread, so Tk users
+    must marshal it onto the UI thread.
+    """
+
+    def __init__(self, cache_path=None, poll_interval: float = 2.0, scanner=None):
+        self.cache_path = cache_path or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     'camera_cache.json')
+        self.poll_interval = poll_interval
+        if scanner is None:
+            scanner = _LinuxScanner() if sys.platform.startswith('linux') else _OpenCVScanner()
+        self.scanner = scanner
+
+        self._lock = threading.Lock()
+        self._known = self._load_cache()
+        self._cameras = sorted(self._known.values(), key=lambda c: c['index'])
+        self._signature = None
+        self._stop = threading.Event()
+        self._refresh = threading.Event()
+        self._thread = None
+        self.on_change = None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            return {c['identity']: c for c in data.get('cameras', [])}
+        except Exception:
+            return {}
+
+    def _save_cache(self):
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump({'cameras': list(self._known.values())}, f, indent=2)
+        except Exception as e:
+            print(f"[CameraDiscovery] Failed to save cache: {e}")
+
+    def cameras(self):
+        """Last known cameras (cached, never blocks)"""
+        with self._lock:
+            return list(self._cameras)
+
+    def scan(self):
+        """Rescan now (blocking) and return the camera list"""
+        cameras = self.scanner.scan(self._known)
+        for c in cameras:
+            c['modes'] = [tuple(m) for m in c.get('modes', [])]
+        with self._lock:
+            changed = cameras != self._cameras
+            self._cameras = cameras
+            # Devices that went away drop out of the cache
+            self._known = {c['identity']: c for c in cameras}
+        if changed:
+            self._save_cache()
+            if self.on_change:
+                self.on_change(list(cameras))
+        return cameras
+
+    def start(self, on_change=None):
+        """Scan in the background, then watch for hot-plug where supported"""
+        self.on_change = on_change
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='CameraDiscovery', daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh(self):
+        """Ask the background thread for a rescan"""
+        self._signature = None
+        self._refresh.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                sig = self.scanner.signature()
+                if self._signature is None or sig != self._signature:
+                    self._signature = sig
+                    self.scan()
+            except Exception as e:
+                print(f"[CameraDiscovery] Scan failed: {e}")
+
+            if self.scanner.can_watch:
+                self._refresh.wait(self.poll_interval)
+            else:
+                self._refresh.wait()
+            self._refresh.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._refresh.set()
@@ -0,0 +1,275 @@
+import math
+import time
+import ctypes
+import platform
+import threading
+
+try:
+    import pyautogui
+    pyautogui.FAILSAFE = False
+except Exception:
+    pyautogui = None
+
+try:
+    import screeninfo
+except ImportError:
+    screeninfo = None
+
+MAX_GAIN = 4.0  # cap of the acceleration curve, times the base sensitivity
+FALLBACK_SCREEN = (0, 0, 1920, 1080)
+
+
+def query_monitors():
+    """[(x, y, width, height), ...] for every monitor, primary first"""
+    if screeninfo is not None:
+        try:
+            monitors = sorted(screeninfo.get_monitors(), key=lambda m: not getattr(m, 'is_primary', False))
+            if monitors:
+                return [(m.x, m.y, m.width, m.height) for m in monitors]
+        except Exception:
+            pass
+    if platform.system() == 'Windows':
+        try:
+            metrics = ctypes.windll.user32.GetSystemMetrics
+            # Primary monitor, then the virtual desktop spanning all monitors
+            primary = (0, 0, metrics(0), metrics(1))
+            virtual = (metrics(76), metrics(77), metrics(78), metrics(79))
+            return [primary] if virtual[2:] == primary[2:] else [primary, virtual]
+        except Exception:
+            pass
+    if pyautogui is not None:
+        try:
+            width, height = pyautogui.size()
+            return [(0, 0, width, height)]
+        except Exception:
+            pass
+    return [FALLBACK_SCREEN]
+
+
+class ScreenGeometry:
+    """
+    Cached monitor layout.
+
+    Querying monitors can take milliseconds (xrandr, WinAPI), so the layout is
+    read once and only refreshed on request when older than `max_age`.
+    """
+
+    def __init__(self, monitor: int = -1, query=query_monitors, max_age: float = 5.0,
+                 clock=time.monotonic):
+        """
+        Args:
+            monitor: Keep the pointer on this monitor index (-1 = all monitors)
+            query: Callable returning [(x, y, width, height), ...]
+            max_age: Seconds before refresh() queries the layout again
+            clock: Time source
+        """
+        self.monitor = monitor
+        self.query = query
+        self.max_age = max_age
+        self.clock = clock
+        self.monitors = [FALLBACK_SCREEN]
+        self.updated = None
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Re-read the monitor layout if it is stale"""
+        now = self.clock()
+        if not force and self.updated is not None and now - self.updated < self.max_age:
+            return
+        self.monitors = self.query() or [FALLBACK_SCREEN]
+        self.updated = now
+
+    @property
+    def area(self):
+        """Rectangles the pointer may be in"""
+        if 0 <= self.monitor < len(self.monitors):
+            return [self.monitors[self.monitor]]
+        return self.monitors
+
+    @property
+    def size(self):
+        """Width and height that one full hand sweep across the camera maps to"""
+        x, y, width, height = self.area[0]
+        return width, height
+
+    def clamp(self, x: float, y: float):
+        """Nearest point on any allowed monitor (handles gaps in L-shaped layouts)"""
+        best = None
+        for mx, my, width, height in self.area:
+            cx = min(max(x, mx), mx + width - 1)
+            cy = min(max(y, my), my + height - 1)
+            d = (cx - x) ** 2 + (cy - y) ** 2
+            if best is None or d < best[0]:
+                best = (d, cx, cy)
+        return best[1], best[2]
+
+
+def move_pointer(x, y):
+    """Move the system pointer to absolute screen pixels (pyautogui)"""
+    # _pause=False: pyautogui otherwise sleeps PAUSE (0.1 s) after every call
+    pyautogui.moveTo(x, y, _pause=False)
+
+
+def pointer_position():
+    """Current system pointer position (pyautogui)"""
+    x, y = pyautogui.position()
+    return float(x), float(y)
+
+
+class CursorController:
+    """
+    Relative (touchpad-style) pointer control from a hand landmark.
+
+    feed() is called once per camera frame with the landmark position and
+    moves a target along the hand's motion, scaled by an acceleration curve.
+    A separate thread injects the pointer at `rate` Hz, interpolating towards
+    the latest target over one frame interval, so the pointer glides even
+    with a 30 fps camera. Positions are kept as floats and only rounded when
+    injected, so slow motions of less than a pixel per frame still add up.
+    """
+
+    def __init__(self, geometry: ScreenGeometry, sensitivity: float = 1.5, accel: float = 1.0,
+                 rate: float = 120, mirror: bool = True, move=None, position=None,
+                 clock=time.monotonic):
+        """
+        Args:
+            geometry: ScreenGeometry to map into and clamp to
+            sensitivity: Screen widths moved per camera-frame width at low speed
+            accel: Extra gain per unit of hand speed (frame widths per second);
+                0 = linear
+            rate: Pointer injection rate in Hz
+            mirror: Flip x, for a camera facing the user
+            move: Callable(x, y) injecting an absolute pointer position
+            position: Callable() -> (x, y) giving the current pointer position
+            clock: Time source
+        """
+        self.geometry = geometry
+        self.sensitivity = sensitivity
+        self.accel = accel
+        self.interval = 1.0 / rate
+        self.mirror = mirror
+        self.move = move or move_pointer
+        self.position = position or pointer_position
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._last_point = None
+        self._last_t = None
+        self._start = None       # interpolation segment: from, to, start time, duration
+        self._target = None
+        self._seg_t = 0.0
+        self._seg_len = 0.0
+        self._emitted = None
+        self.moves = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, cfg, **kwargs):
+        geometry = ScreenGeometry(cfg.CURSOR_MONITOR)
+        return cls(geometry, cfg.CURSOR_SENSITIVITY, cfg.CURSOR_ACCEL, cfg.CURSOR_RATE,
+                   cfg.CURSOR_MIRROR, **kwargs)
+
+    def gain(self, speed: float):
+        """Acceleration curve: pixels per unit of hand motion at this speed"""
+        return self.sensitivity * min(MAX_GAIN, 1.0 + self.accel * speed)
+
+    def feed(self, point, t=None):
+        """
+        Move the target with one frame's landmark position
+
+        Args:
+            point: (x, y) normalized landmark position, or None when the hand
+                is not in view (the next point then starts a new stroke
+                without moving the pointer)
+            t: Frame time in seconds (default: clock)
+        """
+        t = self.clock() if t is None else t
+        with self._lock:
+            if point is None:
+                self._last_point = None
+                return
+            if self._last_point is None:
+                # New stroke: continue from wherever the pointer is now
+                self.geometry.refresh()
+                try:
+                    here = self.position()
+                except Exception:
+                    here = self._target or self.geometry.clamp(0, 0)
+                self._start = self._target = here
+                self._seg_t, self._seg_len = t, 0.0
+                self._last_point, self._last_t = point, t
+                return
+
+            dt = t - self._last_t
+            if dt <= 0:
+                return
+            dx = point[0] - self._last_point[0]
+            dy = point[1] - self._last_point[1]
+            if self.mirror:
+                dx = -dx
+            gain = self.gain(math.hypot(dx, dy) / dt)
+            width, height = self.geometry.size
+
+            # Start the new segment where the pointer is now, so updates
+            # arriving mid-interpolation do not make it jump
+            self._start = self._interpolate(t)
+            self._target = self.geometry.clamp(self._target[0] + dx * width * gain,
+                                               self._target[1] + dy * height * gain)
+            self._seg_t, self._seg_len = t, dt
+            self._last_point, self._last_t = point, t
+
+    def _interpolate(self, now):
+        if self._target is None:
+            return None
+        if self._seg_len <= 0:
+            return self._target
+        alpha = min(1.0, (now - self._seg_t) / self._seg_len)
+        return (self._start[0] + (self._target[0] - self._start[0]) * alpha,
+                self._start[1] + (self._target[1] - self._start[1]) * alpha)
+
+    def tick(self, now=None):
+        """Inject the interpolated position if it moved by a whole pixel"""
+        with self._lock:
+            pos = self._interpolate(self.clock() if now is None else now)
+        if pos is None:
+            return False
+        pixel = (int(round(pos[0])), int(round(pos[1])))
+        if pixel == self._emitted:
+            return False
+        self.move(*pixel)
+        self._emitted = pixel
+        self.moves += 1
+        return True
+
+    def _run(self):
+        next_tick = self.clock()
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f'[Cursor] Pointer injection failed: {e}')
+                self._stop.wait(1.0)
+            next_tick += self.interval
+            delay = next_tick - self.clock()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = self.clock()  # fell behind; do not burst to catch up
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='cursor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def stats(self):
+        return {'rate_hz': round(1.0 / self.interval), 'moves': self.moves}
@@ -1,26 +1,47 @@
-import cv2, time
-from handtracker import HandTracker
+import cv2, time, sys, threading
+from frame_bus import open_tracker
 from gesturelogic import GestureEngine
+from overlay import VideoRecorder
 from utils.config import Config
 
-def run_overlay():
-    cfg = Config(); tracker = HandTracker(cfg); engine = GestureEngine(cfg)
+def run_overlay(source=None, record=None):
+    # Attaches to the running core's frame bus when no source is given
+    cfg = Config(); tracker = open_tracker(cfg, source); engine = GestureEngine(cfg)
     win = 'Debug'; cv2.namedWindow(win, cv2.WINDOW_NORMAL)
+
+    # Rendered frames arrive on the overlay thread; the window is drawn here
+    latest = {'frame': None}; lock = threading.Lock()
+    def on_frame(frame, hands):
+        with lock: latest['frame'] = frame.copy()
+    tracker.overlay.subscribe(on_frame)
+    recorder = tracker.overlay.subscribe(VideoRecorder(record, cfg.OVERLAY_FPS)) if record else None
+
+    labels, labels_until = [], 0
     try:
         while True:
             hands, frame = tracker.step()
             if frame is None:
+                if tracker.exhausted: break
                 time.sleep(0.02); continue
             gestures = engine.update(hands)
             if gestures:
-                for i,g in enumerate(gestures):
-                    cv2.putText(frame, str(g.get('type')), (10,30+i*30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,0), 2)
-            cv2.imshow(win, frame)
+                labels, labels_until = [str(g.get('type')) for g in gestures], time.time() + 1.0
+            with lock: shown, latest['frame'] = latest['frame'], None
+            if shown is not None:
+                if time.time() < labels_until:
+                    for i,t in enumerate(labels):
+                        cv2.putText(shown, t, (10,30+i*30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,0), 2)
+                cv2.imshow(win, shown)
             if cv2.waitKey(1) & 0xFF == ord('q'): break
     except KeyboardInterrupt:
         pass
     finally:
-        try: cv2.destroyAllWindows()
-        except: pass
+        tracker.overlay.unsubscribe(on_frame)
+        if recorder:
+            tracker.overlay.unsubscribe(recorder); recorder.close()
+        tracker.shutdown()
 
-if __name__=='__main__': run_overlay()
+# Usage: python debug_display.py [camera index | video file | image directory | synthetic | bus] [record.avi]
+if __name__=='__main__':
+    src = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != 'bus' else None
+    run_overlay(src, sys.argv[2] if len(sys.argv) > 2 else None)
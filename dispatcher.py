@@ -0,0 +1,188 @@
+import time
+import threading
+import collections
+from latency import RollingPercentiles
+
+# How queued events of one type are treated:
+#   coalesce: merged into the pending event of the same type ('count' adds up)
+#   latest:   at most one pending; a repeat replaces it
+#   keep:     never merged or expired (clicks must not be lost)
+COALESCE, LATEST, KEEP = 'coalesce', 'latest', 'keep'
+
+DEFAULT_POLICIES = {
+    'left_click': KEEP, 'right_click': KEEP, 'middle_click': KEEP, 'drag': KEEP, 'drop': KEEP,
+    'scroll_up': COALESCE, 'scroll_down': COALESCE, 'hscroll_left': COALESCE, 'hscroll_right': COALESCE,
+    'volume_up': COALESCE, 'volume_down': COALESCE,
+    'brightness_up': COALESCE, 'brightness_down': COALESCE,
+    'zoom_in': COALESCE, 'zoom_out': COALESCE, 'rotate': COALESCE,
+    'next_track': COALESCE, 'prev_track': COALESCE,
+}
+DEFAULT_POLICY = LATEST
+
+
+class GestureDispatcher:
+    """
+    Runs gesture handlers (input injection, OS actions) on a worker thread.
+
+    The tracking loop only appends to a bounded queue. While injection lags
+    behind, repeated relative actions (scroll, volume, ...) are coalesced into
+    one event with a 'count', one-shot actions keep a single pending copy, and
+    when the queue is full the oldest droppable event is discarded, as are
+    droppable events that waited longer than `max_age`. Clicks are only
+    dropped when the queue holds nothing else.
+    """
+
+    def __init__(self, handler, maxsize: int = 32, max_age: float = 0.5, policies=None,
+                 on_done=None, clock=time.monotonic):
+        """
+        Args:
+            handler: Callable(event) doing the work, e.g. EventMapper.handle
+            maxsize: Queue capacity
+            max_age: Seconds after which a waiting droppable event is stale
+            policies: {event type: 'coalesce' | 'latest' | 'keep'} overrides
+            on_done: Optional callable(event) run on the worker after handler
+            clock: Time source
+        """
+        self.handler = handler
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self.on_done = on_done
+        self.clock = clock
+
+        self._queue = collections.deque()   # [event, enqueue time]
+        self._pending = {}                  # type -> queued entry (coalesce / latest)
+        self._cond = threading.Condition()
+        self._stop = False
+        self._busy = False
+        self._thread = None
+
+        self.counts = {'submitted': 0, 'dispatched': 0, 'coalesced': 0, 'replaced': 0,
+                       'dropped_full': 0, 'dropped_stale': 0, 'errors': 0}
+        self.max_depth = 0
+        self.latency = RollingPercentiles(1000)
+
+    @classmethod
+    def from_config(cls, cfg, handler, **kwargs):
+        return cls(handler, cfg.DISPATCH_QUEUE_SIZE, cfg.DISPATCH_MAX_AGE, **kwargs)
+
+    def policy(self, event_type):
+        return self.policies.get(event_type, DEFAULT_POLICY)
+
+    def submit(self, event):
+        """Queue an event; never blocks on the handler"""
+        now = self.clock()
+        event_type = event.get('type')
+        policy = self.policy(event_type)
+        with self._cond:
+            self.counts['submitted'] += 1
+            pending = self._pending.get(event_type)
+            if pending is not None:
+                if policy == COALESCE:
+                    merged = pending[0]
+                    merged['count'] = merged.get('count', 1) + event.get('count', 1)
+                    if 'angle' in event:
+                        merged['angle'] = merged.get('angle', 0) + event['angle']
+                    self.counts['coalesced'] += 1
+                    return
+                # LATEST: the newer event replaces the pending one in place
+                pending[0], pending[1] = dict(event), now
+                self.counts['replaced'] += 1
+                return
+
+            if len(self._queue) >= self.maxsize and not self._drop_oldest('dropped_full'):
+                # Full of clicks: drop this event, or the oldest click for a click
+                self.counts['dropped_full'] += 1
+                if policy != KEEP:
+                    return
+                self._queue.popleft()
+            entry = [dict(event), now]  # private copy: coalescing updates it
+            self._queue.append(entry)
+            if policy != KEEP:
+                self._pending[event_type] = entry
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+
+    def _drop_oldest(self, reason):
+        for entry in self._queue:
+            if self.policy(entry[0].get('type')) != KEEP:
+                self._remove(entry)
+                self.counts[reason] += 1
+                return True
+        return False
+
+    def _remove(self, entry):
+        self._queue.remove(entry)
+        if self._pending.get(entry[0].get('type')) is entry:
+            del self._pending[entry[0].get('type')]
+
+    def _take(self):
+        """Next fresh entry, or None once stopped and drained"""
+        with self._cond:
+            while True:
+                while not self._queue and not self._stop:
+                    self._cond.wait()
+                if not self._queue:
+                    return None
+                entry = self._queue.popleft()
+                event_type = entry[0].get('type')
+                if self._pending.get(event_type) is entry:
+                    del self._pending[event_type]
+                if self.policy(event_type) != KEEP and self.clock() - entry[1] > self.max_age:
+                    self.counts['dropped_stale'] += 1
+                    continue
+                self._busy = True
+                return entry
+
+    def _run(self):
+        while True:
+            entry = self._take()
+            if entry is None:
+                return
+            event, queued = entry
+            try:
+                self.handler(event)
+                if self.on_done is not None:
+                    self.on_done(event)
+                self.counts['dispatched'] += 1
+            except Exception as e:
+                self.counts['errors'] += 1
+                print(f"[Dispatch] {event.get('type')} failed: {e}")
+            self.latency.add((self.clock() - queued) * 1000)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def start(self):
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name='dispatch', daemon=True)
+            self._thread.start()
+        return self
+
+    def join(self, timeout: float = None):
+        """Wait until the queue is empty and the handler idle; True if it was"""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - self.clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 1.0):
+        """Finish queued events (up to timeout) and stop the worker"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Queue depth, drop/merge counts and queue-to-done latency (ms)"""
+        with self._cond:
+            depth = len(self._queue)
+        return dict(self.counts, depth=depth, max_depth=self.max_depth,
+                    latency_ms=self.latency.summary())
@@ -0,0 +1,200 @@
+import json
+import math
+import os
+
+INF = float('inf')
+MIN_SPEED = 0.3      # below this (frame widths per second) the hand counts as still
+MAX_TEMPLATE_LEN = 32
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TEMPLATE_FILE = os.path.join(_BASE_DIR, 'templates.json')
+
+
+def direction(vx: float, vy: float, min_speed: float = MIN_SPEED):
+    """
+    Per-frame trajectory feature: unit direction of motion, (0, 0) when still
+
+    Directions make templates independent of where in the frame, how large
+    and (with DTW) how fast a gesture is drawn.
+    """
+    speed = math.hypot(vx, vy)
+    if speed < min_speed:
+        return (0.0, 0.0)
+    return (vx / speed, vy / speed)
+
+
+def trim_still(features):
+    """Drop still frames at both ends of a recording"""
+    moving = [i for i, f in enumerate(features) if f != (0.0, 0.0)]
+    if not moving:
+        return []
+    return features[moving[0]:moving[-1] + 1]
+
+
+def resample(features, length: int = MAX_TEMPLATE_LEN):
+    """Pick at most `length` evenly spaced frames (DTW cost is linear in template length)"""
+    if len(features) <= length:
+        return list(features)
+    step = (len(features) - 1) / (length - 1)
+    return [features[round(i * step)] for i in range(length)]
+
+
+class Template:
+    """A recorded trajectory and the event it triggers"""
+
+    __slots__ = ('name', 'type', 'hand', 'points')
+
+    def __init__(self, name, type, points, hand='right'):
+        self.name = name
+        self.type = type
+        self.hand = hand
+        self.points = [tuple(p) for p in points]
+
+    def to_dict(self):
+        return {'name': self.name, 'type': self.type, 'hand': self.hand,
+                'points': [list(p) for p in self.points]}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['name'], d['type'], d['points'], d.get('hand', 'right'))
+
+
+class StreamingDTW:
+    """
+    Subsequence DTW of a live feature stream against one template, updated
+    one frame at a time (as in SPRING, a match may start at any frame).
+
+    Each frame advances the template by 0, 1 or 2 points, so a gesture is
+    matched when drawn anywhere from twice as fast as the template to any
+    slower speed. Only one DTW column is kept. Costs only grow along a
+    path, so cells already over the match budget are abandoned (early
+    abandoning) and the sweep stops two cells past the last live one: while
+    nothing resembles the template, a frame touches a few cells instead of
+    the whole template.
+    """
+
+    __slots__ = ('template', 'points', 'budget', 'column', 'live')
+
+    def __init__(self, template: Template, threshold: float):
+        self.template = template
+        self.points = template.points
+        # Mean per-point cost allowed, times the template length
+        self.budget = threshold * len(self.points)
+        self.column = [INF] * len(self.points)
+        self.live = -1  # last index of the column below budget
+
+    def reset(self):
+        self.column = [INF] * len(self.points)
+        self.live = -1
+
+    def push(self, feature):
+        """
+        Add one frame
+
+        Returns:
+            Mean per-point cost of a match ending at this frame, or None
+        """
+        fx, fy = feature
+        points = self.points
+        prev = self.column
+        budget = self.budget
+        column = [INF] * len(points)
+        last = -1
+
+        # A new path may begin at every frame
+        px, py = points[0]
+        cost = (fx - px) ** 2 + (fy - py) ** 2
+        if cost <= budget:
+            column[0] = cost
+            last = 0
+
+        # Cells past live + 2 have no live predecessor
+        for j in range(1, min(len(points), self.live + 3)):
+            best = prev[j] if prev[j] < prev[j - 1] else prev[j - 1]
+            skip = prev[j - 2] if j > 1 else INF
+            if best == INF and skip == INF:
+                continue
+            px, py = points[j]
+            d = (fx - px) ** 2 + (fy - py) ** 2
+            # Skipping a point pays for it, so fast strokes are not cheaper
+            cost = best + d if best + d <= skip + 2 * d else skip + 2 * d
+            if cost <= budget:  # else abandoned: costs only grow along a path
+                column[j] = cost
+                last = j
+
+        self.column = column
+        self.live = last
+        end = column[-1]
+        if end < INF:
+            self.reset()  # report each stroke once
+            return end / len(points)
+        return None
+
+
+class TemplateMatcher:
+    """
+    Streams per-hand trajectory features through every template
+
+    Each hand ('right', 'left') has its own DTW state per template.
+    """
+
+    def __init__(self, templates=(), threshold: float = 0.3):
+        """
+        Args:
+            templates: Template list
+            threshold: Mean per-point cost accepted as a match (direction
+                features cost 0 for the same direction, 1 for moving against
+                still, 2 for perpendicular and 4 for opposite directions)
+        """
+        self.templates = list(templates)
+        self.threshold = threshold
+        self._state = {}
+
+    def _streams(self, hand):
+        streams = self._state.get(hand)
+        if streams is None:
+            streams = self._state[hand] = [StreamingDTW(t, self.threshold)
+                                           for t in self.templates if t.hand in (hand, 'any')]
+        return streams
+
+    def push(self, hand: str, feature):
+        """
+        Add one frame of one hand
+
+        Returns:
+            List of (template, mean cost) matched at this frame
+        """
+        matches = []
+        for stream in self._streams(hand):
+            cost = stream.push(feature)
+            if cost is not None:
+                matches.append((stream.template, cost))
+        return matches
+
+    def retain(self, hands):
+        """Drop state of hands no longer in view, so strokes never span gaps"""
+        for hand in list(self._state):
+            if hand not in hands:
+                del self._state[hand]
+
+    def reset(self):
+        self._state.clear()
+
+
+def load_templates(path=None):
+    """Templates from a JSON file (relative to the install directory); [] if missing"""
+    path = os.path.join(_BASE_DIR, path or DEFAULT_TEMPLATE_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [Template.from_dict(d) for d in data.get('templates', [])]
+
+
+def save_template(template: Template, path=None):
+    """Add or replace (by name) a template in the file"""
+    path = os.path.join(_BASE_DIR, path or DEFAULT_TEMPLATE_FILE)
+    templates = [t for t in load_templates(path) if t.name != template.name]
+    templates.append(template)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'templates': [t.to_dict() for t in templates]}, f, indent=2)
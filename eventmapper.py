@@ -1,5 +1,4 @@
 import platform
-import os
 import shutil
 
 try:
@@ -9,16 +8,32 @@ except Exception:
     pyautogui = None
 
 from os_handlers import (
-    volume_up, volume_down, mute_toggle, 
-    media_play_pause, media_next, media_prev, 
-    lock_screen, set_brightness, 
-    open_notifications, open_quick_settings
+    volume_up, volume_down, mute_toggle,
+    media_play_pause, media_next, media_prev,
+    lock_screen, change_brightness,
+    get_backends, describe_backends, close_backends, is_wayland
 )
+from cursor import query_monitors, move_pointer, pointer_position
+from uinput_device import UInputDevice, uinput_available
+from xtest_input import XTestInput, xtest_available
 
-def _is_wayland():
-    """Detect if running under Wayland"""
-    return (os.environ.get('XDG_SESSION_TYPE', '').lower() == 'wayland' or 
-            os.environ.get('WAYLAND_DISPLAY') is not None)
+# Keyboard shortcut per OS; a gesture without one is unsupported on that OS
+HOTKEYS = {
+    'app_switch': {'windows': ('alt', 'tab'), 'darwin': ('alt', 'tab'), 'linux': ('alt', 'tab')},
+    'task_view': {'windows': ('win', 'tab'), 'darwin': ('ctrl', 'up')},
+    'show_desktop': {'windows': ('win', 'd'), 'darwin': ('f11',)},
+    'screenshot': {'windows': ('win', 'printscreen'), 'darwin': ('command', 'shift', '3'),
+                   'linux': ('printscreen',)},
+    'snap_left': {'windows': ('win', 'left')},
+    'snap_right': {'windows': ('win', 'right')},
+    'enter': {'windows': ('enter',), 'darwin': ('enter',), 'linux': ('enter',)},
+    'zoom_in': {'windows': ('ctrl', '+'), 'darwin': ('ctrl', '+'), 'linux': ('ctrl', '+')},
+    'zoom_out': {'windows': ('ctrl', '-'), 'darwin': ('ctrl', '-'), 'linux': ('ctrl', '-')},
+    'notifications': {'windows': ('win', 'n'), 'darwin': ('command', 'shift', 'n')},
+    'quick_settings': {'windows': ('win', 'a'), 'darwin': ('fn', 'c')},
+}
+# Hotkeys sent once per merged repeat ('count')
+REPEATED_HOTKEYS = ('zoom_in', 'zoom_out')
 
 def _has_wayland_helpers():
     """Check if Wayland input helpers are available"""
@@ -26,15 +41,101 @@ def _has_wayland_helpers():
             shutil.which('wtype') is not None or
             shutil.which('swaymsg') is not None)
 
+class PyAutoGUIInput:
+    """pyautogui behind the same interface as UInputDevice"""
+    name = 'pyautogui'
+
+    @property
+    def can_hscroll(self):
+        return hasattr(pyautogui, 'hscroll')
+
+    def click(self, button='left'):
+        pyautogui.click(button=button)
+
+    def mouse_down(self):
+        pyautogui.mouseDown()
+
+    def mouse_up(self):
+        pyautogui.mouseUp()
+
+    def scroll(self, notches):
+        pyautogui.scroll(120 * notches)
+
+    def hscroll(self, notches):
+        pyautogui.hscroll(100 * notches)
+
+    def hotkey(self, *keys, presses=1):
+        for _ in range(presses):
+            pyautogui.hotkey(*keys)
+
+    def move_to(self, x, y):
+        move_pointer(x, y)
+
+    def position(self):
+        return pointer_position()
+
+    def close(self):
+        pass
+
+def desktop_bounds(monitors):
+    """(x, y, width, height) enclosing all monitors"""
+    x0 = min(x for x, y, w, h in monitors)
+    y0 = min(y for x, y, w, h in monitors)
+    x1 = max(x + w for x, y, w, h in monitors)
+    y1 = max(y + h for x, y, w, h in monitors)
+    return x0, y0, x1 - x0, y1 - y0
+
+def open_input(backend='auto', os_name=None):
+    """
+    Input injection backend
+
+    Args:
+        backend: 'auto', 'uinput', 'xtest' or 'pyautogui'; on Linux 'auto'
+            prefers a uinput device when /dev/uinput is writable, then XTEST
+            on an X11 display
+        os_name: platform.system().lower()
+
+    Returns:
+        Backend object, or None if none is available
+    """
+    os_name = os_name or platform.system().lower()
+    if 'linux' in os_name and backend in ('auto', 'uinput'):
+        if uinput_available():
+            try:
+                return UInputDevice(desktop=desktop_bounds(query_monitors()))
+            except OSError as e:
+                print(f'[EventMapper] uinput device could not be created: {e}')
+        elif backend == 'uinput':
+            print('[EventMapper] /dev/uinput is not writable (add your user to the input group)')
+    if 'linux' in os_name and backend in ('auto', 'xtest'):
+        if xtest_available():
+            try:
+                return XTestInput()
+            except Exception as e:
+                print(f'[EventMapper] XTEST connection failed: {e}')
+        elif backend == 'xtest':
+            print('[EventMapper] XTEST needs python-xlib and an X11 session')
+    return PyAutoGUIInput() if pyautogui is not None else None
+
+def _platform_key(os_name):
+    for key in ('windows', 'darwin', 'linux'):
+        if key in os_name:
+            return key
+    return os_name
+
 class EventMapper:
     def __init__(self, cfg):
         self.os = platform.system().lower()
-        self.is_wayland = _is_wayland()
+        self.is_wayland = is_wayland()
         self.has_wayland_helpers = _has_wayland_helpers()
         self.wayland_warning_shown = False
+        self.input = open_input(getattr(cfg, 'INPUT_BACKEND', 'auto'), self.os)
+        self.button_held = False
         
         # Log backend information
-        if self.is_wayland:
+        if self.input is not None and self.input.name != 'pyautogui':
+            print(f'[EventMapper] Running on {self.os}, injecting through {self.input.name}')
+        elif self.is_wayland:
             if self.has_wayland_helpers:
                 print('[EventMapper] Running on Wayland with input helpers available')
             else:
@@ -45,6 +146,16 @@ class EventMapper:
                 self.wayland_warning_shown = True
         else:
             print(f'[EventMapper] Running on {self.os} (X11 or native)')
+        # Resolve OS action backends now rather than on the first gesture
+        print(f'[EventMapper] Action backends: {describe_backends()}')
+
+        # Gesture type -> handler(event, count), or None if unsupported here
+        # (the reason is in self.unsupported); built once for this OS/session
+        self.unsupported = {}
+        self.handlers = self._build_handlers()
+        self._reported = set()
+        if self.unsupported:
+            print(f"[EventMapper] Unsupported here: {', '.join(sorted(self.unsupported))}")
     
     def _check_wayland_availability(self, action_type):
         """Check if action is available on Wayland"""
@@ -55,150 +166,126 @@ class EventMapper:
                 self.wayland_warning_shown = True
             return False
         return True
+
+    def _build_handlers(self):
+        handlers = {}
+
+        def unsupported(types, reason):
+            for t in types:
+                handlers[t] = None
+                self.unsupported[t] = reason
+
+        # Synthetic mouse and keyboard input
+        pointer_types = ('left_click', 'right_click', 'middle_click', 'drag', 'drop',
+                         'scroll_up', 'scroll_down', 'hscroll_left', 'hscroll_right')
+        inp = self.input
+        if inp is None:
+            injection = 'pyautogui is not available'
+        elif inp.name == 'pyautogui' and self.is_wayland and not self.has_wayland_helpers:
+            injection = 'Wayland input injection requires ydotool or wtype'
+        else:
+            injection = None
+
+        if injection:
+            unsupported(pointer_types + tuple(HOTKEYS), injection)
+        else:
+            for t, button in (('left_click', 'left'), ('right_click', 'right'), ('middle_click', 'middle')):
+                handlers[t] = lambda g, count, button=button: inp.click(button)
+            handlers['drag'] = lambda g, count: self._press()
+            handlers['drop'] = lambda g, count: self._release()
+            handlers['scroll_up'] = lambda g, count: inp.scroll(count)
+            handlers['scroll_down'] = lambda g, count: inp.scroll(-count)
+            if getattr(inp, 'can_hscroll', True):
+                handlers['hscroll_right'] = lambda g, count: inp.hscroll(count)
+                handlers['hscroll_left'] = lambda g, count: inp.hscroll(-count)
+            else:
+                unsupported(('hscroll_left', 'hscroll_right'), 'pyautogui has no hscroll')
+
+            platform_key = _platform_key(self.os)
+            for t, shortcuts in HOTKEYS.items():
+                keys = shortcuts.get(platform_key)
+                if keys is None:
+                    unsupported((t,), f'no shortcut on {self.os}')
+                elif t in REPEATED_HOTKEYS:
+                    handlers[t] = lambda g, count, keys=keys: inp.hotkey(*keys, presses=count)
+                else:
+                    handlers[t] = lambda g, count, keys=keys: inp.hotkey(*keys)
+
+        # OS actions, through the backends resolved in os_handlers
+        backends = get_backends()
+        if backends['audio'] is not None:
+            handlers['volume_up'] = lambda g, count: volume_up(count)
+            handlers['volume_down'] = lambda g, count: volume_down(count)
+            handlers['mute_unmute'] = lambda g, count: mute_toggle()
+        else:
+            unsupported(('volume_up', 'volume_down', 'mute_unmute'), 'no volume backend')
+        if backends['brightness'] is not None:
+            handlers['brightness_up'] = lambda g, count: change_brightness(count)
+            handlers['brightness_down'] = lambda g, count: change_brightness(-count)
+        else:
+            unsupported(('brightness_up', 'brightness_down'), 'no brightness backend')
+        if backends['media'] is not None:
+            handlers['media_toggle'] = lambda g, count: media_play_pause()
+            handlers['next_track'] = lambda g, count: media_next(count)
+            handlers['prev_track'] = lambda g, count: media_prev(count)
+        else:
+            unsupported(('media_toggle', 'next_track', 'prev_track'), 'no media backend')
+        handlers['lock_screen'] = lambda g, count: lock_screen()
+
+        # Recognized but only logged for now
+        handlers['modifier_hold'] = lambda g, count: print('[EVENT] Modifier hold detected')
+        handlers['rotate'] = lambda g, count: print(
+            f"[EVENT] Rotate gesture detected: {g.get('angle', 0):.2f} radians")
+        return handlers
+
+    def pointer_injection(self):
+        """move/position callables for CursorController, or None if the pointer cannot be moved"""
+        if self.input is None:
+            return None
+        if self.input.name == 'pyautogui' and not self._check_wayland_availability('cursor'):
+            return None
+        return {'move': self.input.move_to, 'position': self.input.position}
+
+    def _press(self):
+        self.input.mouse_down()
+        self.button_held = True
+
+    def _release(self):
+        self.input.mouse_up()
+        self.button_held = False
+
+    def close(self):
+        """Release a button still held by a drag, then close the input and OS action backends"""
+        if self.input is not None:
+            if self.button_held:
+                self._release()
+            self.input.close()
+        close_backends()
+
+    def supported_gestures(self):
+        """Gesture types this mapper can act on here"""
+        return {t for t, handler in self.handlers.items() if handler is not None}
     
     def handle(self, g):
+        """
+        Perform one gesture event
+
+        Handler exceptions propagate, so GestureDispatcher counts them in
+        counts['errors'] and reports them.
+        """
         t = g.get('type')
         confidence = g.get('confidence', 1.0)
-        print(f'[EVENT] {t} (confidence: {confidence:.2f})', g)
-        
-        try:
-            # Basic mouse operations
-            if t == 'left_click':
-                if self._check_wayland_availability('click') and pyautogui:
-                    pyautogui.click()
-                    
-            elif t == 'right_click':
-                if self._check_wayland_availability('click') and pyautogui:
-                    pyautogui.click(button='right')
-                    
-            elif t == 'middle_click':
-                if self._check_wayland_availability('click') and pyautogui:
-                    pyautogui.click(button='middle')
-                    
-            elif t == 'drag':
-                if self._check_wayland_availability('drag') and pyautogui:
-                    pyautogui.mouseDown()
-                    
-            # Scrolling
-            elif t == 'scroll_up':
-                if self._check_wayland_availability('scroll') and pyautogui:
-                    pyautogui.scroll(120)
-                    
-            elif t == 'scroll_down':
-                if self._check_wayland_availability('scroll') and pyautogui:
-                    pyautogui.scroll(-120)
-                    
-            elif t == 'hscroll_right':
-                if self._check_wayland_availability('hscroll') and pyautogui and hasattr(pyautogui, 'hscroll'):
-                    pyautogui.hscroll(100)
-                    
-            elif t == 'hscroll_left':
-                if self._check_wayland_availability('hscroll') and pyautogui and hasattr(pyautogui, 'hscroll'):
-                    pyautogui.hscroll(-100)
-                    
-            # Window management
-            elif t == 'app_switch':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    pyautogui.hotkey('alt', 'tab')
-                    
-            elif t == 'task_view':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    if 'windows' in self.os:
-                        pyautogui.hotkey('win', 'tab')
-                    elif 'darwin' in self.os:
-                        pyautogui.hotkey('ctrl', 'up')
-                        
-            elif t == 'show_desktop':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    if 'windows' in self.os:
-                        pyautogui.hotkey('win', 'd')
-                    elif 'darwin' in self.os:
-                        pyautogui.hotkey('f11')
-                        
-            elif t == 'screenshot':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    if 'windows' in self.os:
-                        pyautogui.hotkey('win', 'printscreen')
-                    elif 'darwin' in self.os:
-                        pyautogui.hotkey('command', 'shift', '3')
-                    elif 'linux' in self.os:
-                        pyautogui.hotkey('printscreen')
-                        
-            elif t == 'snap_left':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    if 'windows' in self.os:
-                        pyautogui.hotkey('win', 'left')
-                    elif 'darwin' in self.os:
-                        print('[EVENT] Snap left requires third-party app on macOS')
-                        
-            elif t == 'snap_right':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    if 'windows' in self.os:
-                        pyautogui.hotkey('win', 'right')
-                    elif 'darwin' in self.os:
-                        print('[EVENT] Snap right requires third-party app on macOS')
-                        
-            # Volume controls (OS handlers)
-            elif t == 'volume_up':
-                volume_up()
-                
-            elif t == 'volume_down':
-                volume_down()
-                
-            elif t == 'mute_unmute':
-                mute_toggle()
-                
-            # Brightness controls
-            elif t == 'brightness_up':
-                set_brightness(70)  # Increase to 70%
-                
-            elif t == 'brightness_down':
-                set_brightness(30)  # Decrease to 30%
-                
-            # Media controls
-            elif t == 'media_toggle':
-                media_play_pause()
-                
-            elif t == 'next_track':
-                media_next()
-                
-            elif t == 'prev_track':
-                media_prev()
-                
-            # Modifier and special keys
-            elif t == 'modifier_hold':
-                print('[EVENT] Modifier hold detected')
-                
-            elif t == 'enter':
-                if self._check_wayland_availability('press') and pyautogui:
-                    pyautogui.press('enter')
-                    
-            # Zoom
-            elif t == 'zoom_in':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    pyautogui.hotkey('ctrl', '+')
-                    
-            elif t == 'zoom_out':
-                if self._check_wayland_availability('hotkey') and pyautogui:
-                    pyautogui.hotkey('ctrl', '-')
-                    
-            # Rotation
-            elif t == 'rotate':
-                angle = g.get('angle', 0)
-                print(f'[EVENT] Rotate gesture detected: {angle:.2f} radians')
-                
-            # System
-            elif t == 'lock_screen':
-                lock_screen()
-                
-            elif t == 'notifications':
-                open_notifications()
-                
-            elif t == 'quick_settings':
-                open_quick_settings()
-                
-            else:
-                print(f'[EVENT] Unhandled gesture type: {t}')
-                
-        except Exception as e:
-            print(f'[EVENT] Error handling {t}: {e}')
\ No newline at end of file
+        # Repeats merged by the dispatcher while injection was busy
+        count = g.get('count', 1)
+        print(f'[EVENT] {t} (confidence: {confidence:.2f}' + (f', x{count})' if count > 1 else ')'))
+
+        handler = self.handlers.get(t, False)
+        if not handler:
+            if t not in self._reported:
+                self._reported.add(t)
+                if handler is None:
+                    print(f'[EVENT] {t} is not supported here: {self.unsupported[t]}')
+                else:
+                    print(f'[EVENT] Unhandled gesture type: {t}')
+            return
+        handler(g, count)
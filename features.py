@@ -0,0 +1,81 @@
+import numpy as np
+from landmarks import FINGERTIPS, WRIST
+
+MIDDLE_MCP = 9
+
+# Joint angles as (a, b, c) landmark triples, angle measured at b:
+# MCP, PIP and DIP (thumb: CMC, MCP and IP) for each finger, thumb first
+_FINGER_CHAINS = ((1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16), (17, 18, 19, 20))
+JOINT_TRIPLES = tuple(
+    (prev, chain[j], chain[j + 1])
+    for chain in _FINGER_CHAINS
+    for j, prev in zip(range(3), (WRIST,) + chain[:2])
+)
+_A = np.array([t[0] for t in JOINT_TRIPLES])
+_B = np.array([t[1] for t in JOINT_TRIPLES])
+_C = np.array([t[2] for t in JOINT_TRIPLES])
+_TIPS = np.array(FINGERTIPS)
+_TIP_INDEX = {lm: i for i, lm in enumerate(FINGERTIPS)}
+
+
+class HandFeatures:
+    """
+    Per-frame gesture features for every hand, computed in one pass.
+
+    tip_distances: (hands, 5, 5) 2D distances between all fingertips
+        (thumb, index, middle, ring, pinky)
+    angles: (hands, 5, 3) joint angles in radians per finger (pi = straight)
+    palm_size: (hands,) wrist to middle-finger MCP distance, for scale-free
+        thresholds
+    velocity: (hands, 21, 3) landmark velocity in normalized units per
+        second, when the gesture engine supplied it (else None)
+    """
+
+    __slots__ = ('tip_distances', 'angles', 'palm_size', 'velocity')
+
+    def __init__(self, points, velocity=None):
+        xy = points[:, _TIPS, :2]
+        diff = xy[:, :, None, :] - xy[:, None, :, :]
+        self.tip_distances = np.sqrt((diff * diff).sum(axis=-1))
+
+        v1 = points[:, _A] - points[:, _B]
+        v2 = points[:, _C] - points[:, _B]
+        norms = np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1)
+        cos = (v1 * v2).sum(axis=-1) / np.maximum(norms, 1e-9)
+        self.angles = np.arccos(np.clip(cos, -1.0, 1.0)).reshape(len(points), 5, 3)
+
+        palm = points[:, MIDDLE_MCP, :2] - points[:, WRIST, :2]
+        self.palm_size = np.sqrt((palm * palm).sum(axis=-1))
+        self.velocity = velocity
+
+    def pair(self, a: int, b: int):
+        """(hands,) distances between two fingertip landmarks, e.g. THUMB_TIP, INDEX_TIP"""
+        return self.tip_distances[:, _TIP_INDEX[a], _TIP_INDEX[b]]
+
+    def to_dict(self):
+        """JSON-friendly copy (debug dumps only)"""
+        return {
+            'tip_distances': self.tip_distances.round(4).tolist(),
+            'angles_deg': np.degrees(self.angles).round(1).tolist(),
+            'palm_size': self.palm_size.round(4).tolist(),
+        }
+
+
+def hand_features(hands, velocity=None):
+    """
+    Features of a HandLandmarks frame, computed once and cached on it
+
+    Args:
+        hands: HandLandmarks
+        velocity: Optional (hands, 21, 3) velocity to attach (from the
+            gesture engine's landmark filter)
+
+    Returns:
+        HandFeatures shared by every caller for the same frame
+    """
+    features = hands._features
+    if features is None:
+        features = hands._features = HandFeatures(hands.points, velocity)
+    elif velocity is not None and features.velocity is None:
+        features.velocity = velocity
+    return features
@@ -0,0 +1,142 @@
+import math
+import numpy as np
+from landmarks import HandLandmarks
+
+
+def _alpha(cutoff, dt):
+    """Smoothing factor of a first-order low-pass at `cutoff` Hz (scalar or array)"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter over a fixed-shape array of points (e.g. (21, 3)).
+
+    The cutoff frequency rises with the speed of each point, so a hand held
+    still is heavily smoothed while fast motion passes with little lag. The
+    filtered derivative is kept as well and used for velocity and prediction.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 5.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.dx = None
+        self.t = None
+        self._raw = None
+
+    def __call__(self, x, t: float):
+        """
+        Filter one sample
+
+        Args:
+            x: Array of points, same shape every call
+            t: Sample time in seconds
+
+        Returns:
+            The filtered array (owned by the filter, updated in place next call)
+        """
+        if self.x is None:
+            self.x = np.array(x, dtype=np.float32)
+            self.dx = np.zeros_like(self.x)
+            self._raw = self.x.copy()
+            self.t = t
+            return self.x
+
+        dt = t - self.t
+        if dt <= 0:
+            return self.x
+        self.t = t
+
+        # Derivative first, at a fixed cutoff. Taken between raw samples rather
+        # than against the lagging estimate so it is usable for prediction.
+        raw_dx = (x - self._raw) / dt
+        self._raw[...] = x
+        self.dx += _alpha(self.d_cutoff, dt) * (raw_dx - self.dx)
+
+        # Per-point cutoff from the speed in the image plane
+        speed = np.sqrt((self.dx[..., :2] ** 2).sum(axis=-1, keepdims=True))
+        cutoff = self.min_cutoff + self.beta * speed
+        self.x += _alpha(cutoff, dt).astype(np.float32) * (x - self.x)
+        return self.x
+
+    def predict(self, lead: float):
+        """Position `lead` seconds ahead assuming constant velocity"""
+        return self.x + self.dx * lead
+
+
+class LandmarkFilter:
+    """
+    One-Euro filtering of all landmarks of every tracked hand.
+
+    State is kept per hand key ('right_0', ...) and dropped when the hand
+    disappears or was not seen for `reset_after` seconds.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 5.0,
+                 predict_ms: float = 0.0, reset_after: float = 0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.predict_ms = predict_ms
+        self.reset_after = reset_after
+        self._filters = {}
+
+        self.filtered = HandLandmarks.empty()
+        self.predicted = self.filtered
+        self.velocity = np.empty((0,) + self.filtered.points.shape[1:], dtype=np.float32)
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(cfg.FILTER_MIN_CUTOFF, cfg.FILTER_BETA, cfg.FILTER_D_CUTOFF, cfg.PREDICT_MS)
+
+    def reset(self, keys=None):
+        """Drop the state of the given hand keys, or of all hands"""
+        if keys is None:
+            self._filters.clear()
+        for key in keys or ():
+            self._filters.pop(key, None)
+
+    def __call__(self, hands: HandLandmarks, t: float):
+        """
+        Filter one frame
+
+        Args:
+            hands: HandLandmarks for the frame
+            t: Frame time in seconds
+
+        Returns:
+            Filtered HandLandmarks. `predicted` holds the same hands moved
+            `predict_ms` ahead and `velocity` the (hands, 21, 3) velocity in
+            normalized units per second.
+        """
+        keys = hands.keys()
+        for key in list(self._filters):
+            f = self._filters[key]
+            if key not in keys or t - f.t > self.reset_after:
+                del self._filters[key]
+
+        n = len(hands)
+        points = np.empty_like(hands.points)
+        velocity = np.empty_like(hands.points)
+        predicted = np.empty_like(hands.points) if self.predict_ms else points
+        lead = self.predict_ms / 1000.0
+
+        for i, key in enumerate(keys):
+            f = self._filters.get(key)
+            if f is None:
+                f = self._filters[key] = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+            points[i] = f(hands.points[i], t)
+            velocity[i] = f.dx
+            if self.predict_ms:
+                predicted[i] = f.predict(lead)
+
+        self.filtered = HandLandmarks(points, hands.labels, hands.scores)
+        self.predicted = HandLandmarks(predicted, hands.labels, hands.scores) if self.predict_ms else self.filtered
+        self.velocity = velocity[:n]
+        return self.filtered
@@ -0,0 +1,321 @@
+import os
+import time
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from landmarks import HandLandmarks, MAX_HANDS, NUM_LANDMARKS, HAND_LABELS
+from overlay import OverlayRenderer
+
+DEFAULT_BUS_NAME = 'airtouchpad_bus'
+MAGIC = 0x41545042  # 'ATPB'
+STALE_MS = 3000  # writer counts as gone after this long without a heartbeat
+
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'),
+    ('slots', '<u4'),
+    ('max_width', '<u4'),
+    ('max_height', '<u4'),
+    ('writer_pid', '<u4'),
+    ('latest_seq', '<i8'),
+    ('heartbeat', '<f8'),    # time.monotonic of the writer's last publish/beat
+], align=True)
+
+SLOT_DTYPE = np.dtype([
+    ('seq', '<i8'),          # -1 while the slot is being written
+    ('timestamp', '<f8'),    # capture time (time.monotonic of the writer)
+    ('width', '<u4'),
+    ('height', '<u4'),
+    ('n_hands', '<u4'),
+    ('labels', 'u1', (MAX_HANDS,)),
+    ('scores', '<f4', (MAX_HANDS,)),
+    ('points', '<f4', (MAX_HANDS, NUM_LANDMARKS, 3)),
+], align=True)
+
+
+def _layout(slots, max_width, max_height):
+    """Byte offsets: header, slot headers, then one frame area per slot"""
+    frame_bytes = max_width * max_height * 3
+    slots_offset = HEADER_DTYPE.itemsize
+    frames_offset = slots_offset + SLOT_DTYPE.itemsize * slots
+    # Keep frame areas 64-byte aligned
+    frames_offset = (frames_offset + 63) // 64 * 64
+    return slots_offset, frames_offset, frame_bytes, frames_offset + frame_bytes * slots
+
+
+class BusFrame:
+    """One published frame as seen by a reader"""
+    __slots__ = ('seq', 'timestamp', 'frame', 'hands')
+
+    def __init__(self, seq, timestamp, frame, hands):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame
+        self.hands = hands
+
+
+class _BusViews:
+    """Numpy views over a mapped bus block"""
+
+    def __init__(self, shm, slots, max_width, max_height):
+        slots_offset, frames_offset, frame_bytes, _ = _layout(slots, max_width, max_height)
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        self.slots = np.ndarray((slots,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=slots_offset)
+        self.frames = np.ndarray((slots, frame_bytes), dtype=np.uint8, buffer=shm.buf,
+                                 offset=frames_offset)
+
+
+class FrameBusWriter:
+    """
+    Publishes frames and landmarks from the single camera owner.
+
+    A ring of `slots` fixed-size entries in shared memory, each carrying a
+    sequence number. The writer marks a slot as in-progress (seq -1), fills
+    it, then stamps the new sequence number and advances latest_seq. Readers
+    never block the writer; they detect a slot that was overwritten while
+    they copied it and retry.
+    """
+
+    def __init__(self, name: str = DEFAULT_BUS_NAME, max_width: int = 640,
+                 max_height: int = 480, slots: int = 4):
+        _, _, _, size = _layout(slots, max_width, max_height)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a crashed writer
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.name = name
+        self.max_width = max_width
+        self.max_height = max_height
+        self._views = _BusViews(self.shm, slots, max_width, max_height)
+        self._views.slots['seq'] = -1
+
+        header = self._views.header
+        header['slots'] = slots
+        header['max_width'] = max_width
+        header['max_height'] = max_height
+        header['writer_pid'] = os.getpid()
+        header['latest_seq'] = 0
+        header['heartbeat'] = time.monotonic()
+        header['magic'] = MAGIC  # last: readers wait for it
+
+        self.seq = 0
+        print(f"[FrameBus] Publishing on '{name}' ({slots} slots, {max_width}x{max_height})")
+
+    def publish(self, frame, hands, timestamp: float = None):
+        """Copy one frame and its landmarks into the next ring slot"""
+        views = self._views
+        self.seq += 1
+        idx = self.seq % len(views.slots)
+        slot = views.slots[idx]
+        slot['seq'] = -1
+
+        h, w = frame.shape[:2]
+        if w > self.max_width or h > self.max_height:
+            scale = min(self.max_width / w, self.max_height / h)
+            w, h = int(w * scale), int(h * scale)
+            dst = views.frames[idx, :w * h * 3].reshape(h, w, 3)
+            cv2.resize(frame, (w, h), dst=dst, interpolation=cv2.INTER_AREA)
+        else:
+            views.frames[idx, :w * h * 3].reshape(h, w, 3)[...] = frame
+
+        n = min(len(hands), MAX_HANDS) if hands else 0
+        if n:
+            slot['points'][:n] = hands.points[:n]
+            slot['scores'][:n] = hands.scores[:n]
+            slot['labels'][:n] = [HAND_LABELS.index(label) for label in hands.labels[:n]]
+        slot['width'] = w
+        slot['height'] = h
+        slot['n_hands'] = n
+        slot['timestamp'] = timestamp if timestamp is not None else time.monotonic()
+
+        slot['seq'] = self.seq
+        views.header['latest_seq'] = self.seq
+        views.header['heartbeat'] = time.monotonic()
+
+    def beat(self):
+        """Mark the writer alive while it has nothing to publish"""
+        self._views.header['heartbeat'] = time.monotonic()
+
+    def close(self):
+        """Remove the bus (readers see it disappear on their next attach)"""
+        self._views = None
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except Exception:
+            pass
+
+
+class FrameBusReader:
+    """Attaches to a running FrameBusWriter and reads the newest published frame"""
+
+    def __init__(self, name: str = DEFAULT_BUS_NAME, stale_ms: float = STALE_MS):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._untrack()
+
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if int(header['magic']) != MAGIC:
+            del header
+            self.shm.close()
+            raise RuntimeError(f"Frame bus '{name}' is not initialized")
+        slots, w, h = int(header['slots']), int(header['max_width']), int(header['max_height'])
+        del header
+
+        self.name = name
+        self.stale_ms = stale_ms
+        self._views = _BusViews(self.shm, slots, w, h)
+        self._out = None
+        self.last_seq = 0
+        self.retries = 0
+
+    def _untrack(self):
+        # Before Python 3.13 attaching registers the block with this process's
+        # resource tracker, which would unlink it when the reader exits.
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        except Exception:
+            pass
+
+    @classmethod
+    def attach(cls, name: str = DEFAULT_BUS_NAME, timeout: float = 0.0):
+        """Attach to the bus, waiting up to `timeout` seconds; None if it does not exist"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return cls(name)
+            except (FileNotFoundError, RuntimeError):
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.1)
+
+    @property
+    def writer_alive(self):
+        """
+        False once the writer stopped publishing for `stale_ms`
+
+        time.monotonic is system-wide, so the writer's heartbeat can be
+        compared with the reader's clock. On POSIX a writer process that
+        exited is also noticed at once.
+        """
+        header = self._views.header
+        if os.name == 'posix':
+            try:
+                os.kill(int(header['writer_pid']), 0)
+            except PermissionError:
+                pass
+            except OSError:
+                return False
+        return (time.monotonic() - float(header['heartbeat'])) * 1000 < self.stale_ms
+
+    def read(self, after_seq: int = None):
+        """
+        Copy out the newest frame published after `after_seq`
+
+        Args:
+            after_seq: Sequence number already seen (default: last one read)
+
+        Returns:
+            BusFrame or None if nothing new. The frame array is reused by the
+            next read().
+        """
+        views = self._views
+        after = self.last_seq if after_seq is None else after_seq
+        for _ in range(8):
+            latest = int(views.header['latest_seq'])
+            if latest <= after:
+                return None
+            slot = views.slots[latest % len(views.slots)]
+            if int(slot['seq']) != latest:
+                self.retries += 1
+                continue
+
+            w, h, n = int(slot['width']), int(slot['height']), int(slot['n_hands'])
+            if self._out is None or self._out.shape != (h, w, 3):
+                self._out = np.empty((h, w, 3), dtype=np.uint8)
+            np.copyto(self._out, views.frames[latest % len(views.slots), :w * h * 3].reshape(h, w, 3))
+            points = slot['points'][:n].copy()
+            scores = slot['scores'][:n].copy()
+            labels = [HAND_LABELS[code] for code in slot['labels'][:n].tolist()]
+            timestamp = float(slot['timestamp'])
+
+            # Writer lapped us while copying: try again with the newer frame
+            if int(slot['seq']) != latest:
+                self.retries += 1
+                continue
+
+            self.last_seq = latest
+            hands = HandLandmarks(points, labels, scores) if n else None
+            return BusFrame(latest, timestamp, self._out, hands)
+        return None
+
+    def close(self):
+        self._views = None
+        try:
+            self.shm.close()
+        except Exception:
+            pass
+
+
+class BusTracker:
+    """
+    HandTracker stand-in backed by a FrameBusReader.
+
+    Lets debug_display, calibration and previews consume the frames and
+    landmarks of the running core instead of opening the camera and running
+    a second model.
+    """
+
+    def __init__(self, cfg, reader: FrameBusReader):
+        self.cfg = cfg
+        self.reader = reader
+        self.overlay = OverlayRenderer(cfg.OVERLAY_FPS, draw=cfg.DEBUG_OVERLAY)
+        self.latest = None
+        self.latest_frame = None
+        self.latest_timestamp = None
+        print(f"[BusTracker] Attached to frame bus '{reader.name}'")
+
+    @property
+    def exhausted(self):
+        """The bus ends when the core that owns the camera exits"""
+        return not self.reader.writer_alive
+
+    def step(self, block: bool = True, timeout: float = 1.0):
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            item = self.reader.read()
+            if item is not None:
+                break
+            if not block or time.monotonic() >= deadline or self.exhausted:
+                return None, None
+            time.sleep(0.002)
+
+        if self.overlay.active:
+            self.overlay.submit(item.frame, item.hands)
+        self.latest, self.latest_frame, self.latest_timestamp = item.hands, item.frame, item.timestamp
+        return self.latest, self.latest_frame
+
+    def step_nowait(self):
+        return self.step(block=False)
+
+    def shutdown(self):
+        self.reader.close()
+        print("[BusTracker] Detached")
+
+
+def open_tracker(cfg, source=None, bus_name: str = DEFAULT_BUS_NAME):
+    """
+    Tracker for tools: attach to the running core when no source is given and
+    a bus exists, otherwise open the source (default camera 0) directly.
+    """
+    if source is None:
+        reader = FrameBusReader.attach(bus_name)
+        if reader is not None:
+            return BusTracker(cfg, reader)
+        source = 0
+    from handtracker import HandTracker
+    return HandTracker(cfg, source)
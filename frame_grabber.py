@@ -0,0 +1,133 @@
+import threading
+import time
+
+
+class FrameGrabber:
+    """
+    Background capture thread with a single-slot, latest-frame-wins buffer.
+
+    The capture device is drained continuously so the driver never queues
+    stale frames while inference is busy. Frames that are overwritten before
+    anyone consumed them are counted as dropped.
+
+    Three frame buffers rotate between the capture thread (back), the ready
+    slot and the consumer (front), so once sizes settle no new frames are
+    allocated. A frame returned by read() stays valid until the next read().
+    """
+
+    def __init__(self, cap, name='FrameGrabber'):
+        """
+        Args:
+            cap: Object with a cv2.VideoCapture-style read(image) -> (ret, frame)
+            name: Thread name (useful when several grabbers run at once)
+        """
+        self.cap = cap
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._back = None   # capture thread decodes into this
+        self._frame = None  # newest complete frame
+        self._front = None  # last frame handed to the consumer
+        self._timestamp = 0.0
+        self._seq = 0
+        self._consumed_seq = 0
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+
+        self._pending = []
+
+        self.running = False
+        self._thread = None
+
+    def call_soon(self, fn):
+        """
+        Run fn() on the capture thread before its next read.
+
+        Device settings (resolution, FPS) are changed this way so they never
+        race with a read() in progress.
+        """
+        with self._cond:
+            self._pending.append(fn)
+
+    def start(self):
+        """Start the capture thread"""
+        if self.running:
+            return self
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        while self.running:
+            if self._pending:
+                with self._cond:
+                    pending, self._pending = self._pending, []
+                for fn in pending:
+                    try:
+                        fn()
+                    except Exception as e:
+                        print(f"[{self.name}] Deferred call failed: {e}")
+
+            ret, frame = self.cap.read(self._back)
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+
+            timestamp = time.monotonic()
+            with self._cond:
+                # Previous frame was never picked up by the consumer
+                if self._seq != self._consumed_seq:
+                    self.frames_dropped += 1
+                # Stale ready buffer becomes the next decode target
+                self._back, self._frame = self._frame, frame
+                self._timestamp = timestamp
+                self._seq += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read(self, block=True, timeout=None):
+        """
+        Get the newest frame that has not been returned yet
+
+        Args:
+            block: Wait for a fresh frame if none is pending
+            timeout: Maximum time to wait in seconds (None = forever)
+
+        Returns:
+            tuple: (frame, timestamp) or (None, None) if no new frame is available
+        """
+        with self._cond:
+            if self._seq == self._consumed_seq:
+                if not block:
+                    return None, None
+                self._cond.wait_for(
+                    lambda: self._seq != self._consumed_seq or not self.running,
+                    timeout
+                )
+                if self._seq == self._consumed_seq:
+                    return None, None
+
+            self._consumed_seq = self._seq
+            self._front, self._frame = self._frame, self._front
+            return self._front, self._timestamp
+
+    def stats(self):
+        """Capture counters"""
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'read_failures': self.read_failures
+        }
+
+    def stop(self):
+        """Stop the capture thread (does not release the device)"""
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -0,0 +1,261 @@
+import os
+import time
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+
+class FrameSource:
+    """
+    Something HandTracker can pull BGR frames from.
+
+    read(out) follows cv2.VideoCapture.read(image): (ret, frame), decoding
+    into `out` when it has the right shape so steady-state capture does not
+    allocate. `live` sources (cameras) produce frames whether or not anyone
+    reads them and are captured on a background thread; recorded sources
+    are read synchronously so no frame is ever dropped.
+    """
+
+    live = False
+    name = 'source'
+
+    def __init__(self):
+        self.exhausted = False
+
+    def read(self, out=None):
+        raise NotImplementedError
+
+    def set_mode(self, width: int, height: int, fps: float = None):
+        """Request a capture mode (ignored by recorded sources)"""
+
+    @property
+    def fps(self):
+        return None
+
+    def is_opened(self):
+        return not self.exhausted
+
+    def info(self):
+        return {'source': self.name, 'live': self.live, 'fps': self.fps}
+
+    def release(self):
+        pass
+
+
+class _Pacer:
+    """Sleeps so frames come out at fps * speed (speed 0/None = unthrottled)"""
+
+    def __init__(self, fps, speed):
+        self.interval = 1.0 / (fps * speed) if fps and speed else 0.0
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next is None:
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(self._next + self.interval, time.monotonic() - self.interval)
+
+
+class CameraSource(FrameSource):
+    """Live camera through cv2.VideoCapture"""
+
+    live = True
+
+    def __init__(self, index: int = 0, width: int = None, height: int = None):
+        super().__init__()
+        self.index = index
+        self.name = f"camera:{index}"
+        self.cap = cv2.VideoCapture(index)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Failed to open camera at index {index}")
+        if width and height:
+            self.set_mode(width, height)
+
+    def read(self, out=None):
+        return self.cap.read(out)
+
+    def set_mode(self, width, height, fps=None):
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+    @property
+    def fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS) or None
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def info(self):
+        return {
+            'source': self.name,
+            'live': True,
+            'index': self.index,
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': int(self.cap.get(cv2.CAP_PROP_FPS)),
+            'backend': self.cap.getBackendName()
+        }
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, played at `speed` x real time (0 = as fast as possible)"""
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.name = f"video:{os.path.basename(path)}"
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Failed to open video file {path}")
+        self._pacer = _Pacer(self.fps or 30.0, speed)
+
+    def read(self, out=None):
+        self._pacer.wait()
+        ret, frame = self.cap.read(out)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(out)
+        if not ret:
+            self.exhausted = True
+        return ret, frame
+
+    @property
+    def fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS) or None
+
+    def info(self):
+        return {
+            'source': self.name,
+            'live': False,
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.fps,
+            'frames': int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            'position': int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        }
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Directory of still images, read in sorted filename order"""
+
+    def __init__(self, path: str, fps: float = 30.0, speed: float = 1.0, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.name = f"images:{os.path.basename(os.path.normpath(path))}"
+        self.loop = loop
+        self.files = sorted(
+            os.path.join(path, f) for f in os.listdir(path)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            raise RuntimeError(f"No images found in {path}")
+        self._fps = fps
+        self._pos = 0
+        self._pacer = _Pacer(fps, speed)
+
+    def read(self, out=None):
+        if self._pos >= len(self.files):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self._pos = 0
+        self._pacer.wait()
+        frame = cv2.imread(self.files[self._pos])
+        self._pos += 1
+        return frame is not None, frame
+
+    @property
+    def fps(self):
+        return self._fps
+
+    def info(self):
+        return {'source': self.name, 'live': False, 'fps': self._fps,
+                'frames': len(self.files), 'position': self._pos}
+
+
+class GeneratorSource(FrameSource):
+    """Frames from any iterable or generator of BGR arrays (in-memory streams, tests)"""
+
+    def __init__(self, frames, fps: float = None, name: str = 'generator'):
+        super().__init__()
+        self.name = name
+        self._it = iter(frames)
+        self._fps = fps
+        self._pacer = _Pacer(fps, 1.0)
+
+    def read(self, out=None):
+        self._pacer.wait()
+        try:
+            return True, next(self._it)
+        except StopIteration:
+            self.exhausted = True
+            return False, None
+
+    @property
+    def fps(self):
+        return self._fps
+
+
+def synthetic_frames(width: int = 640, height: int = 480, count: int = None):
+    """Moving-blob test pattern (no hands), endless unless count is given"""
+    i = 0
+    while count is None or i < count:
+        frame = np.full((height, width, 3), 64, dtype=np.uint8)
+        x = int((i * 7) % width)
+        cv2.circle(frame, (x, height // 2), height // 6, (200, 180, 160), -1)
+        yield frame
+        i += 1
+
+
+def open_source(spec, cfg=None, speed: float = 1.0, loop: bool = False):
+    """
+    Build a FrameSource from a command-line style spec
+
+    Args:
+        spec: FrameSource instance, camera index (int or digit string), video
+            file path, image directory, 'synthetic' / 'synthetic:WxH', or any
+            iterable of frames
+        cfg: Config for the initial camera resolution
+        speed: Playback speed for recorded sources (0 = as fast as possible)
+        loop: Restart recorded sources at the end
+
+    Returns:
+        FrameSource
+    """
+    if isinstance(spec, FrameSource):
+        return spec
+
+    width = cfg.CAP_WIDTH if cfg else None
+    height = cfg.CAP_HEIGHT if cfg else None
+
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), width, height)
+
+    if isinstance(spec, str):
+        if spec.startswith('synthetic'):
+            w, h = width or 640, height or 480
+            if ':' in spec:
+                w, h = (int(v) for v in spec.split(':', 1)[1].lower().split('x'))
+            return GeneratorSource(synthetic_frames(w, h), fps=30.0 * speed if speed else None,
+                                   name=f"synthetic:{w}x{h}")
+        if os.path.isdir(spec):
+            return ImageDirectorySource(spec, speed=speed, loop=loop)
+        if os.path.isfile(spec):
+            return VideoFileSource(spec, speed=speed, loop=loop)
+        raise RuntimeError(f"Unknown frame source: {spec}")
+
+    return GeneratorSource(spec)
@@ -1,38 +1,95 @@
 import time, math, collections
 from utils.config import Config
+from filters import LandmarkFilter
+from features import hand_features
+from landmarks import as_landmarks, HAND_LABELS, WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_TIP
+from rules import load_rules, HAND_FLAGS, BOTH_FLAGS
+from dtw import TemplateMatcher, load_templates, direction
 
-def dist(a, b):
-    return math.hypot(a[0] - b[0], a[1] - b[1])
+# Pose thresholds behind the rule flags
+EXTENDED_ANGLE = 2.6   # PIP and DIP straighter than this (radians) = finger extended
+SPREAD_RATIO = 0.5     # index-middle tips further apart than this * palm size = spread
+TOGETHER_RATIO = 1.0   # index tips of both hands closer than this * palm size = together
+RAISED_Y = 0.3         # both wrists above this = hands up
+LOWERED_Y = 0.8        # both wrists below this = hands down
+
+_FLAG_BITS = tuple(1 << i for i in range(len(HAND_FLAGS)))
+_N = len(HAND_FLAGS)
+_TOGETHER, _BOTH_UP, _BOTH_DOWN = (1 << BOTH_FLAGS.index(f) for f in ('together', 'both_up', 'both_down'))
 
 class GestureEngine:
-    def __init__(self, config=Config()):
+    def __init__(self, config=Config(), clock=time.time, supported=None):
+        """
+        Args:
+            config: Config with thresholds and the rules file
+            clock: Time source for frames passed without a timestamp
+            supported: Optional set of event types the event mapper can act
+                on (EventMapper.supported_gestures()); rules and templates
+                for other types are never evaluated
+        """
         self.cfg = config
+        self.clock = clock
         self.history = collections.deque(maxlen=self.cfg.BUFFER_LEN)
         self.hand_hist = {}
         self.last_emitted = {}
-        self.smoothed_coords = {}
-
-    def _smooth_coords(self, key, new_coords):
-        """Apply exponential moving average to smoothen coordinates."""
-        if key not in self.smoothed_coords:
-            self.smoothed_coords[key] = new_coords
-        else:
-            alpha = self.cfg.SMOOTHING_FACTOR
-            self.smoothed_coords[key] = (
-                alpha * new_coords[0] + (1 - alpha) * self.smoothed_coords[key][0],
-                alpha * new_coords[1] + (1 - alpha) * self.smoothed_coords[key][1]
-            )
-        return self.smoothed_coords[key]
-
-    def _get_velocity(self, key, new_coords, prev_coords):
-        """Calculate velocity based on smoothed coordinates."""
-        smoothed_new = self._smooth_coords(key, new_coords)
-        smoothed_prev = self._smooth_coords(key + "_prev", prev_coords) # Store previous smoothed value
-        self.smoothed_coords[key + "_prev"] = smoothed_new # Update for next frame
-        
-        vx = smoothed_new[0] - smoothed_prev[0]
-        vy = smoothed_new[1] - smoothed_prev[1]
-        return vx, vy
+        # Adaptive smoothing and latency-compensating prediction for all landmarks
+        self.filter = LandmarkFilter.from_config(self.cfg)
+        self.features = None
+        # Gesture definitions are data (gestures.json), compiled once here
+        self.rules = load_rules(self.cfg.GESTURE_RULES, self.cfg, supported)
+        # Trajectory gestures recorded in the calibration UI
+        templates = [t for t in load_templates(self.cfg.TEMPLATE_FILE)
+                     if supported is None or t.type in supported]
+        self.matcher = TemplateMatcher(templates, self.cfg.DTW_THRESHOLD)
+        self.both_hist = {}
+        # Hand keys whose 'drag' pressed a button that no 'drop' released yet
+        self.dragging = set()
+
+    def reset(self):
+        """Forget all per-session state (history, filters, cooldowns)"""
+        self.history.clear()
+        self.hand_hist = {}
+        self.both_hist = {}
+        self.last_emitted = {}
+        self.filter.reset()
+        self.matcher.reset()
+        self.features = None
+        self.dragging = set()
+
+    def forget(self, labels):
+        """
+        Restart the motion state of hands whose coordinates jumped
+
+        Used when a multi-camera tracker hands a label to another camera: the
+        filter, velocities and template strokes of that hand start over,
+        while pose state (pinch start, flags, drags) carries on so a held
+        pinch does not fire again.
+
+        Args:
+            labels: Hand labels ('right', 'left') that changed camera
+        """
+        if not labels:
+            return
+        last = self.history[-1][1] if self.history else None
+        keys = [key for key, label in zip(last.keys(), last.labels) if label in labels] if last else []
+        self.filter.reset(keys)
+        for key in keys:
+            if key in self.hand_hist:
+                self.hand_hist[key].pop('velocity', None)
+        self.matcher.retain([hand for hand in HAND_LABELS if hand not in labels])
+        self.both_hist.pop('t', None)
+
+    def release(self, keep=()):
+        """
+        'drop' events for drags whose hand is gone (all but the keys in `keep`)
+
+        A drag otherwise only ends on the same hand's falling hold_ti edge, so
+        a hand that leaves view mid-drag would leave the button pressed.
+        """
+        lost = [key for key in self.dragging if key not in keep]
+        for key in lost:
+            self.dragging.discard(key)
+        return [{'type': 'drop', 'confidence': 1.0, 'reason': 'hand lost'} for _ in lost]
 
     def _calculate_confidence(self, *factors):
         """Calculate a combined confidence score from multiple factors."""
@@ -40,81 +97,210 @@ class GestureEngine:
         return min(1.0, max(0.0, score))
 
     def _summarize(self, hands):
-        s = []
-        if not hands: return s
-        for idx, (lm, label) in enumerate(hands):
-            s.append({
-                'label': label, 'idx': idx,
-                'thumb': lm[4], 'index': lm[8], 'middle': lm[12], 'ring': lm[16], 'pinky': lm[20], 'wrist': lm[0]
-            })
-        return s
-
-    def update(self, hands):
-        now = time.time()
-        summary = self._summarize(hands)
-        self.history.append((now, summary))
+        """Map hand key -> (hand index, label) for one HandLandmarks frame"""
+        return {key: (idx, label) for idx, (key, label) in enumerate(zip(hands.keys(), hands.labels))}
+
+    def _hand_flags(self, feats, idx, d_ti, d_im, d_tm, extended, pinch_since, now):
+        """Bitmask of rules.HAND_FLAGS for one hand"""
+        pinch_ti = d_ti < self.cfg.PINCH_THRESHOLD
+        pinch_im = d_im < self.cfg.TWO_FINGER_THRESHOLD
+        pinch_tm = d_tm < self.cfg.PINCH_THRESHOLD
+        index, middle, ring, pinky = extended
+        two_up = index and middle and not ring and not pinky
+        flags = (
+            pinch_ti,
+            pinch_im,
+            pinch_tm,
+            pinch_ti and pinch_im,
+            pinch_ti and pinch_since is not None and now - pinch_since >= self.cfg.HOLD_TIME,
+            two_up,
+            two_up and d_im > SPREAD_RATIO * feats.palm_size[idx],
+            index and middle and ring and pinky,
+            not (index or middle or ring or pinky),
+        )
+        return sum(_FLAG_BITS[i] for i, on in enumerate(flags) if on)
+
+    def _match_templates(self, hand, velocity):
+        """Template (DTW) matches for the index fingertip's trajectory"""
         events = []
+        for template, cost in self.matcher.push(hand, direction(*velocity)):
+            # Any accepted match (cost <= threshold) must pass the confidence
+            # filter: the stream was already reset, so a drop would lose the stroke
+            floor = self.cfg.CONFIDENCE_THRESHOLD
+            conf = max(floor, self._calculate_confidence(1.0 - (1.0 - floor) * cost / self.matcher.threshold))
+            events.append({'type': template.type, 'confidence': conf, 'template': template.name})
+        return events
+
+    def _update_both(self, hands, both, now):
+        """Two-hand rules, on the first left and first right hand"""
+        if 'left' not in both or 'right' not in both:
+            self.both_hist = {}
+            return []
+        (li, l_state), (ri, r_state) = both['left'], both['right']
+        # Plain floats: numpy reductions over two values cost more than the rules
+        (lx, ly), (rx, ry) = hands.points[[li, ri], INDEX_TIP, :2].tolist()
+        l_wrist_y, r_wrist_y = hands.points[[li, ri], WRIST, 1].tolist()
+        palm_size = self.features.palm_size
+        palm = (float(palm_size[li]) + float(palm_size[ri])) / 2
+        gap = math.hypot(rx - lx, ry - ly)
+        angle = math.atan2(ry - ly, rx - lx)
+
+        state = l_state | r_state << _N
+        if gap < TOGETHER_RATIO * palm: state |= _TOGETHER
+        if max(l_wrist_y, r_wrist_y) < RAISED_Y: state |= _BOTH_UP
+        if min(l_wrist_y, r_wrist_y) > LOWERED_Y: state |= _BOTH_DOWN
+
+        last = self.both_hist
+        changed = state ^ last.get('state', 0)
+        ddist = dangle = turn = 0.0
+        if 't' in last and now > last['t']:
+            # Wrap to (-pi, pi] so crossing the atan2 branch cut is not a spin
+            turn = (angle - last['angle'] + math.pi) % (2 * math.pi) - math.pi
+            # Rates per second, like the single-hand velocities
+            dt = now - last['t']
+            ddist = (gap - last['dist']) / dt
+            dangle = turn / dt
+        self.both_hist = {'state': state, 'dist': gap, 'angle': angle, 't': now}
+        return self.rules.evaluate('both', state, changed, {
+            'dist': gap, 'ddist': ddist, 'angle': angle, 'dangle': dangle, 'turn': turn})
+
+    def update(self, hands, timestamp=None):
+        """
+        Process one frame
+
+        Args:
+            hands: HandLandmarks (or legacy [(points, label), ...])
+            timestamp: Frame time in seconds; defaults to the engine's clock
+
+        Returns:
+            List of gesture event dicts
+        """
+        now = self.clock() if timestamp is None else timestamp
+        hands = as_landmarks(hands)
+        self.filter(hands, now)
+        # Computed once per frame; calibration and debug dumps reuse the cache
+        self.features = hand_features(hands, self.filter.velocity) if hands else None
+        self.history.append((now, hands))
+        events = []
+        
+        prev_hands = self.history[-2][1] if len(self.history) >= 2 else None
+        if not hands or not prev_hands:
+            self.matcher.reset()
+            return self.release(self._summarize(hands) if hands else ())
+        frame_dt = now - self.history[-2][0]
+        
+        cur_map = self._summarize(hands)
+        prev_map = self._summarize(prev_hands)
         
-        prev_summary = self.history[-2][1] if len(self.history) >= 2 else []
-        cur_map = {f"{h['label']}_{h['idx']}": h for h in summary}
-        prev_map = {f"{h['label']}_{h['idx']}": h for h in prev_summary}
-
-        for key, ch in cur_map.items():
-            prev_h = prev_map.get(key)
-            if not prev_h: continue
-
-            vx, vy = self._get_velocity(key, ch['wrist'], prev_h['wrist'])
-            
-            d_ti = dist(ch['thumb'], ch['index'])
-            d_im = dist(ch['index'], ch['middle'])
-            d_tm = dist(ch['thumb'], ch['middle'])
-
-            pinch_ti = d_ti < self.cfg.PINCH_THRESHOLD
-            pinch_im = d_im < self.cfg.TWO_FINGER_THRESHOLD
-            pinch_tm = d_tm < self.cfg.PINCH_THRESHOLD
-            
+        feats = self.features
+        d_ti_all = feats.pair(THUMB_TIP, INDEX_TIP).tolist()
+        d_im_all = feats.pair(INDEX_TIP, MIDDLE_TIP).tolist()
+        d_tm_all = feats.pair(THUMB_TIP, MIDDLE_TIP).tolist()
+        # PIP and DIP straight for index, middle, ring and pinky
+        extended_all = (feats.angles[:, 1:, 1:] > EXTENDED_ANGLE).all(axis=-1).tolist()
+
+        both = {}
+        owners = {}  # id(drag/drop event) -> hand key
+        for key, (idx, label) in cur_map.items():
+            prev = prev_map.get(key)
+            if not prev: continue
+
+            d_ti, d_im, d_tm = d_ti_all[idx], d_im_all[idx], d_tm_all[idx]
             last = self.hand_hist.get(key, {})
-            
-            # Gesture logic with improved confidence
-            if ch['label'].startswith('r'): # Right Hand
-                if pinch_ti and not last.get('pinch_ti'):
-                    conf = self._calculate_confidence(1.0 - d_ti / self.cfg.PINCH_THRESHOLD, 1 if abs(vx) < 0.01 else 0.5)
-                    events.append({'type': 'left_click', 'confidence': conf})
-                
-                if pinch_im and not last.get('pinch_im'):
-                    conf = self._calculate_confidence(1.0 - d_im / self.cfg.TWO_FINGER_THRESHOLD)
-                    events.append({'type': 'right_click', 'confidence': conf})
-
-                if pinch_tm and not last.get('pinch_tm'):
-                    conf = self._calculate_confidence(1.0 - d_tm / self.cfg.PINCH_THRESHOLD)
-                    events.append({'type': 'middle_click', 'confidence': conf})
-
-                # Differentiate swipes from taps
-                is_stable = abs(vx) < 0.02 and abs(vy) < 0.02
-                is_swipe_x = abs(vx) > 0.05 and abs(vy) < 0.03
-                is_swipe_y = abs(vy) > 0.05 and abs(vx) < 0.03
-
-                tap3 = pinch_ti and pinch_im
-                if tap3 and not last.get('tap3', False) and is_stable:
-                     events.append({'type': 'screenshot', 'confidence': 1.0})
-
-                if tap3 and is_swipe_x:
-                    events.append({'type': 'app_switch', 'confidence': self._calculate_confidence(abs(vx) / 0.1)})
-                
-                if tap3 and is_swipe_y:
-                    direction = 'task_view' if vy < 0 else 'show_desktop'
-                    events.append({'type': direction, 'confidence': self._calculate_confidence(abs(vy) / 0.1)})
+            # When the current thumb-index pinch started, for hold_ti and 'held'
+            pinch_since = None
+            if d_ti < self.cfg.PINCH_THRESHOLD:
+                # 'is None': a pinch that started at t=0.0 is not new
+                pinch_since = last.get('pinch_since')
+                if pinch_since is None:
+                    pinch_since = now
+            state = self._hand_flags(feats, idx, d_ti, d_im, d_tm, extended_all[idx], pinch_since, now)
+            changed = state ^ last.get('state', 0)
+
+            # Filtered wrist velocity in units per second, so rule thresholds
+            # do not depend on the frame rate
+            velocity = feats.velocity[idx, WRIST, :2].tolist()
+
+            def variables(idx=idx, d_ti=d_ti, d_im=d_im, d_tm=d_tm, pinch_since=pinch_since,
+                          velocity=velocity, last=last):
+                vx, vy = velocity
+                pvx, pvy = last.get('velocity', velocity)
+                ax, ay = ((vx - pvx) / frame_dt, (vy - pvy) / frame_dt) if frame_dt > 0 else (0.0, 0.0)
+                x, y = hands.points[idx, WRIST, :2].tolist()
+                palm = float(feats.palm_size[idx])
+                return {
+                    'vx': vx, 'vy': vy, 'speed': math.hypot(vx, vy),
+                    'ax': ax, 'ay': ay,
+                    'd_ti': d_ti, 'd_im': d_im, 'd_tm': d_tm,
+                    'palm': palm, 'spread': d_im / palm if palm > 0 else 0.0,
+                    'held': now - pinch_since if pinch_since is not None else 0.0,
+                    'x': x, 'y': y,
+                }
+
+            hand = 'right' if label.startswith('r') else 'left'
+            hand_events = self.rules.evaluate(hand, state, changed, variables)
+            for e in hand_events:
+                if e['type'] in ('drag', 'drop'):
+                    owners[id(e)] = key
+            events.extend(hand_events)
+            if hand not in both:
+                both[hand] = (idx, state)
+                if self.matcher.templates:
+                    events.extend(self._match_templates(hand, feats.velocity[idx, INDEX_TIP, :2].tolist()))
 
             # Update history for the hand
-            self.hand_hist[key] = {'pinch_ti': pinch_ti, 'pinch_im': pinch_im, 'pinch_tm': pinch_tm, 'tap3': tap3}
+            self.hand_hist[key] = {'state': state, 'pinch_since': pinch_since, 'velocity': velocity}
+
+        self.matcher.retain(both)
+        if self.rules.handles('both'):
+            events.extend(self._update_both(hands, both, now))
 
         # Filter events by confidence and apply cooldown
         final_events = []
         for e in events:
             if e.get('confidence', 0) >= self.cfg.CONFIDENCE_THRESHOLD:
                 key = e['type']
-                if (now - self.last_emitted.get(key, 0)) > self.cfg.COOLDOWN:
+                if key not in self.last_emitted or now - self.last_emitted[key] > self.cfg.COOLDOWN:
                     final_events.append(e)
                     self.last_emitted[key] = now
-        
+                    if id(e) in owners:
+                        if key == 'drag':
+                            self.dragging.add(owners[id(e)])
+                        else:
+                            self.dragging.discard(owners[id(e)])
+
+        final_events.extend(self.release(cur_map))
         return final_events
+
+    def pointer(self, label='right', landmark=INDEX_TIP):
+        """
+        Position of one landmark of the first hand with the given label, from
+        the filtered (and, with PREDICT_MS, latency-compensated) landmarks of
+        the last frame
+
+        Returns:
+            (x, y) normalized, or None when no such hand is in view
+        """
+        hands = self.filter.predicted
+        for idx, hand_label in enumerate(hands.labels):
+            if hand_label.startswith(label[0]):
+                return tuple(hands.points[idx, landmark, :2].tolist())
+        return None
+
+    def update_batch(self, frames, timestamps):
+        """
+        Run a recorded session through the engine as fast as possible
+
+        History, hold times and cooldowns all follow the given timestamps, so
+        the events are the same as when the frames were processed live.
+
+        Args:
+            frames: Sequence of HandLandmarks (or None for frames without hands)
+            timestamps: Frame times in seconds, one per frame
+
+        Returns:
+            List with the event list of each frame
+        """
+        if len(frames) != len(timestamps):
+            raise ValueError(f"{len(frames)} frames but {len(timestamps)} timestamps")
+        return [self.update(hands, t) for hands, t in zip(frames, timestamps)]
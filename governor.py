@@ -0,0 +1,179 @@
+import time
+import collections
+
+# One rung of the quality ladder; fps None = camera's nominal rate, uncapped loop
+QualityLevel = collections.namedtuple(
+    'QualityLevel', ['width', 'height', 'model_complexity', 'max_num_hands', 'fps'])
+
+
+def build_levels(width: int, height: int, model_complexity: int = 0,
+                 max_num_hands: int = 2, min_fps: float = 15):
+    """
+    Quality ladder from the configured mode down to the cheapest one.
+
+    Cheaper steps are ordered by how much inference time they save for the
+    least loss in tracking: the Full model goes first, then resolution, then
+    the second hand, and capping the frame rate comes last.
+    """
+    levels = [QualityLevel(width, height, model_complexity, max_num_hands, None)]
+
+    def step(**changes):
+        level = levels[-1]._replace(**changes)
+        if level != levels[-1]:
+            levels.append(level)
+
+    step(model_complexity=0)
+    step(width=width * 3 // 4, height=height * 3 // 4)
+    step(max_num_hands=1)
+    step(width=width // 2, height=height // 2)
+    step(fps=min_fps)
+    return levels
+
+
+class LatencyGovernor:
+    """
+    Keeps per-frame pipeline time within a latency budget.
+
+    Frame times are collected over a window of frames. When the 90th
+    percentile exceeds the budget the governor steps one level down the
+    quality ladder; it steps back up only after the pipeline has stayed below
+    `low` x budget for `up_after` seconds. After every change the window is
+    cleared and `settle` seconds are ignored so the new mode is measured on
+    its own. A level that immediately had to be abandoned again doubles the
+    wait before the next attempt (up to `max_up_after`), which stops the
+    governor from oscillating around the budget.
+    """
+
+    def __init__(self, levels, budget_ms: float = 40.0, window: int = 30,
+                 low: float = 0.6, up_after: float = 5.0, max_up_after: float = 120.0,
+                 settle: float = 1.0, clock=time.monotonic, log=print):
+        """
+        Args:
+            levels: QualityLevel list, best first (see build_levels)
+            budget_ms: Target per-frame pipeline time
+            window: Frames per measurement
+            low: Fraction of the budget the pipeline must stay under before stepping up
+            up_after: Seconds below `low` before stepping up
+            max_up_after: Upper bound for the backed-off step-up delay
+            settle: Seconds ignored after each change
+            clock: Monotonic time source (seconds)
+            log: Callable receiving one line per decision
+        """
+        self.levels = list(levels)
+        self.budget_ms = budget_ms
+        self.low = low
+        self.base_up_after = up_after
+        self.max_up_after = max_up_after
+        self.settle = settle
+        self.clock = clock
+        self.log = log
+
+        self.index = 0
+        # The tracker starts out in the top level's mode
+        self._applied_model = (self.level.model_complexity, self.level.max_num_hands)
+        self._applied_capture = (self.level.width, self.level.height, self.level.fps)
+        self._times = collections.deque(maxlen=window)
+        self._up_after = {}
+        self._last_change = clock()
+        self._low_since = None
+        self._last_up = None
+        self.decisions = collections.deque(maxlen=50)
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def _p90(self):
+        ordered = sorted(self._times)
+        return ordered[int(0.9 * (len(ordered) - 1))]
+
+    def _change(self, index, now, reason):
+        old = self.level
+        self.index = index
+        self._times.clear()
+        self._low_since = None
+        self._last_change = now
+        decision = {
+            'time': time.time(),
+            'from': old._asdict(),
+            'to': self.level._asdict(),
+            'reason': reason
+        }
+        self.decisions.append(decision)
+        self.log(f"[Governor] Level {self.levels.index(old)} -> {index}: {reason} "
+                 f"({self.level.width}x{self.level.height}, model {self.level.model_complexity}, "
+                 f"{self.level.max_num_hands} hand(s), fps cap {self.level.fps or 'off'})")
+        return self.level
+
+    def update(self, frame_ms: float):
+        """
+        Feed the pipeline time of one processed frame
+
+        Returns:
+            The new QualityLevel when the governor changed level, else None
+        """
+        now = self.clock()
+        if now - self._last_change < self.settle:
+            return None
+        self._times.append(frame_ms)
+        if len(self._times) < self._times.maxlen:
+            return None
+
+        p90 = self._p90()
+        if p90 > self.budget_ms:
+            self._low_since = None
+            if self.index + 1 >= len(self.levels):
+                return None
+            # Bounced straight back down: wait longer before retrying this level
+            if self._last_up is not None and now - self._last_up[1] < self._up_after_for(self.index):
+                self._up_after[self.index] = min(2 * self._up_after_for(self.index), self.max_up_after)
+            self._last_up = None
+            return self._change(self.index + 1, now,
+                                f"p90 {p90:.1f} ms over {self.budget_ms:.0f} ms budget")
+
+        if p90 < self.low * self.budget_ms and self.index > 0:
+            if self._low_since is None:
+                self._low_since = now
+            elif now - self._low_since >= self._up_after_for(self.index - 1):
+                self._last_up = (self.index - 1, now)
+                return self._change(self.index - 1, now,
+                                    f"p90 {p90:.1f} ms under {self.low * self.budget_ms:.0f} ms")
+        else:
+            self._low_since = None
+        return None
+
+    def _up_after_for(self, index):
+        return self._up_after.get(index, self.base_up_after)
+
+    def apply(self, tracker, capture: bool = True, force: bool = False):
+        """
+        Push the current level to a HandTracker (only what changed)
+
+        Args:
+            capture: Also change the capture mode (False while idle mode owns it)
+            force: Re-apply the capture mode even if unchanged (e.g. after idle)
+        """
+        level = self.level
+        model = (level.model_complexity, level.max_num_hands)
+        if model != self._applied_model:
+            tracker.configure_model(*model)
+            self._applied_model = model
+        mode = (level.width, level.height, level.fps)
+        if capture and (force or mode != self._applied_capture):
+            tracker.set_capture_mode(*self.capture_mode(tracker.nominal_fps))
+            self._applied_capture = mode
+
+    def capture_mode(self, nominal_fps=None):
+        """(width, height, fps) for the current level"""
+        level = self.level
+        return level.width, level.height, level.fps or nominal_fps
+
+    def stats(self):
+        return {
+            'level': self.index,
+            'levels': len(self.levels),
+            'mode': self.level._asdict(),
+            'budget_ms': self.budget_ms,
+            'p90_ms': round(self._p90(), 2) if self._times else None,
+            'last_decision': self.decisions[-1] if self.decisions else None
+        }
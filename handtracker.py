@@ -1,106 +1,352 @@
+import time
 import cv2
+import numpy as np
 import mediapipe as mp
 from utils.config import Config
+from frame_grabber import FrameGrabber
+from inference_worker import InferenceWorker
+from landmarks import HandLandmarks, NUM_LANDMARKS
+from roi import HandRoi
+from frame_sources import open_source
+from overlay import OverlayRenderer
+
+INFERENCE_MODES = ('inprocess', 'process')
+
+class _ImageBuffer:
+    """uint8 image reused across frames, reallocated only when the size changes"""
+    def __init__(self):
+        self.array = None
+        self.readonly = None
+    
+    def get(self, shape):
+        if self.array is None or self.array.shape != shape:
+            self.array = np.empty(shape, dtype=np.uint8)
+            # Read-only view handed to MediaPipe (lets it skip its defensive copy)
+            self.readonly = self.array.view()
+            self.readonly.flags.writeable = False
+        return self.array
 
 class HandTracker:
-    def __init__(self, cfg: Config, camera_index: int = 0, model_complexity: int = 0):
+    def __init__(self, cfg: Config, source=0, model_complexity: int = 0,
+                 threaded: bool = None, inference: str = None, roi: bool = None,
+                 max_num_hands: int = 2):
         """
         Initialize hand tracker
         
         Args:
             cfg: Configuration object
-            camera_index: Camera device index (default: 0)
+            source: FrameSource, camera index, video file, image directory or
+                'synthetic' (see frame_sources.open_source; default: camera 0)
             model_complexity: MediaPipe model complexity (0=Lite, 1=Full)
+            threaded: Capture live sources on a background thread, keeping only
+                the newest frame (default: cfg.THREADED_CAPTURE; recorded sources
+                are always read inline so no frame is skipped)
+            inference: 'inprocess' runs MediaPipe here, 'process' runs it in a
+                worker process fed through shared memory (default: cfg.INFERENCE_MODE)
+            roi: Run inference on a fixed-size crop around the previous frame's
+                hands, falling back to the full frame when lost (default: cfg.ROI_MODE)
+            max_num_hands: Maximum number of hands to detect
         """
         self.cfg = cfg
-        self.camera_index = camera_index
         self.model_complexity = model_complexity
+        self.max_num_hands = max_num_hands
+        self.inference = cfg.INFERENCE_MODE if inference is None else inference
+        if self.inference not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode: {self.inference}")
         
-        # Initialize camera
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap.isOpened():
-            raise RuntimeError(f"Failed to open camera at index {camera_index}")
+        # Initialize frame source (camera, file, images, generator)
+        self.source = open_source(source, cfg)
+        # Rate to restore after idle; some drivers report CAP_PROP_FPS as 0
+        self.nominal_fps = self.source.fps or (cfg.CAP_FPS if self.source.live else None)
         
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.cfg.CAP_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.cfg.CAP_HEIGHT)
+        threaded = cfg.THREADED_CAPTURE if threaded is None else threaded
+        self.threaded = threaded and self.source.live
         
-        # Initialize MediaPipe Hands
+        # Initialize MediaPipe Hands (in this process or in a worker)
         self.mp = mp.solutions.hands
-        self.hands = self.mp.Hands(
-            max_num_hands=2,
-            model_complexity=model_complexity,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.draw = mp.solutions.drawing_utils
+        self.hands = None
+        self.detector = None  # static-mode model for full-frame re-detects (ROI mode)
+        self.worker = None
+        if self.inference == 'process':
+            self.worker = InferenceWorker(
+                self.cfg.CAP_WIDTH, self.cfg.CAP_HEIGHT,
+                model_complexity=model_complexity,
+                max_num_hands=max_num_hands
+            )
+        else:
+            self.hands = self._create_hands()
+        
+        # Region-of-interest cropping driven by the previous frame
+        self.use_roi = cfg.ROI_MODE if roi is None else roi
+        self.roi = HandRoi(cfg.ROI_SIZE, cfg.ROI_MARGIN) if self.use_roi else None
+        # Re-detects on the whole frame get their own static model, so they
+        # are not read as a jump of the hands the tracking model follows
+        if self.roi is not None and self.worker is None:
+            self.detector = self._create_hands(static=True)
+        
+        # Reused per-frame buffers (inline capture target, RGB conversion, ROI crop)
+        self._inline_frame = None
+        self._rgb = _ImageBuffer()
+        self._crop = _ImageBuffer()
+        
+        # Lazily enabled landmark overlay (debug window, preview, recording)
+        self.overlay = OverlayRenderer(cfg.OVERLAY_FPS, draw=cfg.DEBUG_OVERLAY)
         
         # State
         self.latest = None
         self.latest_frame = None
+        self.latest_timestamp = None   # capture time (time.monotonic)
+        self.latest_inferred = None    # landmarks ready (time.monotonic)
+        self.last_process_time = 0.0  # seconds spent on the last frame after capture
+        self.switched = ()  # one camera: hands never change coordinate frame
+        
+        # Capture thread (latest-frame-wins)
+        self.grabber = None
+        if self.threaded:
+            self.grabber = FrameGrabber(self.source, name=f"FrameGrabber-{self.source.name}").start()
+        
+        print(f"[HandTracker] Initialized with {self.source.name}, "
+              f"model complexity {model_complexity}, "
+              f"{'threaded' if self.threaded else 'inline'} capture, "
+              f"{self.inference} inference"
+              f"{f', ROI {self.roi.size}px' if self.roi else ''}")
+    
+    def _create_hands(self, static=False):
+        return self.mp.Hands(
+            static_image_mode=static,
+            max_num_hands=self.max_num_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+    
+    def configure_model(self, model_complexity: int = None, max_num_hands: int = None):
+        """
+        Reload the hand model with a different complexity or hand count
+        
+        Args:
+            model_complexity: MediaPipe model complexity (None = unchanged)
+            max_num_hands: Maximum number of hands (None = unchanged)
+        """
+        if model_complexity is not None:
+            self.model_complexity = model_complexity
+        if max_num_hands is not None:
+            self.max_num_hands = max_num_hands
+        
+        if self.worker is not None:
+            self.worker.configure(self.model_complexity, self.max_num_hands)
+        else:
+            self.hands.close()
+            self.hands = self._create_hands()
+            if self.detector is not None:
+                self.detector.close()
+                self.detector = self._create_hands(static=True)
         
-        print(f"[HandTracker] Initialized with camera {camera_index}, "
-              f"model complexity {model_complexity}")
+        # Tracking state of the old model is gone
+        if self.roi is not None:
+            self.roi.reset()
+        print(f"[HandTracker] Model complexity {self.model_complexity}, "
+              f"max {self.max_num_hands} hand(s)")
     
-    def step(self):
+    def _read_frame(self, block, timeout):
+        """Fetch the next frame, either from the capture thread or inline"""
+        if self.grabber is not None:
+            return self.grabber.read(block=block, timeout=timeout)
+        
+        # Decode into the previous frame's buffer when the size is unchanged
+        ret, frame = self.source.read(self._inline_frame)
+        if not ret:
+            return None, None
+        self._inline_frame = frame
+        return frame, time.monotonic()
+    
+    def step(self, block: bool = True, timeout: float = 1.0):
         """
         Process one frame and return hand landmarks
         
+        Args:
+            block: Wait for a fresh frame from the capture thread. When False
+                and no new frame has arrived, returns (None, None) immediately.
+            timeout: Maximum time to wait for a frame in seconds
+        
         Returns:
-            tuple: (hands_data, frame) where hands_data is list of (landmarks, label)
+            tuple: (hands, frame) where hands is a HandLandmarks ((n, 21, 3) float32
+                points plus labels; iterates as (landmarks, label)) or None.
+                The frame buffer is reused, so it is only valid until the next step().
         """
-        ret, frame = self.cap.read()
-        if not ret:
+        frame, timestamp = self._read_frame(block, timeout)
+        if frame is None:
             return None, None
         
-        # Convert to RGB for MediaPipe
-        img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        res = self.hands.process(img)
-        
-        out = []
-        
-        if res.multi_hand_landmarks and res.multi_handedness:
-            for lm, hinfo in zip(res.multi_hand_landmarks, res.multi_handedness):
-                # Extract landmarks as list of [x, y] coordinates
-                pts = [[p.x, p.y] for p in lm.landmark]
-                
-                # Get hand label (left/right)
-                label = hinfo.classification[0].label.lower()
-                
-                out.append((pts, label))
-                
-                # Draw landmarks on frame if debug overlay enabled
-                if self.cfg.DEBUG_OVERLAY:
-                    self.draw.draw_landmarks(
-                        frame, 
-                        lm, 
-                        self.mp.HAND_CONNECTIONS
-                    )
-        
-        self.latest = out if out else None
+        started = time.perf_counter()
+        out = self._detect(frame)
+        inferred = time.monotonic()
+        
+        # Overlay rendering happens on its own thread, only when subscribed
+        if self.overlay.active:
+            self.overlay.submit(frame, out)
+        
+        self.latest = out
         self.latest_frame = frame
+        self.latest_timestamp = timestamp
+        self.latest_inferred = inferred
+        self.last_process_time = time.perf_counter() - started
         
         return self.latest, self.latest_frame
     
+    def _detect(self, frame):
+        """Run inference on the ROI crop when tracking, on the full frame otherwise"""
+        if self.roi is None:
+            return self._infer(frame)
+        
+        fh, fw = frame.shape[:2]
+        region = self.roi.region(fw, fh)
+        out = None
+        
+        if region is not None:
+            x, y, w, h = region
+            size = self.roi.size
+            crop = self._crop.get((size, size, 3))
+            cv2.resize(frame[y:y + h, x:x + w], (size, size), dst=crop,
+                       interpolation=cv2.INTER_AREA)
+            out = self._infer(crop)
+            if out is not None:
+                self.roi.to_full(out.points, region, fw, fh)
+                self.roi.roi_frames += 1
+            else:
+                # Tracking lost: redo detection on the whole frame
+                self.roi.fallbacks += 1
+        
+        if out is None:
+            # Palm detection (static model) only for genuine re-detects: no
+            # hands last frame, or the crop lost them. Hands too large for a
+            # crop stay on the tracking model, as without ROI.
+            redetect = self.roi.bbox is None or region is not None
+            out = self._infer(frame, static=redetect)
+            self.roi.full_frames += 1
+        
+        self.roi.update(out.points if out is not None else None)
+        return out
+    
+    def _infer(self, image, static=False):
+        """
+        Run MediaPipe on a BGR image, returns HandLandmarks or None
+        
+        static=True uses the static-image model, for full frames between
+        ROI crops, so the tracking model's state is left alone.
+        """
+        if self.worker is not None:
+            return self._infer_worker(image, static)
+        return self._infer_inprocess(image, static)
+    
+    def _infer_inprocess(self, frame, static=False):
+        """Run MediaPipe in this process"""
+        # Convert to RGB for MediaPipe into the reused buffer
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb.get(frame.shape))
+        model = self.detector if static else self.hands
+        res = model.process(self._rgb.readonly)
+        
+        if not (res.multi_hand_landmarks and res.multi_handedness):
+            return None
+        
+        n = len(res.multi_hand_landmarks)
+        points = np.empty((n, NUM_LANDMARKS, 3), dtype=np.float32)
+        scores = np.empty(n, dtype=np.float32)
+        labels = []
+        
+        for h, (lm, hinfo) in enumerate(zip(res.multi_hand_landmarks, res.multi_handedness)):
+            # Fill the preallocated (hands, 21, 3) block in place
+            hand = points[h]
+            for i, p in enumerate(lm.landmark):
+                hand[i, 0] = p.x
+                hand[i, 1] = p.y
+                hand[i, 2] = p.z
+            
+            # Get hand label (left/right)
+            cls = hinfo.classification[0]
+            labels.append(cls.label.lower())
+            scores[h] = cls.score
+        
+        return HandLandmarks(points, labels, scores)
+    
+    def _infer_worker(self, frame, static=False):
+        """Run MediaPipe in the worker process via shared memory"""
+        h, w = frame.shape[:2]
+        # Color conversion writes straight into the shared block
+        buf = self.worker.frame_buffer(h, w)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buf)
+        del buf
+        
+        points, labels, scores = self.worker.process(h, w, static=static)
+        if not labels:
+            return None
+        
+        return HandLandmarks(points, labels, scores)
+    
+    def set_capture_mode(self, width: int, height: int, fps: float = None):
+        """
+        Change camera resolution (and optionally frame rate) on the fly
+        
+        With threaded capture the change is applied on the capture thread
+        before its next read, so the very next frame uses the new mode.
+        """
+        def apply():
+            self.source.set_mode(width, height, fps)
+        
+        if self.grabber is not None:
+            self.grabber.call_soon(apply)
+        else:
+            apply()
+        
+        # Previous-frame crop is meaningless after a mode switch
+        if self.roi is not None:
+            self.roi.reset()
+    
+    def step_nowait(self):
+        """Non-blocking step: (None, None) if no new frame is pending"""
+        return self.step(block=False)
+    
+    def capture_stats(self):
+        """Captured/dropped frame counters (threaded capture only)"""
+        if self.grabber is None:
+            return {'captured': None, 'dropped': 0, 'read_failures': 0}
+        return self.grabber.stats()
+    
+    @property
+    def exhausted(self):
+        """True once a recorded source has no more frames"""
+        return self.source.exhausted
+    
     def get_camera_info(self):
-        """Get camera properties"""
-        if not self.cap.isOpened():
+        """Get frame source properties"""
+        if not self.source.is_opened():
             return None
         
-        return {
-            'index': self.camera_index,
-            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-            'fps': int(self.cap.get(cv2.CAP_PROP_FPS)),
-            'backend': self.cap.getBackendName()
-        }
+        info = self.source.info()
+        info.update({
+            'threaded': self.threaded,
+            'dropped_frames': self.capture_stats()['dropped'],
+            'roi': self.roi.stats() if self.roi else None
+        })
+        return info
     
     def shutdown(self):
         """Clean up resources"""
+        if self.grabber is not None:
+            self.grabber.stop()
+        
+        if self.worker is not None:
+            self.worker.close()
+        elif self.hands is not None:
+            self.hands.close()
+            if self.detector is not None:
+                self.detector.close()
+        
         try:
-            if hasattr(self, 'cap') and self.cap is not None:
-                self.cap.release()
+            if hasattr(self, 'source') and self.source is not None:
+                self.source.release()
         except Exception as e:
-            print(f"[HandTracker] Error releasing camera: {e}")
+            print(f"[HandTracker] Error releasing frame source: {e}")
         
         try:
             cv2.destroyAllWindows()
@@ -0,0 +1,96 @@
+import time
+
+
+class IdleStateMachine:
+    """
+    Active/idle power states for the tracking loop.
+
+    After `idle_after` seconds without hands the loop should drop to a low
+    frame rate and resolution; the first frame with a hand switches back.
+    Time spent in each state and wake-up latency (capture of the frame that
+    saw the hand -> first full-rate frame processed) are tracked for status.json.
+    """
+
+    ACTIVE = 'active'
+    IDLE = 'idle'
+
+    def __init__(self, idle_after: float = 5.0, clock=time.monotonic):
+        """
+        Args:
+            idle_after: Seconds without hands before going idle
+            clock: Monotonic time source (seconds)
+        """
+        self.idle_after = idle_after
+        self.clock = clock
+
+        now = clock()
+        self.state = self.ACTIVE
+        self._state_since = now
+        self._last_hand = now
+        self._time_in = {self.ACTIVE: 0.0, self.IDLE: 0.0}
+
+        self._wake_started = None
+        self.wake_count = 0
+        self.last_wake_latency = None
+        self._wake_latency_total = 0.0
+
+    def _enter(self, state, now):
+        self._time_in[self.state] += now - self._state_since
+        self.state = state
+        self._state_since = now
+
+    def update(self, has_hands: bool, frame_timestamp: float = None):
+        """
+        Feed one processed frame
+
+        Args:
+            has_hands: Whether the frame contained at least one hand
+            frame_timestamp: Capture time of the frame (same clock), if known
+
+        Returns:
+            str or None: 'sleep' or 'wake' when the state changed on this frame
+        """
+        now = self.clock()
+
+        if has_hands:
+            self._last_hand = now
+            if self.state == self.IDLE:
+                self._enter(self.ACTIVE, now)
+                self._wake_started = frame_timestamp if frame_timestamp is not None else now
+                return 'wake'
+            return None
+
+        if self.state == self.ACTIVE and now - self._last_hand >= self.idle_after:
+            self._enter(self.IDLE, now)
+            return 'sleep'
+        return None
+
+    def frame_processed(self):
+        """Call after each full-rate frame; closes an open wake-latency measurement"""
+        if self._wake_started is None or self.state != self.ACTIVE:
+            return
+        latency = self.clock() - self._wake_started
+        self._wake_started = None
+        self.wake_count += 1
+        self.last_wake_latency = latency
+        self._wake_latency_total += latency
+
+    @property
+    def idle(self):
+        return self.state == self.IDLE
+
+    def stats(self):
+        """State, time per state and wake-up latency for status.json"""
+        now = self.clock()
+        time_in = dict(self._time_in)
+        time_in[self.state] += now - self._state_since
+        return {
+            'state': self.state,
+            'state_seconds': round(now - self._state_since, 3),
+            'time_in_state': {k: round(v, 3) for k, v in time_in.items()},
+            'wake_count': self.wake_count,
+            'last_wake_latency_ms': round(self.last_wake_latency * 1000, 2)
+                if self.last_wake_latency is not None else None,
+            'avg_wake_latency_ms': round(self._wake_latency_total / self.wake_count * 1000, 2)
+                if self.wake_count else None
+        }
@@ -0,0 +1,221 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from landmarks import MAX_HANDS, NUM_LANDMARKS, HAND_LABELS
+
+# Result block layout (shared memory, written by the worker)
+
+_POINTS_SHAPE = (MAX_HANDS, NUM_LANDMARKS, 3)
+_POINTS_BYTES = int(np.prod(_POINTS_SHAPE)) * 4
+_SCORES_BYTES = MAX_HANDS * 4
+_LABELS_BYTES = MAX_HANDS
+RESULT_BYTES = _POINTS_BYTES + _SCORES_BYTES + _LABELS_BYTES
+
+
+def _result_views(buf):
+    """Numpy views over the result block: (points, scores, label codes)"""
+    points = np.ndarray(_POINTS_SHAPE, dtype=np.float32, buffer=buf, offset=0)
+    scores = np.ndarray((MAX_HANDS,), dtype=np.float32, buffer=buf, offset=_POINTS_BYTES)
+    labels = np.ndarray((MAX_HANDS,), dtype=np.uint8, buffer=buf,
+                        offset=_POINTS_BYTES + _SCORES_BYTES)
+    return points, scores, labels
+
+
+def create_hands(model_complexity, max_num_hands, static=False):
+    """MediaPipe Hands model, the worker's default model factory"""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=static,
+        max_num_hands=max_num_hands,
+        model_complexity=model_complexity,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def _worker_main(conn, frame_shm_name, result_shm_name, model_complexity, max_num_hands,
+                 create=create_hands):
+    """Worker process entry point: owns the MediaPipe model"""
+    hands = create(model_complexity, max_num_hands)
+    detector = None  # static-mode model, created on the first full-frame re-detect
+    frame_shm = shared_memory.SharedMemory(name=frame_shm_name)
+    result_shm = shared_memory.SharedMemory(name=result_shm_name)
+    points, scores, labels = _result_views(result_shm.buf)
+
+    conn.send(('ready',))
+    try:
+        while True:
+            msg = conn.recv()
+            cmd = msg[0]
+
+            if cmd == 'frame':
+                _, seq, h, w, static = msg
+                img = np.ndarray((h, w, 3), dtype=np.uint8, buffer=frame_shm.buf)
+                img.flags.writeable = False
+                if static and detector is None:
+                    detector = create(model_complexity, max_num_hands, static=True)
+                res = (detector if static else hands).process(img)
+
+                n = 0
+                if res.multi_hand_landmarks and res.multi_handedness:
+                    for lm, hinfo in zip(res.multi_hand_landmarks, res.multi_handedness):
+                        if n >= MAX_HANDS:
+                            break
+                        for i, p in enumerate(lm.landmark):
+                            points[n, i, 0] = p.x
+                            points[n, i, 1] = p.y
+                            points[n, i, 2] = p.z
+                        cls = hinfo.classification[0]
+                        scores[n] = cls.score
+                        labels[n] = 1 if cls.label.lower() == 'right' else 0
+                        n += 1
+                del img
+                conn.send(('done', seq, n))
+
+            elif cmd == 'configure':
+                # Reload the model with a new complexity / hand count
+                _, model_complexity, max_num_hands = msg
+                hands.close()
+                hands = create(model_complexity, max_num_hands)
+                if detector is not None:
+                    detector.close()
+                    detector = None
+                conn.send(('configured',))
+
+            elif cmd == 'remap':
+                # Parent grew the frame buffer
+                frame_shm.close()
+                frame_shm = shared_memory.SharedMemory(name=msg[1])
+                conn.send(('remapped',))
+
+            elif cmd == 'stop':
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del points, scores, labels
+        hands.close()
+        if detector is not None:
+            detector.close()
+        frame_shm.close()
+        result_shm.close()
+
+
+class InferenceWorker:
+    """
+    MediaPipe Hands running in a dedicated process.
+
+    Frames are written straight into a shared-memory block and landmarks are
+    read back from a second one; only tiny control tuples cross the pipe, so
+    frame arrays are never pickled. Inference no longer competes for the GIL
+    with logging, status writes and input injection in the main process.
+    """
+
+    def __init__(self, width: int, height: int, model_complexity: int = 0,
+                 max_num_hands: int = 2, start_timeout: float = 30.0, model_factory=create_hands):
+        """
+        Args:
+            width, height: Initial frame size (buffer grows on demand)
+            model_complexity: MediaPipe model complexity (0=Lite, 1=Full)
+            max_num_hands: Maximum hands to detect (capped at MAX_HANDS)
+            start_timeout: Seconds to wait for the model to load
+            model_factory: Picklable module-level callable
+                (model_complexity, max_num_hands, static) -> object with a
+                MediaPipe-like process(); default create_hands
+        """
+        self.max_num_hands = min(max_num_hands, MAX_HANDS)
+        self._seq = 0
+
+        self.frame_shm = shared_memory.SharedMemory(create=True, size=width * height * 3)
+        self.result_shm = shared_memory.SharedMemory(create=True, size=RESULT_BYTES)
+        self._points, self._scores, self._labels = _result_views(self.result_shm.buf)
+
+        ctx = multiprocessing.get_context('spawn')
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.frame_shm.name, self.result_shm.name,
+                  model_complexity, self.max_num_hands, model_factory),
+            name='InferenceWorker',
+            daemon=True
+        )
+        self.proc.start()
+        child_conn.close()
+
+        if not self.conn.poll(start_timeout):
+            self.close()
+            raise RuntimeError("Inference worker failed to start")
+        self.conn.recv()
+
+        print(f"[InferenceWorker] Started (pid {self.proc.pid}, "
+              f"model complexity {model_complexity})")
+
+    def frame_buffer(self, height: int, width: int):
+        """
+        Writable (height, width, 3) uint8 view into shared memory.
+
+        Fill it with an RGB image (e.g. cv2.cvtColor(..., dst=buf)) and call
+        process() with the same size to run inference without a copy.
+        """
+        self._ensure_capacity(height * width * 3)
+        return np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.frame_shm.buf)
+
+    def _ensure_capacity(self, nbytes):
+        if nbytes <= self.frame_shm.size:
+            return
+        new_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.conn.send(('remap', new_shm.name))
+        self.conn.recv()
+        old, self.frame_shm = self.frame_shm, new_shm
+        old.close()
+        old.unlink()
+
+    def process(self, height: int, width: int, timeout: float = 5.0, static: bool = False):
+        """
+        Run inference on the image currently in frame_buffer()
+
+        Args:
+            static: Use the worker's static-image model (full frames between
+                ROI crops) instead of the tracking one
+
+        Returns:
+            tuple: (points, labels, scores) with points a (hands, 21, 3) float32 copy
+        """
+        self._seq += 1
+        self.conn.send(('frame', self._seq, height, width, static))
+        if not self.conn.poll(timeout):
+            raise RuntimeError("Inference worker timed out")
+        _, seq, n = self.conn.recv()
+        if seq != self._seq:
+            raise RuntimeError(f"Inference worker out of sync ({seq} != {self._seq})")
+
+        labels = [HAND_LABELS[code] for code in self._labels[:n]]
+        return self._points[:n].copy(), labels, self._scores[:n].copy()
+
+    def configure(self, model_complexity: int, max_num_hands: int, timeout: float = 30.0):
+        """Reload the worker's model with a new complexity and hand count"""
+        self.max_num_hands = min(max_num_hands, MAX_HANDS)
+        self.conn.send(('configure', model_complexity, self.max_num_hands))
+        if not self.conn.poll(timeout):
+            raise RuntimeError("Inference worker did not reload its model")
+        self.conn.recv()
+
+    def close(self):
+        """Stop the worker and free shared memory"""
+        try:
+            if self.proc.is_alive():
+                self.conn.send(('stop',))
+                self.proc.join(timeout=2.0)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        except Exception as e:
+            print(f"[InferenceWorker] Error stopping worker: {e}")
+
+        # Views must be released before the blocks can be closed
+        self._points = self._scores = self._labels = None
+        for shm in (self.frame_shm, self.result_shm):
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
@@ -0,0 +1,99 @@
+import numpy as np
+
+# MediaPipe hand landmark indices
+NUM_LANDMARKS = 21
+MAX_HANDS = 4  # capacity of fixed-size shared-memory landmark blocks
+HAND_LABELS = ('left', 'right')  # label codes used in shared memory
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+FINGERTIPS = (THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP)
+
+# Same topology as mediapipe.solutions.hands.HAND_CONNECTIONS
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+)
+
+
+class HandLandmarks:
+    """
+    Landmarks for all hands in one frame.
+
+    points is a (hands, 21, 3) float32 array of normalized x, y, z; labels and
+    scores hold one entry per hand. This is the contract between the tracker,
+    gesture engine, calibration and debug recorder.
+
+    Iterating yields (points, label) per hand, so code written against the
+    old list-of-tuples format keeps working.
+    """
+
+    __slots__ = ('points', 'labels', 'scores', '_features')
+
+    def __init__(self, points, labels, scores=None):
+        self.points = points
+        self.labels = tuple(labels)
+        self.scores = scores if scores is not None else np.ones(len(self.labels), dtype=np.float32)
+        self._features = None  # per-frame cache, see features.hand_features
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), ())
+
+    @classmethod
+    def from_lists(cls, hands):
+        """Build from [(points, label), ...] where points are [x, y] or [x, y, z]"""
+        if not hands:
+            return cls.empty()
+        points = np.zeros((len(hands), NUM_LANDMARKS, 3), dtype=np.float32)
+        labels = []
+        for i, (pts, label) in enumerate(hands):
+            arr = np.asarray(pts, dtype=np.float32)
+            points[i, :, :arr.shape[-1]] = arr
+            labels.append(label)
+        return cls(points, labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __bool__(self):
+        return len(self.labels) > 0
+
+    def __iter__(self):
+        return zip(self.points, self.labels)
+
+    def keys(self):
+        """Stable per-frame hand keys, e.g. 'right_0'"""
+        return [f"{label}_{idx}" for idx, label in enumerate(self.labels)]
+
+    def to_list(self):
+        """JSON-friendly [[points, label], ...] (only for dumps, not the hot loop)"""
+        return [[pts.tolist(), label] for pts, label in self]
+
+
+def as_landmarks(hands):
+    """Accept HandLandmarks, a legacy list of (points, label) or None"""
+    if isinstance(hands, HandLandmarks):
+        return hands
+    return HandLandmarks.from_lists(hands)
+
+
+def pair_distances(points, a, b):
+    """
+    2D distances between landmark index sequences a and b for every hand
+
+    Args:
+        points: (hands, 21, 3) array
+        a, b: Equal-length sequences of landmark indices
+
+    Returns:
+        (hands, len(a)) float32 array
+    """
+    diff = points[:, a, :2] - points[:, b, :2]
+    return np.sqrt((diff * diff).sum(axis=-1))
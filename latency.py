@@ -0,0 +1,75 @@
+import time
+import numpy as np
+
+# Pipeline stages, in order; each trace stamps time.monotonic() at every one
+STAGES = ('capture', 'inference', 'engine', 'injection')
+
+
+class RollingPercentiles:
+    """Last `size` samples in a preallocated ring, summarized on demand"""
+
+    def __init__(self, size: int = 1000):
+        self._samples = np.zeros(size, dtype=np.float64)
+        self._count = 0
+
+    def add(self, value: float):
+        self._samples[self._count % len(self._samples)] = value
+        self._count += 1
+
+    def __len__(self):
+        return min(self._count, len(self._samples))
+
+    def summary(self):
+        """p50/p95/p99/max of the window (None when empty)"""
+        n = len(self)
+        if not n:
+            return None
+        window = self._samples[:n]
+        p50, p95, p99 = np.percentile(window, (50, 95, 99))
+        return {
+            'p50': round(float(p50), 2),
+            'p95': round(float(p95), 2),
+            'p99': round(float(p99), 2),
+            'max': round(float(window.max()), 2),
+            'count': self._count
+        }
+
+
+class LatencyTracer:
+    """
+    Per-stage latency of the capture -> inference -> engine -> injection path.
+
+    Every processed frame is recorded up to the engine stage; frames whose
+    gestures were injected add the injection stage and the end-to-end time.
+    All times are time.monotonic() seconds, reported in milliseconds.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.stages = {
+            'capture_to_inference': RollingPercentiles(window),
+            'inference_to_engine': RollingPercentiles(window),
+            'engine_to_injection': RollingPercentiles(window),
+            'capture_to_engine': RollingPercentiles(window),
+            'end_to_end': RollingPercentiles(window),
+        }
+
+    @staticmethod
+    def trace(capture: float, inference: float, engine: float = None):
+        """Timestamps for one frame, attached to each of its gestures"""
+        return {'capture': capture, 'inference': inference,
+                'engine': engine if engine is not None else time.monotonic()}
+
+    def record_frame(self, trace):
+        """Stages up to the gesture engine (every processed frame)"""
+        self.stages['capture_to_inference'].add((trace['inference'] - trace['capture']) * 1000)
+        self.stages['inference_to_engine'].add((trace['engine'] - trace['inference']) * 1000)
+        self.stages['capture_to_engine'].add((trace['engine'] - trace['capture']) * 1000)
+
+    def record_injection(self, trace):
+        """Injection stage of one handled gesture (trace['injection'] must be set)"""
+        self.stages['engine_to_injection'].add((trace['injection'] - trace['engine']) * 1000)
+        self.stages['end_to_end'].add((trace['injection'] - trace['capture']) * 1000)
+
+    def stats(self):
+        """{stage: {'p50', 'p95', 'p99', 'max', 'count'}} in milliseconds"""
+        return {name: hist.summary() for name, hist in self.stages.items()}
@@ -1,39 +1,38 @@
 import cv2
+import time
 import threading
-import mediapipe as mp
+from frame_bus import FrameBusReader, DEFAULT_BUS_NAME
+from overlay import draw_hands
 
 class LivePreview:
-    def __init__(self, camera_index=0):
-        self.cam = cv2.VideoCapture(camera_index, cv2.CAP_MSMF)
+    """Preview window fed by the core's frame bus (no second camera or model)"""
+    def __init__(self, bus_name=DEFAULT_BUS_NAME, attach_timeout=30.0):
+        self.bus_name = bus_name
+        self.attach_timeout = attach_timeout
         self.running = True
 
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=2, model_complexity=0)
         self.thread = threading.Thread(target=self.loop, daemon=True)
         self.thread.start()
 
-    def draw_landmarks(self, frame, hand_landmarks):
-        h, w, _ = frame.shape
-        for id, lm in enumerate(hand_landmarks.landmark):
-            cx, cy = int(lm.x * w), int(lm.y * h)
-            cv2.circle(frame, (cx, cy), 5, (0,255,255), -1)  # yellow
-
     def loop(self):
-        while self.running:
-            ret, frame = self.cam.read()
-            if not ret: continue
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb)
+        # The core creates the bus once its camera and model are up
+        reader = FrameBusReader.attach(self.bus_name, timeout=self.attach_timeout)
+        if reader is None:
+            print(f"[LivePreview] Frame bus '{self.bus_name}' not available")
+            return
 
-            if results.multi_hand_landmarks:
-                for lm in results.multi_hand_landmarks:
-                    self.draw_landmarks(frame, lm)
-
-            cv2.imshow("AirTouchPad Live Preview", frame)
+        while self.running:
+            item = reader.read()
+            if item is None:
+                if not reader.writer_alive: break
+                time.sleep(0.005)
+                continue
+
+            draw_hands(item.frame, item.hands)
+            cv2.imshow("AirTouchPad Live Preview", item.frame)
             cv2.waitKey(1)
 
-        self.cam.release()
+        reader.close()
         cv2.destroyAllWindows()
 
     def stop(self):
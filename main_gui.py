@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 import subprocess
 import sys
 import threading
+import queue
 import os
 from pathlib import Path
 
@@ -13,15 +14,14 @@ except:
     LivePreview = None
 
 try:
-    import cv2
-    CV2_AVAILABLE = True
+    from utils.system_tray import SystemTrayApp
 except:
-    CV2_AVAILABLE = False
+    SystemTrayApp = None
 
 try:
-    from utils.system_tray import SystemTrayApp
+    from camera_discovery import CameraDiscovery
 except:
-    SystemTrayApp = None
+    CameraDiscovery = None
 
 
 class MainGUI:
@@ -43,28 +43,58 @@ class MainGUI:
         self.preview = None
         self.system_tray = None
 
+        # Camera list comes from a background scan; results are handed over
+        # through a queue and applied on the Tk thread
+        self.camera_queue = queue.Queue()
+        self.camera_indices = {"Camera 0": 0}
+        self.discovery = None
+
         self.create_ui()
+        self.start_camera_discovery()
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-    def get_available_cameras(self):
-        if not CV2_AVAILABLE:
-            return ["Camera 0"]
-
-        cams = []
-        for i in range(3):
+    def start_camera_discovery(self):
+        if not CameraDiscovery:
+            return
+        self.discovery = CameraDiscovery()
+        # Cached result from the last run is shown immediately
+        self.set_cameras(self.discovery.cameras())
+        self.discovery.start(self.camera_queue.put)
+        self.root.after(200, self.poll_cameras)
+
+    def poll_cameras(self):
+        cameras = None
+        while True:
             try:
-                cap = cv2.VideoCapture(i, cv2.CAP_MSMF)
-                if cap.isOpened():
-                    cams.append(f"Camera {i}")
-                    cap.release()
-            except:
-                pass
-
-        if not cams:
-            cams = ["Camera 0"]
-
-        return cams
+                cameras = self.camera_queue.get_nowait()
+            except queue.Empty:
+                break
+        if cameras is not None:
+            self.set_cameras(cameras)
+        self.root.after(200, self.poll_cameras)
+
+    def set_cameras(self, cameras):
+        self.camera_indices = {}
+        for cam in cameras:
+            label = f"Camera {cam['index']}"
+            if cam.get('name') and cam['name'] != label:
+                label += f" - {cam['name']}"
+            if cam.get('modes'):
+                w, h, fps = cam['modes'][0]
+                label += f" ({w}x{h}@{fps:g})"
+            self.camera_indices[label] = cam['index']
+        if not self.camera_indices:
+            self.camera_indices = {"Camera 0": 0}
+
+        labels = list(self.camera_indices)
+        self.cam_menu.config(values=labels)
+        # Keep the selection when the same camera is still present
+        current = self.camera_indices.get(self.camera_var.get())
+        if current is None:
+            prefix = self.camera_var.get().split(" - ")[0].split(" (")[0]
+            current = next((l for l in labels if l.split(" - ")[0].split(" (")[0] == prefix), labels[0])
+            self.camera_var.set(current)
 
     def create_ui(self):
         # Header
@@ -113,14 +143,13 @@ class MainGUI:
                  bg=self.card_bg, fg=self.fg_color).grid(row=0, column=0,
                                                          sticky="w", padx=10, pady=5)
 
-        self.available_cameras = self.get_available_cameras()
         self.camera_var = tk.StringVar(self.root)
-        self.camera_var.set(self.available_cameras[0])
+        self.camera_var.set("Camera 0")
 
-        cam_menu = ttk.Combobox(perf_frame, textvariable=self.camera_var,
-                                values=self.available_cameras,
-                                state="readonly", width=15)
-        cam_menu.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
+        self.cam_menu = ttk.Combobox(perf_frame, textvariable=self.camera_var,
+                                     values=list(self.camera_indices),
+                                     state="readonly", width=30)
+        self.cam_menu.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
 
         tk.Label(perf_frame, text="Model Complexity:",
                  bg=self.card_bg, fg=self.fg_color).grid(row=1, column=0,
@@ -211,16 +240,17 @@ for optimal performance!
 
     def start_core(self):
         try:
-            cam_idx = self.camera_var.get().split()[-1]
+            cam_idx = str(self.camera_indices.get(self.camera_var.get(), 0))
             model_complexity = self.model_complexity_var.get().split()[0]
 
+            # The core owns the camera and publishes frames for the preview
             self.core_process = subprocess.Popen(
-                [sys.executable, "beast_core.py", cam_idx, model_complexity]
+                [sys.executable, "beast_core.py", cam_idx, model_complexity, "--publish"]
             )
 
             # Live preview window
             if LivePreview:
-                self.preview = LivePreview(int(cam_idx))
+                self.preview = LivePreview()
 
             self.status_indicator.itemconfig(self.status_circle, fill=self.success_color)
             self.status_label.config(text="Active")
@@ -269,6 +299,8 @@ for optimal performance!
                 return
 
             self.stop_core()
+        if self.discovery:
+            self.discovery.stop()
         self.root.quit()
 
     def run(self):
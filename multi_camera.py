@@ -0,0 +1,316 @@
+import time
+import threading
+import numpy as np
+from handtracker import HandTracker
+from landmarks import HandLandmarks, HAND_LABELS
+from overlay import OverlayRenderer
+
+# Another camera must beat the current one by this much to take over a hand
+SWITCH_MARGIN = 0.1
+
+
+class _CameraWorker:
+    """
+    Runs one HandTracker on its own thread and keeps its newest result.
+
+    Frames are copied into a small ring of buffers (worker, ready, consumer)
+    so the consumer's frame stays valid while the tracker moves on.
+    """
+
+    def __init__(self, index, tracker, cond):
+        self.index = index
+        self.tracker = tracker
+        self._cond = cond
+
+        self._back = None
+        self._ready = None
+        self._front = None
+        self._has_ready = False
+        self.hands = None
+        self.timestamp = None
+        self.inferred = None
+        self.process_time = 0.0
+        self.seq = 0
+        self.exhausted = False
+
+        self.frames = 0
+        self.frames_with_hands = 0
+        self.selected = 0
+        self.fps = 0.0
+        self.latency_ms = 0.0
+        self._last_done = None
+        self._pending = []
+
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, name=f"Camera-{index}", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        tracker = self.tracker
+        while self.running:
+            if self._pending:
+                with self._cond:
+                    pending, self._pending = self._pending, []
+                for fn in pending:
+                    try:
+                        fn()
+                    except Exception as e:
+                        print(f"[MultiCameraTracker] Camera {self.index} reconfigure failed: {e}")
+
+            hands, frame = tracker.step(timeout=0.5)
+            if frame is None:
+                if tracker.exhausted:
+                    break
+                continue
+            done = time.monotonic()
+
+            if self._back is None or self._back.shape != frame.shape:
+                self._back = np.empty_like(frame)
+            np.copyto(self._back, frame)
+
+            # Smoothed per-camera rate and capture -> landmarks latency
+            if self._last_done is not None:
+                rate = 1.0 / max(done - self._last_done, 1e-6)
+                self.fps += 0.1 * (rate - self.fps) if self.fps else rate
+            self._last_done = done
+            latency = (done - tracker.latest_timestamp) * 1000
+            self.latency_ms += 0.1 * (latency - self.latency_ms) if self.frames else latency
+
+            with self._cond:
+                self._back, self._ready = self._ready, self._back
+                self._has_ready = True
+                self.hands = hands
+                self.timestamp = tracker.latest_timestamp
+                self.inferred = tracker.latest_inferred
+                self.process_time = tracker.last_process_time
+                self.seq += 1
+                self.frames += 1
+                if hands:
+                    self.frames_with_hands += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self.exhausted = True
+            self._cond.notify_all()
+
+    def call_soon(self, fn):
+        """Run fn() on this camera's thread between two frames"""
+        with self._cond:
+            self._pending.append(fn)
+
+    def take_frame(self):
+        """Hand the ready frame to the consumer (call with the lock held)"""
+        if self._has_ready:
+            self._front, self._ready = self._ready, self._front
+            self._has_ready = False
+        return self._front
+
+    def stats(self):
+        return {
+            'camera': self.index,
+            'source': self.tracker.source.name,
+            'fps': round(self.fps, 1),
+            'latency_ms': round(self.latency_ms, 1),
+            'frames': self.frames,
+            'frames_with_hands': self.frames_with_hands,
+            'selected': self.selected,
+            'capture': self.tracker.capture_stats()
+        }
+
+    def stop(self):
+        self.running = False
+        self._thread.join(timeout=2.0)
+
+
+class MultiCameraTracker:
+    """
+    Several frame sources tracked concurrently and merged into one stream.
+
+    Each source gets its own HandTracker on its own thread (with
+    inference='process' also its own MediaPipe process). step() returns the
+    best detection per hand label across cameras: the one with the highest
+    handedness score, with a margin so a hand does not flip between cameras
+    on noise. Landmarks stay in the normalized coordinates of the camera they
+    came from; the returned frame is that camera's frame.
+
+    Exposes the same interface as HandTracker, so beast_core can use either.
+    """
+
+    def __init__(self, cfg, sources, model_complexity: int = 0, inference: str = None,
+                 max_num_hands: int = 2, max_age: float = 0.25):
+        """
+        Args:
+            cfg: Configuration object
+            sources: Frame sources (anything HandTracker accepts)
+            model_complexity: MediaPipe model complexity (0=Lite, 1=Full)
+            inference: 'inprocess' or 'process' (default: cfg.INFERENCE_MODE)
+            max_num_hands: Maximum hands per camera
+            max_age: Results older than this (seconds) are not fused
+        """
+        self.cfg = cfg
+        self.max_age = max_age
+        self.trackers = [HandTracker(cfg, src, model_complexity, inference=inference,
+                                     max_num_hands=max_num_hands) for src in sources]
+        # Primary camera: overlay/bus fallback frame, live flag, nominal rate
+        self.source = self.trackers[0].source
+        self.nominal_fps = self.trackers[0].nominal_fps
+        self.model_complexity = model_complexity
+        self.max_num_hands = max_num_hands
+        self.roi = None
+        self.overlay = OverlayRenderer(cfg.OVERLAY_FPS, draw=cfg.DEBUG_OVERLAY)
+
+        self._cond = threading.Condition()
+        self._seen = [0] * len(self.trackers)
+        self._owner = {}  # hand label -> camera index currently providing it
+        # Labels whose camera changed in the last step(); their coordinates jump
+        self.switched = set()
+        self.cameras = [_CameraWorker(i, t, self._cond) for i, t in enumerate(self.trackers)]
+
+        self.latest = None
+        self.latest_frame = None
+        self.latest_timestamp = None
+        self.latest_inferred = None
+        self.last_process_time = 0.0
+
+        print(f"[MultiCameraTracker] Tracking {len(self.trackers)} sources: "
+              f"{', '.join(t.source.name for t in self.trackers)}")
+
+    def _fresh(self):
+        """Cameras with a result newer than the last step() (call with the lock held)"""
+        return any(cam.seq != seen for cam, seen in zip(self.cameras, self._seen))
+
+    def step(self, block: bool = True, timeout: float = 1.0):
+        """
+        Fuse the newest result of every camera
+
+        Returns:
+            tuple: (hands, frame) like HandTracker.step(); (None, None) if no
+                camera produced a new frame
+        """
+        self.switched = set()
+        with self._cond:
+            if not self._fresh():
+                if not block:
+                    return None, None
+                self._cond.wait_for(lambda: self._fresh() or self.exhausted, timeout)
+                if not self._fresh():
+                    return None, None
+
+            now = time.monotonic()
+            results = []
+            for cam in self.cameras:
+                self._seen[cam.index] = cam.seq
+                if cam.timestamp is not None and now - cam.timestamp <= self.max_age:
+                    results.append((cam.index, cam.hands))
+            hands, chosen = fuse(results, self._owner, switched=self.switched)
+
+            # Frame of the camera providing the first hand, else the primary one
+            frame_cam = self.cameras[chosen[0] if chosen else 0]
+            frame = frame_cam.take_frame()
+            timestamp, inferred = frame_cam.timestamp, frame_cam.inferred
+            process_time = max((self.cameras[i].process_time for i, _ in results), default=0.0)
+            for i in set(chosen):
+                self.cameras[i].selected += 1
+
+        if self.overlay.active and frame is not None:
+            self.overlay.submit(frame, hands)
+
+        self.latest = hands
+        self.latest_frame = frame
+        self.latest_timestamp = timestamp
+        self.latest_inferred = inferred
+        self.last_process_time = process_time
+        return hands, frame
+
+    def step_nowait(self):
+        return self.step(block=False)
+
+    def set_capture_mode(self, width: int, height: int, fps: float = None):
+        # Trackers are stepped on their camera threads, so changes are applied there
+        for cam in self.cameras:
+            cam.call_soon(lambda t=cam.tracker: t.set_capture_mode(width, height, fps))
+
+    def configure_model(self, model_complexity: int = None, max_num_hands: int = None):
+        for cam in self.cameras:
+            cam.call_soon(lambda t=cam.tracker: t.configure_model(model_complexity, max_num_hands))
+        if model_complexity is not None:
+            self.model_complexity = model_complexity
+        if max_num_hands is not None:
+            self.max_num_hands = max_num_hands
+
+    @property
+    def exhausted(self):
+        return all(cam.exhausted for cam in self.cameras)
+
+    def camera_stats(self):
+        """Per-camera FPS, latency and how often each camera was selected"""
+        return [cam.stats() for cam in self.cameras]
+
+    def capture_stats(self):
+        totals = {'captured': 0, 'dropped': 0, 'read_failures': 0}
+        for tracker in self.trackers:
+            for key, value in tracker.capture_stats().items():
+                totals[key] += value or 0
+        return totals
+
+    def get_camera_info(self):
+        info = self.trackers[0].get_camera_info() or {}
+        info['cameras'] = self.camera_stats()
+        return info
+
+    def shutdown(self):
+        for cam in self.cameras:
+            cam.stop()
+        for tracker in self.trackers:
+            tracker.shutdown()
+        print("[MultiCameraTracker] Shutdown complete")
+
+
+def fuse(results, owner, margin: float = SWITCH_MARGIN, switched=None):
+    """
+    Pick the best detection per hand label across cameras
+
+    Args:
+        results: [(camera index, HandLandmarks or None), ...]
+        owner: Dict label -> camera index that provided the label last time;
+            updated in place
+        margin: Score advantage another camera needs to take a hand over
+        switched: Optional set; labels that moved to another camera are added
+
+    Returns:
+        tuple: (HandLandmarks or None, [camera index per returned hand])
+    """
+    # Best candidate per label and camera
+    candidates = {}
+    for cam, hands in results:
+        if not hands:
+            continue
+        for h, label in enumerate(hands.labels):
+            score = float(hands.scores[h])
+            best = candidates.setdefault(label, {}).get(cam)
+            if best is None or score > best[0]:
+                candidates[label][cam] = (score, hands, h)
+
+    points, labels, scores, chosen = [], [], [], []
+    for label in HAND_LABELS:
+        per_cam = candidates.get(label)
+        if not per_cam:
+            owner.pop(label, None)
+            continue
+        cam = max(per_cam, key=lambda c: per_cam[c][0])
+        current = owner.get(label)
+        # Stay with the current camera unless it lost the hand or is clearly worse
+        if current in per_cam and per_cam[cam][0] - per_cam[current][0] < margin:
+            cam = current
+        elif current is not None and current != cam and switched is not None:
+            switched.add(label)
+        owner[label] = cam
+        score, hands, h = per_cam[cam]
+        points.append(hands.points[h])
+        labels.append(label)
+        scores.append(score)
+        chosen.append(cam)
+
+    if not labels:
+        return None, []
+    return HandLandmarks(np.stack(points), labels, np.array(scores, dtype=np.float32)), chosen
@@ -42,14 +42,22 @@ def check_windows_input_permissions():
     except Exception:
         return False
 
+def is_wayland():
+    """
+    Detect a Wayland session
+
+    XWayland also sets DISPLAY, so WAYLAND_DISPLAY counts as well as the
+    session type.
+    """
+    return (os.environ.get('XDG_SESSION_TYPE', '').lower() == 'wayland' or
+            bool(os.environ.get('WAYLAND_DISPLAY')))
+
 def check_linux_input_method():
     """Detect Linux display server and available input methods"""
     if 'linux' not in OS:
         return None
     
-    session_type = os.environ.get('XDG_SESSION_TYPE', '').lower()
-    
-    if session_type == 'wayland':
+    if is_wayland():
         # Check for Wayland input helpers
         if shutil.which('ydotool'):
             return 'wayland-ydotool'
@@ -58,7 +66,12 @@ def check_linux_input_method():
         else:
             return 'wayland-no-helper'
     else:
-        # X11 - check for xdotool
+        # X11 - XTEST through python-xlib, else xdotool
+        try:
+            import Xlib
+            return 'x11-xtest'
+        except ImportError:
+            pass
         if shutil.which('xdotool'):
             return 'x11-xdotool'
         else:
@@ -111,109 +124,427 @@ try:
 except Exception:
     pyautogui = None
 
-# Volume Controls
-def volume_up():
-    """Increase system volume"""
-    if pyautogui:
+# Persistent action backends
+#
+# Each action family (audio, media, backlight) is resolved once, on first use
+# or at EventMapper startup, to the best backend available: a native client
+# or open file handle kept for the whole session, else an external tool whose
+# path is looked up once and which is run without a shell. Relative steps are
+# passed as a count so a burst (e.g. 4 coalesced volume steps) costs one call.
+
+VOLUME_STEP = 5         # percent per volume step
+BRIGHTNESS_STEP = 10    # percent per brightness step
+BACKLIGHT_DIR = '/sys/class/backlight'
+
+try:
+    import pulsectl
+except ImportError:
+    pulsectl = None
+
+try:
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    open_dbus_connection = None
+
+def _spawn(argv):
+    """Run a resolved tool without a shell"""
+    try:
+        return subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+    except Exception:
+        return False
+
+class KeyAudio:
+    """Media keys through pyautogui (Windows, macOS, X11 with XF86 keys)"""
+    name = 'media-keys'
+
+    def change(self, steps):
+        key = 'volumeup' if steps > 0 else 'volumedown'
+        pyautogui.press(key, presses=abs(steps), _pause=False)
+        return True
+
+    def toggle_mute(self):
+        pyautogui.press('volumemute', _pause=False)
+        return True
+
+class PulseAudio:
+    """Native PulseAudio/PipeWire client holding one server connection"""
+    name = 'pulsectl'
+
+    def __init__(self):
+        self.pulse = pulsectl.Pulse('airtouchpad')
+
+    def _sink(self):
+        return self.pulse.get_sink_by_name(self.pulse.server_info().default_sink_name)
+
+    def _call(self, fn):
         try:
-            pyautogui.press('volumeup')
+            return fn(self._sink())
+        except pulsectl.PulseError:
+            # Server restarted: reconnect once
+            self.pulse.close()
+            self.pulse = pulsectl.Pulse('airtouchpad')
+            return fn(self._sink())
+
+    def change(self, steps):
+        def apply(sink):
+            level = sink.volume.value_flat + steps * VOLUME_STEP / 100.0
+            self.pulse.volume_set_all_chans(sink, max(0.0, min(1.0, level)))
             return True
-        except:
-            pass
-    
-    if 'windows' in OS:
-        # Use nircmd if available
-        if shutil.which('nircmd.exe'):
-            return _run_cmd('nircmd.exe changesysvolume 5000')
-    
-    elif 'linux' in OS:
-        if shutil.which('pactl'):
-            return _run_cmd('pactl set-sink-volume @DEFAULT_SINK@ +5%')
-        elif shutil.which('amixer'):
-            return _run_cmd('amixer set Master 5%+')
-    
-    return False
+        return self._call(apply)
+
+    def toggle_mute(self):
+        return self._call(lambda sink: self.pulse.mute(sink, not sink.mute) or True)
+
+    def close(self):
+        self.pulse.close()
+
+class PactlAudio:
+    """pactl, resolved once; n steps are one call"""
+    name = 'pactl'
+
+    def __init__(self, path):
+        self.path = path
+
+    def change(self, steps):
+        return _spawn([self.path, 'set-sink-volume', '@DEFAULT_SINK@', f'{steps * VOLUME_STEP:+d}%'])
+
+    def toggle_mute(self):
+        return _spawn([self.path, 'set-sink-mute', '@DEFAULT_SINK@', 'toggle'])
+
+class AmixerSession:
+    """One long-lived `amixer -s` process reading commands from a pipe"""
+    name = 'amixer'
+
+    def __init__(self, path):
+        self.path = path
+        self.proc = None
+
+    def _send(self, line):
+        for _ in range(2):  # restart once if the process died
+            if self.proc is None or self.proc.poll() is not None:
+                self.proc = subprocess.Popen([self.path, '-q', '-s'], stdin=subprocess.PIPE,
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                self.proc.stdin.write(line.encode() + b'\n')
+                self.proc.stdin.flush()
+                return True
+            except (BrokenPipeError, OSError):
+                self.proc = None
+        return False
 
-def volume_down():
-    """Decrease system volume"""
-    if pyautogui:
+    def change(self, steps):
+        return self._send(f"set Master {abs(steps) * VOLUME_STEP}%{'+' if steps > 0 else '-'}")
+
+    def toggle_mute(self):
+        return self._send('set Master toggle')
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.stdin.close()
+            self.proc.wait(1.0)
+            self.proc = None
+
+class NircmdAudio:
+    """nircmd on Windows, resolved once"""
+    name = 'nircmd'
+
+    def __init__(self, path):
+        self.path = path
+
+    def change(self, steps):
+        return _spawn([self.path, 'changesysvolume', str(steps * 65535 * VOLUME_STEP // 100)])
+
+    def toggle_mute(self):
+        return _spawn([self.path, 'mutesysvolume', '2'])
+
+class KeyMedia:
+    name = 'media-keys'
+
+    def play_pause(self):
+        pyautogui.press('playpause', _pause=False)
+        return True
+
+    def skip(self, steps):
+        pyautogui.press('nexttrack' if steps > 0 else 'prevtrack', presses=abs(steps), _pause=False)
+        return True
+
+class MprisMedia:
+    """MPRIS over a session D-Bus connection held open"""
+    name = 'mpris'
+    PLAYER = 'org.mpris.MediaPlayer2.Player'
+    # Preferred player states; anything else ranks after these
+    STATUS_RANK = {'Playing': 0, 'Paused': 1}
+
+    def __init__(self, fallback=None):
+        """
+        Args:
+            fallback: Media backend used while no MPRIS player is running
+                (e.g. KeyMedia, for players without MPRIS support)
+        """
+        self.fallback = fallback
+        self.conn = open_dbus_connection(bus='SESSION')
+        self.bus = DBusAddress('/org/freedesktop/DBus', bus_name='org.freedesktop.DBus',
+                               interface='org.freedesktop.DBus')
+
+    def _status(self, name):
+        props = DBusAddress('/org/mpris/MediaPlayer2', bus_name=name,
+                            interface='org.freedesktop.DBus.Properties')
         try:
-            pyautogui.press('volumedown')
-            return True
-        except:
-            pass
-    
-    if 'windows' in OS:
-        if shutil.which('nircmd.exe'):
-            return _run_cmd('nircmd.exe changesysvolume -5000')
-    
-    elif 'linux' in OS:
-        if shutil.which('pactl'):
-            return _run_cmd('pactl set-sink-volume @DEFAULT_SINK@ -5%')
-        elif shutil.which('amixer'):
-            return _run_cmd('amixer set Master 5%-')
-    
-    return False
+            reply = self.conn.send_and_get_reply(
+                new_method_call(props, 'Get', 'ss', (self.PLAYER, 'PlaybackStatus')))
+            return reply.body[0][1]
+        except Exception:
+            return None  # player quit in the meantime
 
-def mute_toggle():
-    """Toggle mute"""
-    if pyautogui:
+    def _player(self):
+        """The playing player, else a paused one, else the first by name"""
+        names = self.conn.send_and_get_reply(new_method_call(self.bus, 'ListNames')).body[0]
+        players = sorted(n for n in names if n.startswith('org.mpris.MediaPlayer2.'))
+        if not players:
+            return None
+        if len(players) > 1:
+            players.sort(key=lambda n: self.STATUS_RANK.get(self._status(n), len(self.STATUS_RANK)))
+        return DBusAddress('/org/mpris/MediaPlayer2', bus_name=players[0], interface=self.PLAYER)
+
+    def _call(self, method, times=1):
+        player = self._player()
+        if player is None:
+            return False
+        for _ in range(times):
+            self.conn.send_and_get_reply(new_method_call(player, method))
+        return True
+
+    def play_pause(self):
+        return self._call('PlayPause') or (self.fallback is not None and self.fallback.play_pause())
+
+    def skip(self, steps):
+        return (self._call('Next' if steps > 0 else 'Previous', abs(steps))
+                or (self.fallback is not None and self.fallback.skip(steps)))
+
+    def close(self):
+        self.conn.close()
+
+class PlayerctlMedia:
+    """playerctl, resolved once"""
+    name = 'playerctl'
+
+    def __init__(self, path):
+        self.path = path
+
+    def play_pause(self):
+        return _spawn([self.path, 'play-pause'])
+
+    def skip(self, steps):
+        command = 'next' if steps > 0 else 'previous'
+        return all(_spawn([self.path, command]) for _ in range(abs(steps)))
+
+class SysfsBacklight:
+    """Backlight brightness file kept open; the level is re-read before each change"""
+    name = 'sysfs'
+
+    def __init__(self, device_dir):
+        self.device_dir = device_dir
+        with open(os.path.join(device_dir, 'max_brightness')) as f:
+            self.max = int(f.read().strip())
+        # Read-write: other tools (keys, the desktop) change the level too
+        self.fd = os.open(os.path.join(device_dir, 'brightness'), os.O_RDWR)
+
+    @property
+    def level(self):
+        """Current level, read with one pread() on the held descriptor"""
+        return int(os.pread(self.fd, 32, 0).split()[0])
+
+    def _write(self, level):
+        level = max(0, min(self.max, level))
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, b'%d\n' % level)
+        return True
+
+    def set(self, percent):
+        return self._write(round(self.max * percent / 100))
+
+    def change(self, steps):
+        return self._write(self.level + round(self.max * steps * BRIGHTNESS_STEP / 100))
+
+    def close(self):
+        os.close(self.fd)
+
+class BrightnessctlBacklight:
+    name = 'brightnessctl'
+
+    def __init__(self, path):
+        self.path = path
+
+    def set(self, percent):
+        return _spawn([self.path, '-q', 'set', f'{percent}%'])
+
+    def change(self, steps):
+        return _spawn([self.path, '-q', 'set', f"{abs(steps) * BRIGHTNESS_STEP}%{'+' if steps > 0 else '-'}"])
+
+class XbacklightBacklight:
+    name = 'xbacklight'
+
+    def __init__(self, path):
+        self.path = path
+
+    def set(self, percent):
+        return _spawn([self.path, '-set', str(percent)])
+
+    def change(self, steps):
+        return _spawn([self.path, '-inc' if steps > 0 else '-dec', str(abs(steps) * BRIGHTNESS_STEP)])
+
+class CommandBacklight:
+    """Tools that only set an absolute level; relative steps use a tracked level"""
+
+    def __init__(self, name, argv, level=50):
+        """
+        Args:
+            name: Backend name
+            argv: Callable(percent) -> argument list
+            level: Assumed starting level (percent)
+        """
+        self.name = name
+        self.argv = argv
+        self.level = level
+
+    def set(self, percent):
+        self.level = percent
+        return _spawn(self.argv(percent))
+
+    def change(self, steps):
+        return self.set(max(0, min(100, self.level + steps * BRIGHTNESS_STEP)))
+
+def find_backlight(root=BACKLIGHT_DIR):
+    """First writable backlight device directory, or None"""
+    try:
+        devices = sorted(os.listdir(root))
+    except OSError:
+        return None
+    for device in devices:
+        path = os.path.join(root, device)
+        if os.access(os.path.join(path, 'brightness'), os.W_OK):
+            return path
+    return None
+
+def _first(candidates):
+    """First backend whose factory succeeds"""
+    for available, factory in candidates:
+        if not available:
+            continue
         try:
-            pyautogui.press('volumemute')
-            return True
-        except:
-            pass
-    
+            return factory()
+        except Exception:
+            continue
+    return None
+
+def resolve_backends(which=shutil.which, backlight_root=BACKLIGHT_DIR):
+    """
+    Pick audio, media and backlight backends for this system
+
+    Args:
+        which: Tool lookup (shutil.which)
+        backlight_root: sysfs backlight class directory
+
+    Returns:
+        {'audio': ..., 'media': ..., 'brightness': ...}; None where unavailable
+    """
     if 'linux' in OS:
-        if shutil.which('pactl'):
-            return _run_cmd('pactl set-sink-mute @DEFAULT_SINK@ toggle')
-        elif shutil.which('amixer'):
-            return _run_cmd('amixer set Master toggle')
-    
-    return False
+        audio = _first([
+            (pulsectl is not None, PulseAudio),
+            (which('pactl'), lambda: PactlAudio(which('pactl'))),
+            (which('amixer'), lambda: AmixerSession(which('amixer'))),
+            (pyautogui is not None, KeyAudio),
+        ])
+        media = _first([
+            # playerctl also talks MPRIS, so without a player only media keys can help
+            (open_dbus_connection is not None,
+             lambda: MprisMedia(KeyMedia() if pyautogui is not None else None)),
+            (which('playerctl'), lambda: PlayerctlMedia(which('playerctl'))),
+            (pyautogui is not None, KeyMedia),
+        ])
+        backlight = find_backlight(backlight_root)
+        brightness = _first([
+            (backlight, lambda: SysfsBacklight(backlight)),
+            (which('brightnessctl'), lambda: BrightnessctlBacklight(which('brightnessctl'))),
+            (which('xbacklight'), lambda: XbacklightBacklight(which('xbacklight'))),
+        ])
+    else:
+        audio = _first([
+            (pyautogui is not None, KeyAudio),
+            (which('nircmd.exe'), lambda: NircmdAudio(which('nircmd.exe'))),
+        ])
+        media = _first([(pyautogui is not None, KeyMedia)])
+        if 'windows' in OS:
+            brightness = CommandBacklight('wmi', lambda p: [
+                'powershell', '-NoProfile', '-Command',
+                f'(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness({p},0)'])
+        elif which('brightness'):
+            brightness = CommandBacklight('brightness', lambda p: [which('brightness'), str(p / 100.0)])
+        else:
+            brightness = None
+    return {'audio': audio, 'media': media, 'brightness': brightness}
+
+_backends = None
+
+def get_backends():
+    """Backends resolved on first call and reused afterwards"""
+    global _backends
+    if _backends is None:
+        _backends = resolve_backends()
+    return _backends
+
+def close_backends():
+    """Close the resolved backends (child processes, files, connections); they are re-resolved on next use"""
+    global _backends
+    backends, _backends = _backends, None
+    for backend in (backends or {}).values():
+        if hasattr(backend, 'close'):
+            try:
+                backend.close()
+            except Exception as e:
+                print(f'[OS_HANDLERS] Closing {backend.name} failed: {e}')
+
+def describe_backends():
+    """e.g. 'audio=pactl media=playerctl brightness=sysfs'"""
+    return ' '.join(f"{kind}={backend.name if backend else 'none'}"
+                    for kind, backend in get_backends().items())
+
+def _act(kind, action, *args):
+    backend = get_backends()[kind]
+    if backend is None:
+        return False
+    try:
+        return getattr(backend, action)(*args)
+    except Exception as e:
+        print(f'[OS_HANDLERS] {backend.name} {action} failed: {e}')
+        return False
+
+# Volume Controls
+def volume_up(steps: int = 1):
+    """Increase system volume by `steps` steps in one call"""
+    return _act('audio', 'change', steps)
+
+def volume_down(steps: int = 1):
+    """Decrease system volume by `steps` steps in one call"""
+    return _act('audio', 'change', -steps)
+
+def mute_toggle():
+    """Toggle mute"""
+    return _act('audio', 'toggle_mute')
 
 # Media Controls
 def media_play_pause():
     """Toggle media playback"""
-    if pyautogui:
-        try:
-            pyautogui.press('playpause')
-            return True
-        except:
-            pass
-    
-    if 'linux' in OS and shutil.which('playerctl'):
-        return _run_cmd('playerctl play-pause')
-    
-    return False
+    return _act('media', 'play_pause')
 
-def media_next():
-    """Next track"""
-    if pyautogui:
-        try:
-            pyautogui.press('nexttrack')
-            return True
-        except:
-            pass
-    
-    if 'linux' in OS and shutil.which('playerctl'):
-        return _run_cmd('playerctl next')
-    
-    return False
+def media_next(steps: int = 1):
+    """Next track (`steps` tracks ahead)"""
+    return _act('media', 'skip', steps)
 
-def media_prev():
-    """Previous track"""
-    if pyautogui:
-        try:
-            pyautogui.press('prevtrack')
-            return True
-        except:
-            pass
-    
-    if 'linux' in OS and shutil.which('playerctl'):
-        return _run_cmd('playerctl previous')
-    
-    return False
+def media_prev(steps: int = 1):
+    """Previous track (`steps` tracks back)"""
+    return _act('media', 'skip', -steps)
 
 # Lock Screen
 def lock_screen():
@@ -244,85 +575,12 @@ def lock_screen():
     return False
 
 # Brightness Control
-def set_brightness(percent: int):
-    """Set screen brightness (best-effort)"""
-    percent = int(max(0, min(100, percent)))
-    
-    if 'windows' in OS:
-        # PowerShell WMI method (requires admin on some systems)
-        cmd = f'powershell -Command "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness({percent},0)"'
-        success = _run_cmd(cmd)
-        if not success:
-            print(f'[OS_HANDLERS] Brightness control failed - may require admin privileges')
-        return success
-    
-    elif 'darwin' in OS:
-        # macOS: requires 'brightness' CLI tool (not default)
-        if shutil.which('brightness'):
-            return _run_cmd(f'brightness {percent/100.0}')
-        else:
-            print('[OS_HANDLERS] Install brightness CLI: brew install brightness')
-            return False
-    
-    elif 'linux' in OS:
-        # Try brightnessctl first (most reliable)
-        if shutil.which('brightnessctl'):
-            return _run_cmd(f'brightnessctl set {percent}%')
-        
-        # Try xbacklight
-        elif shutil.which('xbacklight'):
-            return _run_cmd(f'xbacklight -set {percent}')
-        
-        # Try direct sysfs write (requires permissions)
-        else:
-            try:
-                brightness_path = '/sys/class/backlight/intel_backlight/brightness'
-                max_brightness_path = '/sys/class/backlight/intel_backlight/max_brightness'
-                
-                if os.path.exists(brightness_path) and os.access(brightness_path, os.W_OK):
-                    with open(max_brightness_path, 'r') as f:
-                        max_bright = int(f.read().strip())
-                    
-                    target = int(max_bright * percent / 100)
-                    with open(brightness_path, 'w') as f:
-                        f.write(str(target))
-                    return True
-            except Exception:
-                pass
-            
-            print('[OS_HANDLERS] Brightness control requires brightnessctl or proper permissions')
-            return False
-    
-    return False
-
-# Notifications and Quick Settings
-def open_notifications():
-    """Open notification center"""
-    if pyautogui:
-        try:
-            if 'windows' in OS:
-                pyautogui.hotkey('win', 'n')
-            elif 'darwin' in OS:
-                # macOS notification center
-                pyautogui.hotkey('command', 'shift', 'n')
-            return True
-        except:
-            pass
-    return False
-
-def open_quick_settings():
-    """Open quick settings panel"""
-    if pyautogui:
-        try:
-            if 'windows' in OS:
-                pyautogui.hotkey('win', 'a')
-            elif 'darwin' in OS:
-                # macOS Control Center
-                pyautogui.hotkey('fn', 'c')
-            return True
-        except:
-            pass
-    return False
+def change_brightness(steps: int):
+    """Raise (steps > 0) or lower screen brightness by `steps` steps in one call"""
+    if get_backends()['brightness'] is None:
+        print('[OS_HANDLERS] Brightness control requires brightnessctl or a writable /sys/class/backlight')
+        return False
+    return _act('brightness', 'change', steps)
 
 # Diagnostic function
 def diagnose_system():
@@ -339,6 +597,7 @@ def diagnose_system():
         print(f"Linux Input Method: {method}")
     
     print(f"\nPyAutoGUI: {'✓ Available' if pyautogui else '✗ Not installed'}")
+    print(f"Action backends: {describe_backends()}")
     
     print("\nPermission Instructions:")
     print(get_permission_instructions())
@@ -0,0 +1,134 @@
+import threading
+import time
+import cv2
+import numpy as np
+from landmarks import HAND_CONNECTIONS
+
+
+def draw_hands(frame, hands):
+    """Draw HandLandmarks (normalized coordinates) onto a BGR frame in place"""
+    if not hands:
+        return frame
+    h, w = frame.shape[:2]
+    px = (hands.points[..., :2] * (w, h)).astype(np.int32)
+    for hand in px:
+        for a, b in HAND_CONNECTIONS:
+            cv2.line(frame, tuple(hand[a].tolist()), tuple(hand[b].tolist()), (224, 224, 224), 2)
+        for p in hand.tolist():
+            cv2.circle(frame, tuple(p), 3, (0, 0, 255), -1)
+    return frame
+
+
+class OverlayRenderer:
+    """
+    Landmark overlay rendering, off the inference hot path.
+
+    Nothing happens until a consumer subscribes (debug window, preview,
+    recorder). While subscribed, the tracker hands over at most `fps`
+    frames per second; each is copied into the renderer's own buffer and
+    drawn and delivered on the render thread. The thread stops again when
+    the last consumer unsubscribes.
+    """
+
+    def __init__(self, fps: float = 15.0, draw: bool = True):
+        """
+        Args:
+            fps: Maximum frames per second handed to the render thread
+            draw: Draw landmarks (False delivers plain frames to subscribers)
+        """
+        self.draw = draw
+        self.interval = 1.0 / fps if fps else 0.0
+        self._subscribers = []
+        self._cond = threading.Condition()
+        self._buffer = None
+        self._hands = None
+        self._pending = False
+        self._last_submit = 0.0
+        self._thread = None
+        self.frames_rendered = 0
+
+    @property
+    def active(self):
+        """Cheap check for the hot loop: is anyone listening?"""
+        return bool(self._subscribers)
+
+    def subscribe(self, callback):
+        """
+        Register callback(frame, hands), called on the render thread.
+
+        The frame is the renderer's buffer and is reused for the next render;
+        copy it if it has to outlive the callback.
+        """
+        with self._cond:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='OverlayRenderer', daemon=True)
+                self._thread.start()
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._cond:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+            self._cond.notify_all()
+
+    def submit(self, frame, hands):
+        """Offer a frame from the tracking loop (dropped when idle or over the rate)"""
+        if not self._subscribers:
+            return
+        now = time.monotonic()
+        if now - self._last_submit < self.interval:
+            return
+        with self._cond:
+            if self._pending:
+                return  # render thread still busy with the previous frame
+            if self._buffer is None or self._buffer.shape != frame.shape:
+                self._buffer = np.empty_like(frame)
+            np.copyto(self._buffer, frame)
+            self._hands = hands
+            self._pending = True
+            self._last_submit = now
+            self._cond.notify_all()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._subscribers)
+                if not self._subscribers:
+                    self._thread = None
+                    self._pending = False
+                    return
+                frame, hands = self._buffer, self._hands
+                subscribers = list(self._subscribers)
+
+            if self.draw:
+                draw_hands(frame, hands)
+            for callback in subscribers:
+                try:
+                    callback(frame, hands)
+                except Exception as e:
+                    print(f"[Overlay] Subscriber error: {e}")
+            self.frames_rendered += 1
+
+            with self._cond:
+                self._pending = False
+
+
+class VideoRecorder:
+    """Overlay subscriber that writes rendered frames to a video file"""
+
+    def __init__(self, path: str, fps: float = 15.0):
+        self.path = path
+        self.fps = fps
+        self._writer = None
+
+    def __call__(self, frame, hands):
+        if self._writer is None:
+            h, w = frame.shape[:2]
+            self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*'MJPG'), self.fps, (w, h))
+        self._writer.write(frame)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
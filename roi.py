@@ -0,0 +1,86 @@
+class HandRoi:
+    """
+    Square region of interest around the hands seen in the previous frame.
+
+    The crop is resized to a fixed inference resolution, so the cost of
+    inference stays constant when the camera resolution goes up. Landmarks
+    found in the crop are mapped back to full-frame normalized coordinates.
+    """
+
+    def __init__(self, size: int = 256, margin: float = 0.3, min_fraction: float = 0.2):
+        """
+        Args:
+            size: Side length (pixels) of the crop handed to inference
+            margin: Padding added on each side, as a fraction of the hand box
+            min_fraction: Smallest crop side as a fraction of the short frame side
+        """
+        self.size = size
+        self.margin = margin
+        self.min_fraction = min_fraction
+        self.bbox = None  # normalized (x0, y0, x1, y1) of last known hands
+
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        """Forget the previous hands (forces full-frame detection)"""
+        self.bbox = None
+
+    def update(self, points):
+        """
+        Track hands from this frame's full-frame landmarks
+
+        Args:
+            points: (hands, 21, 3) normalized landmarks, or None when no hands
+        """
+        if points is None or len(points) == 0:
+            self.bbox = None
+            return
+        xy = points[..., :2].reshape(-1, 2)
+        x0, y0 = xy.min(axis=0).tolist()
+        x1, y1 = xy.max(axis=0).tolist()
+        self.bbox = (x0, y0, x1, y1)
+
+    def region(self, frame_w: int, frame_h: int):
+        """
+        Pixel crop (x, y, side, side) for the next frame
+
+        Returns:
+            tuple or None: None when there is nothing to track, or when the crop
+                would cover (nearly) the whole frame anyway
+        """
+        if self.bbox is None:
+            return None
+
+        x0, y0, x1, y1 = self.bbox
+        bw = (x1 - x0) * frame_w
+        bh = (y1 - y0) * frame_h
+        short = min(frame_w, frame_h)
+
+        side = max(bw, bh) * (1 + 2 * self.margin)
+        side = int(max(side, self.min_fraction * short))
+        if side >= short:
+            return None
+
+        cx = (x0 + x1) / 2 * frame_w
+        cy = (y0 + y1) / 2 * frame_h
+        x = int(min(max(cx - side / 2, 0), frame_w - side))
+        y = int(min(max(cy - side / 2, 0), frame_h - side))
+        return x, y, side, side
+
+    def to_full(self, points, region, frame_w: int, frame_h: int):
+        """Map crop-normalized landmarks back to full-frame normalized coordinates (in place)"""
+        x, y, w, h = region
+        points[..., 0] = (x + points[..., 0] * w) / frame_w
+        points[..., 1] = (y + points[..., 1] * h) / frame_h
+        # MediaPipe z uses the same scale as x
+        points[..., 2] *= w / frame_w
+        return points
+
+    def stats(self):
+        return {
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'fallbacks': self.fallbacks
+        }
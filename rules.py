@@ -0,0 +1,249 @@
+import ast
+import json
+import os
+import functools
+
+# Per-hand boolean flags computed by the gesture engine every frame. They are
+# the cheap preconditions rules are indexed on (bit i = HAND_FLAGS[i]).
+HAND_FLAGS = (
+    'pinch_ti',   # thumb-index tips together
+    'pinch_im',   # index-middle tips together
+    'pinch_tm',   # thumb-middle tips together
+    'tap3',       # thumb, index and middle together
+    'hold_ti',    # thumb-index pinch held for HOLD_TIME
+    'two_up',     # index and middle extended, ring and pinky folded
+    'spread_im',  # two_up with index and middle spread apart
+    'palm',       # all four fingers extended
+    'fist',       # all four fingers folded
+)
+# Flags of the two-hand context: each hand's flags prefixed l_/r_, plus these
+BOTH_FLAGS = tuple(f'l_{f}' for f in HAND_FLAGS) + tuple(f'r_{f}' for f in HAND_FLAGS) + (
+    'together',   # hands next to each other
+    'both_up',    # both hands raised to the top of the frame
+    'both_down',  # both hands lowered to the bottom of the frame
+)
+HANDS = ('right', 'left', 'any', 'both')
+# Flag combinations whose candidate rules are remembered; a session only
+# sees a few hundred, two-hand states could otherwise grow the memo unbounded
+CANDIDATE_CACHE = 4096
+
+# Variables available to rule expressions
+HAND_VARIABLES = (
+    'vx', 'vy',        # wrist velocity (units per second)
+    'speed',           # wrist speed (units per second)
+    'ax', 'ay',        # wrist acceleration (units per second squared)
+    'd_ti', 'd_im', 'd_tm',  # thumb-index, index-middle, thumb-middle tip distances
+    'palm',            # palm size (wrist to middle MCP)
+    'spread',          # index-middle distance relative to palm size
+    'held',            # seconds the thumb-index pinch has been held
+    'x', 'y',          # wrist position
+)
+BOTH_VARIABLES = (
+    'dist', 'ddist',   # distance between the index tips of both hands, and its rate per second
+    'angle', 'dangle', # angle of the line between them (radians), and its rate per second
+    'turn',            # change of that angle since the previous frame (radians)
+)
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RULES_FILE = os.path.join(_BASE_DIR, 'gestures.json')
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Lt, ast.LtE, ast.Gt,
+    ast.GtE, ast.Eq, ast.NotEq, ast.IfExp, ast.Call, ast.Name, ast.Load, ast.Constant,
+)
+
+
+def _conf(*factors):
+    """Mean of the factors clamped to [0, 1] (same as GestureEngine._calculate_confidence)"""
+    score = sum(f for f in factors if f is not None) / len(factors)
+    return min(1.0, max(0.0, score))
+
+
+FUNCTIONS = {'abs': abs, 'min': min, 'max': max, 'conf': _conf}
+
+
+def _compile_expr(source, where, names):
+    """
+    Compile a rule expression after checking it only uses arithmetic,
+    comparisons, known variables, config constants and FUNCTIONS.
+    """
+    try:
+        tree = ast.parse(str(source), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"{where}: invalid expression {source!r}: {e.msg}")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"{where}: '{type(node).__name__}' not allowed in {source!r}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+            raise ValueError(f"{where}: only {', '.join(FUNCTIONS)} can be called in {source!r}")
+        if isinstance(node, ast.Name) and node.id not in names and node.id not in FUNCTIONS:
+            raise ValueError(f"{where}: unknown name '{node.id}' in {source!r}")
+    return compile(tree, where, 'eval')
+
+
+class GestureRule:
+    """
+    One compiled gesture definition.
+
+    Rule file entry (only "type" and "hand" are required):
+        type: Event type emitted (what EventMapper.handle dispatches on)
+        hand: 'right', 'left', 'any' or 'both' (two-hand rules)
+        on: Flag that must have just become true this frame (rising edge)
+        off: Flag that must have just become false this frame (falling edge)
+        when: Flags that must be true
+        unless: Flags that must be false
+        if: Expression over the frame's variables that must hold
+        confidence: Expression giving the event confidence (default 1.0)
+        fields: {name: expression} copied into the event
+    """
+
+    __slots__ = ('type', 'hand', 'on', 'off', 'when', 'unless', 'condition', 'confidence', 'fields')
+
+    def __init__(self, spec, flags, variables, constants):
+        where = f"rule '{spec.get('type', '?')}'"
+        if 'type' not in spec:
+            raise ValueError(f"{where}: missing 'type'")
+        self.type = spec['type']
+        self.hand = spec.get('hand', 'right')
+        if self.hand not in HANDS:
+            raise ValueError(f"{where}: hand must be one of {', '.join(HANDS)}")
+
+        bits = {name: 1 << i for i, name in enumerate(flags)}
+
+        def mask(names):
+            if isinstance(names, str):
+                names = [names]
+            out = 0
+            for name in names or ():
+                if name not in bits:
+                    raise ValueError(f"{where}: unknown flag '{name}'")
+                out |= bits[name]
+            return out
+
+        self.on = mask(spec.get('on'))
+        self.off = mask(spec.get('off'))
+        self.when = mask(spec.get('when'))
+        self.unless = mask(spec.get('unless'))
+
+        names = set(variables) | set(constants)
+        self.condition = _compile_expr(spec['if'], where, names) if 'if' in spec else None
+        conf = spec.get('confidence', 1.0)
+        self.confidence = conf if isinstance(conf, (int, float)) else _compile_expr(conf, where, names)
+        self.fields = {k: _compile_expr(v, f"{where} field '{k}'", names)
+                       for k, v in spec.get('fields', {}).items()}
+
+    def matches(self, state, changed):
+        """Cheap precondition check on flag bitmasks"""
+        rising, falling = changed & state, changed & ~state
+        return (rising & self.on) == self.on and (falling & self.off) == self.off \
+            and (state & self.when) == self.when and not state & self.unless
+
+
+class RuleSet:
+    """
+    Gesture rules compiled for fast per-frame evaluation.
+
+    Rules are grouped by hand. For each (hand, flags, changed flags)
+    combination the list of rules whose preconditions hold is worked out once
+    and memoized (up to CANDIDATE_CACHE combinations), so a frame only evaluates the expressions of rules that can
+    fire; on most frames that list is empty. Per-frame cost therefore depends
+    on how many rules are plausible right now, not on the size of the table.
+    """
+
+    def __init__(self, specs, cfg=None):
+        """
+        Args:
+            specs: List of rule dicts (see GestureRule)
+            cfg: Config whose values (e.g. PINCH_THRESHOLD) expressions may use
+        """
+        constants = {}
+        if cfg is not None:
+            constants = {k: v for k, v in cfg.items() if isinstance(v, (int, float))}
+        self.env = dict(FUNCTIONS, __builtins__={}, **constants)
+
+        self.rules = []
+        for spec in specs:
+            flags = BOTH_FLAGS if spec.get('hand') == 'both' else HAND_FLAGS
+            variables = BOTH_VARIABLES if spec.get('hand') == 'both' else HAND_VARIABLES
+            self.rules.append(GestureRule(spec, flags, variables, constants))
+
+        self._by_hand = {hand: [r for r in self.rules if r.hand == hand or
+                                (r.hand == 'any' and hand in ('right', 'left'))]
+                         for hand in ('right', 'left', 'both')}
+        self._candidates = functools.lru_cache(maxsize=CANDIDATE_CACHE)(self.match)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def types(self):
+        return [r.type for r in self.rules]
+
+    def handles(self, hand):
+        """True if any rule applies to `hand` ('right', 'left' or 'both')"""
+        return bool(self._by_hand[hand])
+
+    def match(self, hand, state, changed):
+        """Rules whose flag preconditions hold, checked rule by rule"""
+        return tuple(r for r in self._by_hand[hand] if r.matches(state, changed))
+
+    def candidates(self, hand, state, changed):
+        """Rules whose flag preconditions hold (memoized per flag combination)"""
+        return self._candidates(hand, state, changed)
+
+    def evaluate(self, hand, state, changed, variables):
+        """
+        Evaluate one hand (or the two-hand context)
+
+        Args:
+            hand: 'right', 'left' or 'both'
+            state: Bitmask of flags that are true
+            changed: Bitmask of flags that flipped this frame (either way)
+            variables: Dict or callable returning the variables dict; only
+                built when some rule passed its preconditions
+
+        Returns:
+            List of event dicts
+        """
+        rules = self.candidates(hand, state, changed)
+        if not rules:
+            return []
+        if callable(variables):
+            variables = variables()
+
+        env = self.env
+        events = []
+        for rule in rules:
+            if rule.condition is not None and not eval(rule.condition, env, variables):
+                continue
+            conf = rule.confidence
+            if not isinstance(conf, (int, float)):
+                conf = eval(conf, env, variables)
+            event = {'type': rule.type, 'confidence': conf}
+            for name, code in rule.fields.items():
+                event[name] = eval(code, env, variables)
+            events.append(event)
+        return events
+
+
+def load_rules(path=None, cfg=None, supported=None):
+    """
+    Load and compile a rules file
+
+    Args:
+        path: JSON file with a "rules" list; relative paths are resolved from
+            the install directory (default: gestures.json)
+        cfg: Config whose numeric values rule expressions may use
+        supported: Optional set of event types to keep; rules for other
+            types are dropped before compiling
+
+    Returns:
+        RuleSet
+    """
+    path = os.path.join(_BASE_DIR, path or DEFAULT_RULES_FILE)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    specs = data['rules'] if isinstance(data, dict) else data
+    if supported is not None:
+        specs = [s for s in specs if s['type'] in supported]
+    return RuleSet(specs, cfg)
@@ -36,6 +36,7 @@ setup(
     install_requires=[
         "opencv-python>=4.8.0",
         "mediapipe>=0.10.0",
+        "numpy>=1.24.0",
         "pyautogui>=0.9.54",
         "pystray>=0.19.5",
         "pillow>=10.0.0",
@@ -0,0 +1,42 @@
+"""Synthetic hands, tools and devices shared by tests and benchmarks"""
+import os
+import stat
+import numpy as np
+from landmarks import NUM_LANDMARKS, THUMB_TIP, INDEX_TIP, MIDDLE_TIP
+
+def hand_points(x0=0.3, y0=0.4, pinch=False, tap3=False):
+    """
+    One open hand, (NUM_LANDMARKS, 3): fingers pointing straight up, 0.1
+    apart along x starting at x0, joints 0.05 apart; wrist 0.2 below y0
+
+    Args:
+        pinch: Thumb tip on the index tip
+        tap3: Thumb and middle tips on the index tip
+    """
+    points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    points[0] = (x0 + 0.2, y0 + 0.2, 0)
+    for f in range(5):
+        for j in range(4):
+            points[1 + 4 * f + j] = (x0 + 0.1 * f, y0 - 0.05 * j, 0)
+    if pinch or tap3:
+        points[THUMB_TIP] = points[INDEX_TIP] + (0.01, 0, 0)
+    if tap3:
+        points[MIDDLE_TIP] = points[INDEX_TIP] + (0.02, 0, 0)
+    return points
+
+def fake_tool(directory, name, body):
+    """Executable shell script standing in for a system tool"""
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write('#!/bin/sh\n' + body + '\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+def fake_backlight(root, level=400, maximum=1000, name='acpi_video0'):
+    """sysfs-style backlight device directory under `root`"""
+    device = os.path.join(root, name)
+    os.makedirs(device)
+    for attr, value in (('brightness', level), ('max_brightness', maximum)):
+        with open(os.path.join(device, attr), 'w') as f:
+            f.write(f'{value}\n')
+    return device
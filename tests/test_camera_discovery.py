@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from camera_discovery import (CameraDiscovery, _enum, _v4l2_probe, _CAPABILITY, _FMTDESC, _FRMSIZE,
+                              _FRMIVAL, VIDIOC_QUERYCAP, VIDIOC_ENUM_FMT, V4L2_BUF_TYPE_VIDEO_CAPTURE,
+                              V4L2_CAP_VIDEO_CAPTURE)
+
+class FakeScanner:
+    can_watch = True
+
+    def __init__(self, cameras):
+        self.cameras = cameras
+        self.scans = 0
+
+    def signature(self):
+        return tuple(c['identity'] for c in self.cameras)
+
+    def scan(self, known):
+        self.scans += 1
+        return [dict(c) for c in self.cameras]
+
+CAM = {'index': 0, 'path': '/dev/video0', 'name': 'Webcam', 'driver': 'uvcvideo',
+       'identity': 'usb-1|Webcam', 'modes': [(1280, 720, 30.0)]}
+
+class TestCameraDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.cache = os.path.join(tempfile.mkdtemp(), 'camera_cache.json')
+
+    def test_struct_sizes_match_kernel_abi(self):
+        self.assertEqual(_CAPABILITY.size, 104)
+        self.assertEqual(_FMTDESC.size, 64)
+        self.assertEqual(_FRMSIZE.size, 44)
+        self.assertEqual(_FRMIVAL.size, 52)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'V4L2')
+    def test_enum_against_fake_ioctl(self):
+        formats = [b'YUYV', b'MJPG']
+        requests = []
+
+        def ioctl(fd, request, buf):
+            index, buf_type = _FMTDESC.unpack_from(buf)[:2]
+            requests.append((request, index, buf_type))
+            if index >= len(formats):
+                raise OSError(22, 'Invalid argument')
+            fourcc = int.from_bytes(formats[index], 'little')
+            _FMTDESC.pack_into(buf, 0, index, buf_type, 0, formats[index], fourcc, 0, 0, 0, 0)
+
+        with mock.patch('fcntl.ioctl', ioctl):
+            found = list(_enum(3, VIDIOC_ENUM_FMT, _FMTDESC, (V4L2_BUF_TYPE_VIDEO_CAPTURE,)))
+        self.assertEqual([f[3].rstrip(b'\0') for f in found], formats)
+        self.assertEqual(requests, [(VIDIOC_ENUM_FMT, i, V4L2_BUF_TYPE_VIDEO_CAPTURE) for i in range(3)])
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'V4L2')
+    def test_known_device_skips_enumeration(self):
+        path = os.path.join(os.path.dirname(self.cache), 'video2')
+        open(path, 'w').close()
+        requests = []
+
+        def ioctl(fd, request, buf):
+            requests.append(request)
+            if request == VIDIOC_QUERYCAP:
+                _CAPABILITY.pack_into(buf, 0, b'uvcvideo', b'Webcam', b'usb-1', 0,
+                                      V4L2_CAP_VIDEO_CAPTURE, 0, 0, 0, 0)
+            else:
+                raise OSError(22, 'Invalid argument')
+
+        with mock.patch('fcntl.ioctl', ioctl):
+            fresh = _v4l2_probe(path)
+            self.assertEqual(requests, [VIDIOC_QUERYCAP, VIDIOC_ENUM_FMT])
+            requests.clear()
+            known = _v4l2_probe(path, {CAM['identity']: CAM})
+        self.assertEqual(requests, [VIDIOC_QUERYCAP])
+        self.assertEqual(fresh['identity'], CAM['identity'])
+        self.assertEqual(known['modes'], CAM['modes'])
+        self.assertEqual(known['index'], 2)
+
+    def test_cache_survives_restart(self):
+        d = CameraDiscovery(self.cache, scanner=FakeScanner([CAM]))
+        self.assertEqual(d.cameras(), [])
+        d.scan()
+        restarted = CameraDiscovery(self.cache, scanner=FakeScanner([]))
+        cams = restarted.cameras()
+        self.assertEqual(len(cams), 1)
+        self.assertEqual(cams[0]['identity'], 'usb-1|Webcam')
+
+    def test_on_change_only_when_list_changes(self):
+        scanner = FakeScanner([CAM])
+        changes = []
+        d = CameraDiscovery(self.cache, scanner=scanner)
+        d.on_change = changes.append
+        d.scan(); d.scan()
+        self.assertEqual(len(changes), 1)
+        scanner.cameras = []  # unplugged
+        d.scan()
+        self.assertEqual(changes[-1], [])
+        self.assertEqual(d.cameras(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from cursor import ScreenGeometry, CursorController
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+def controller(clock, monitors=((0, 0, 1000, 500),), **kwargs):
+    geometry = ScreenGeometry(query=lambda: list(monitors), clock=clock)
+    moves = []
+    cursor = CursorController(geometry, sensitivity=1.0, accel=0.0, rate=120, mirror=False,
+                              move=lambda x, y: moves.append((x, y)),
+                              position=lambda: (500.0, 250.0), clock=clock, **kwargs)
+    return cursor, moves
+
+class TestScreenGeometry(unittest.TestCase):
+    def test_clamp_to_nearest_monitor(self):
+        # Second monitor is lower than the first: the area right of the
+        # first monitor's top edge is off-screen
+        geometry = ScreenGeometry(query=lambda: [(0, 0, 100, 100), (100, 50, 100, 100)])
+        self.assertEqual(geometry.clamp(150, 10), (150, 50))
+        self.assertEqual(geometry.clamp(-5, 20), (0, 20))
+        self.assertEqual(geometry.clamp(150, 120), (150, 120))
+        one = ScreenGeometry(monitor=1, query=lambda: [(0, 0, 100, 100), (100, 50, 100, 100)])
+        self.assertEqual(one.clamp(10, 10), (100, 50))
+        self.assertEqual(one.size, (100, 100))
+
+    def test_layout_cached(self):
+        clock, calls = FakeClock(), []
+        geometry = ScreenGeometry(query=lambda: calls.append(1) or [(0, 0, 10, 10)], max_age=5.0, clock=clock)
+        geometry.refresh()
+        clock.t = 4.0
+        geometry.refresh()
+        self.assertEqual(len(calls), 1)
+        clock.t = 6.0
+        geometry.refresh()
+        self.assertEqual(len(calls), 2)
+
+class TestCursorController(unittest.TestCase):
+    def test_interpolates_between_frames(self):
+        clock = FakeClock()
+        cursor, moves = controller(clock)
+        cursor.feed((0.5, 0.5))             # stroke starts at the current pointer
+        clock.t = 0.1
+        cursor.feed((0.6, 0.5))             # 0.1 frame widths = 100 px right
+        clock.t = 0.15
+        cursor.tick()
+        self.assertEqual(moves[-1], (550, 250))
+        clock.t = 0.25
+        cursor.tick()
+        self.assertEqual(moves[-1], (600, 250))
+        # No new injection while the pointer is at rest
+        cursor.tick()
+        self.assertEqual(len(moves), 2)
+
+    def test_subpixel_motion_accumulates(self):
+        clock = FakeClock()
+        cursor, moves = controller(clock)
+        cursor.feed((0.5, 0.5))
+        for i in range(1, 21):
+            clock.t = i / 30
+            cursor.feed((0.5 + 0.0003 * i, 0.5))   # 0.3 px per frame
+            cursor.tick(clock.t + 1)
+        self.assertEqual(moves[-1], (506, 250))
+
+    def test_acceleration_and_new_stroke(self):
+        clock = FakeClock()
+        cursor, moves = controller(clock)
+        cursor.accel = 1.0
+        self.assertEqual(cursor.gain(0.0), 1.0)
+        self.assertEqual(cursor.gain(2.0), 3.0)
+        cursor.feed((0.5, 0.5))
+        cursor.feed(None)
+        clock.t = 0.1
+        # After losing the hand the next point starts a new stroke: no jump
+        cursor.feed((0.9, 0.9))
+        cursor.tick()
+        self.assertEqual(moves, [(500, 250)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import unittest
+from dispatcher import GestureDispatcher
+
+class BlockingHandler:
+    """Records events; holds the worker inside the first call until released"""
+    def __init__(self):
+        self.events = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    def __call__(self, event):
+        self.entered.set()
+        self.release.wait(2.0)
+        self.events.append(event)
+
+class TestGestureDispatcher(unittest.TestCase):
+    def start_busy(self, **kwargs):
+        """Dispatcher whose worker is stuck injecting a first click"""
+        handler = BlockingHandler()
+        dispatcher = GestureDispatcher(handler, **kwargs).start()
+        dispatcher.submit({'type': 'left_click'})
+        self.assertTrue(handler.entered.wait(2.0))
+        return dispatcher, handler
+
+    def finish(self, dispatcher, handler):
+        handler.release.set()
+        self.assertTrue(dispatcher.join(2.0))
+        dispatcher.stop()
+        return [(e['type'], e.get('count', 1)) for e in handler.events]
+
+    def test_coalesce_and_latest(self):
+        dispatcher, handler = self.start_busy()
+        for _ in range(5):
+            dispatcher.submit({'type': 'scroll_up'})
+        dispatcher.submit({'type': 'screenshot', 'confidence': 0.7})
+        dispatcher.submit({'type': 'screenshot', 'confidence': 0.9})
+        dispatcher.submit({'type': 'right_click'})
+        dispatcher.submit({'type': 'right_click'})
+        self.assertEqual(dispatcher.stats()['depth'], 4)
+        self.assertEqual(self.finish(dispatcher, handler),
+                         [('left_click', 1), ('scroll_up', 5), ('screenshot', 1),
+                          ('right_click', 1), ('right_click', 1)])
+        self.assertEqual(handler.events[2]['confidence'], 0.9)
+        stats = dispatcher.stats()
+        self.assertEqual((stats['coalesced'], stats['replaced'], stats['dispatched']), (4, 1, 5))
+        self.assertEqual(stats['latency_ms']['count'], 5)
+
+    def test_full_queue_drops_oldest_droppable(self):
+        dispatcher, handler = self.start_busy(maxsize=3)
+        for event_type in ('right_click', 'screenshot', 'app_switch', 'task_view'):
+            dispatcher.submit({'type': event_type})
+        self.assertEqual(self.finish(dispatcher, handler),
+                         [('left_click', 1), ('right_click', 1), ('app_switch', 1), ('task_view', 1)])
+        self.assertEqual(dispatcher.stats()['dropped_full'], 1)
+
+    def test_stale_events_expire(self):
+        now = [0.0]
+        dispatcher, handler = self.start_busy(max_age=0.5, clock=lambda: now[0])
+        dispatcher.submit({'type': 'volume_up'})
+        dispatcher.submit({'type': 'middle_click'})
+        now[0] = 1.0
+        self.assertEqual(self.finish(dispatcher, handler), [('left_click', 1), ('middle_click', 1)])
+        self.assertEqual(dispatcher.stats()['dropped_stale'], 1)
+
+    def test_handler_errors_are_counted(self):
+        def fail(event):
+            raise RuntimeError('no display')
+        done = []
+        dispatcher = GestureDispatcher(fail, on_done=done.append).start()
+        dispatcher.submit({'type': 'left_click'})
+        self.assertTrue(dispatcher.join(2.0))
+        dispatcher.stop()
+        self.assertEqual((dispatcher.stats()['errors'], done), (1, []))
+
+if __name__ == '__main__':
+    unittest.main()
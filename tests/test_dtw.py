@@ -0,0 +1,69 @@
+import math
+import os
+import tempfile
+import unittest
+from dtw import (StreamingDTW, Template, TemplateMatcher, direction, trim_still, resample,
+                 load_templates, save_template)
+
+def circle(n, speed=1.0):
+    """Direction features of a circle drawn over n frames (at `speed` x)"""
+    return [direction(-math.sin(2 * math.pi * i * speed / n), math.cos(2 * math.pi * i * speed / n))
+            for i in range(int(n / speed))]
+
+STILL = (0.0, 0.0)
+
+class TestStreamingDTW(unittest.TestCase):
+    def test_matches_at_different_speeds(self):
+        template = Template('circle', 'rotate', circle(24))
+        for speed in (0.6, 1.0, 1.8):
+            stream = StreamingDTW(template, 0.3)
+            costs = [stream.push(f) for f in [STILL] * 5 + circle(24, speed) + [STILL] * 5]
+            matched = [c for c in costs if c is not None]
+            self.assertEqual(len(matched), 1, f'speed {speed}')
+            self.assertLess(matched[0], 0.3)
+
+    def test_rejects_other_shapes(self):
+        template = Template('circle', 'rotate', circle(24))
+        stream = StreamingDTW(template, 0.3)
+        reverse = [(x, -y) for x, y in circle(24)]  # drawn the other way round
+        line = [(1.0, 0.0)] * 24
+        self.assertTrue(all(stream.push(f) is None for f in reverse + line))
+
+    def test_abandons_unrelated_paths(self):
+        stream = StreamingDTW(Template('circle', 'rotate', circle(32)), 0.3)
+        for f in [(0.0, -1.0)] * 50:  # against the circle's starting direction
+            stream.push(f)
+        # Only the start of the template stays alive against a mismatch
+        self.assertLess(stream.live, 8)
+
+class TestTemplateMatcher(unittest.TestCase):
+    def test_per_hand_state(self):
+        matcher = TemplateMatcher([Template('circle', 'rotate', circle(24), hand='right')], 0.3)
+        frames = circle(24)
+        self.assertEqual(matcher.push('left', frames[0]), [])
+        matches = []
+        for f in frames:
+            matches += matcher.push('right', f)
+        self.assertEqual([t.name for t, _ in matches], ['circle'])
+        # A hand leaving view drops its partial match
+        for f in frames[:-3]:
+            matcher.push('right', f)
+        matcher.retain({'left'})
+        self.assertEqual([m for f in frames[-3:] for m in matcher.push('right', f)], [])
+
+    def test_recording_helpers_and_file(self):
+        features = [STILL] * 3 + circle(80) + [STILL] * 2
+        points = resample(trim_still(features), 32)
+        self.assertEqual(len(points), 32)
+        self.assertNotIn(STILL, (points[0], points[-1]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'templates.json')
+            self.assertEqual(load_templates(path), [])
+            save_template(Template('circle', 'rotate', points), path)
+            save_template(Template('circle', 'screenshot', points), path)
+            loaded = load_templates(path)
+            self.assertEqual([(t.name, t.type) for t in loaded], [('circle', 'screenshot')])
+            self.assertEqual(loaded[0].points, points)
+
+if __name__ == '__main__':
+    unittest.main()
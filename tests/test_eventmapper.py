@@ -0,0 +1,98 @@
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+import eventmapper
+from eventmapper import EventMapper, desktop_bounds
+from dispatcher import GestureDispatcher
+from uinput_device import UInputDevice, read_events, EV_REL, REL_WHEEL
+
+class FakeInput:
+    """Records pyautogui calls"""
+    def __init__(self):
+        self.calls = []
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name,) + args)
+
+BACKENDS = {'audio': object(), 'media': None, 'brightness': None}
+
+PYAUTOGUI = types.SimpleNamespace(INPUT_BACKEND='pyautogui')
+
+def mapper(system, fake=None, env=None, cfg=PYAUTOGUI):
+    env = {'XDG_SESSION_TYPE': 'x11'} if env is None else env
+    with mock.patch.object(eventmapper, 'pyautogui', fake), \
+         mock.patch.object(eventmapper, 'get_backends', lambda: BACKENDS), \
+         mock.patch.object(eventmapper, 'describe_backends', lambda: 'test'), \
+         mock.patch.object(eventmapper.platform, 'system', lambda: system), \
+         mock.patch.dict(os.environ, env, clear=True):
+        return EventMapper(cfg)
+
+class TestEventMapper(unittest.TestCase):
+    def test_table_per_platform(self):
+        fake = FakeInput()
+        linux = mapper('Linux', fake)
+        self.assertIsNone(linux.handlers['task_view'])
+        self.assertIn('media', linux.unsupported['next_track'])
+        self.assertTrue({'left_click', 'screenshot', 'volume_up', 'lock_screen'} <= linux.supported_gestures())
+        self.assertFalse({'task_view', 'snap_left', 'notifications', 'next_track'} & linux.supported_gestures())
+        self.assertIn('snap_left', mapper('Windows', fake).supported_gestures())
+
+    def test_no_injection_without_helpers(self):
+        wayland = mapper('Linux', FakeInput(), {'XDG_SESSION_TYPE': 'wayland'})
+        if wayland.has_wayland_helpers:
+            self.skipTest('Wayland helpers installed')
+        self.assertFalse({'left_click', 'scroll_up', 'zoom_in'} & wayland.supported_gestures())
+        self.assertIn('volume_up', wayland.supported_gestures())
+        self.assertFalse({'left_click'} & mapper('Linux', None).supported_gestures())
+
+    def test_dispatch(self):
+        fake = FakeInput()
+        linux = mapper('Linux', fake)
+        with mock.patch.object(eventmapper, 'pyautogui', fake):
+            linux.handle({'type': 'zoom_in', 'count': 2})
+            linux.handle({'type': 'scroll_down', 'count': 3})
+            linux.handle({'type': 'task_view'})
+            linux.handle({'type': 'not_a_gesture'})
+        self.assertEqual(fake.calls, [('hotkey', 'ctrl', '+'), ('hotkey', 'ctrl', '+'), ('scroll', -360)])
+
+    def test_uinput_works_without_wayland_helpers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'uinput')
+            device = UInputDevice(path, record=True)
+            with mock.patch.object(eventmapper, 'open_input', lambda backend, os_name: device), \
+                 mock.patch.object(eventmapper, '_has_wayland_helpers', lambda: False):
+                wayland = mapper('Linux', None, {'XDG_SESSION_TYPE': 'wayland'}, cfg=None)
+            self.assertTrue({'left_click', 'scroll_up', 'zoom_in'} <= wayland.supported_gestures())
+            self.assertEqual(wayland.pointer_injection()['move'], device.move_to)
+            wayland.handle({'type': 'scroll_up', 'count': 3})
+            wayland.close()
+            self.assertIn((EV_REL, REL_WHEEL, 3), read_events(path))
+
+    def test_close_releases_drag(self):
+        fake = FakeInput()
+        linux = mapper('Linux', fake)
+        with mock.patch.object(eventmapper, 'pyautogui', fake):
+            linux.handle({'type': 'drag'})
+            linux.close()
+            linux.close()
+        self.assertEqual(fake.calls, [('mouseDown',), ('mouseUp',)])
+
+    def test_handler_errors_reach_dispatcher(self):
+        fake = FakeInput()
+        fake.hotkey = mock.Mock(side_effect=OSError('input device gone'))
+        linux = mapper('Linux', fake)
+        dispatcher = GestureDispatcher(linux.handle)
+        with mock.patch.object(eventmapper, 'pyautogui', fake):
+            dispatcher.submit({'type': 'app_switch'})
+            dispatcher.start()
+            dispatcher.stop()
+        self.assertEqual(dispatcher.counts['errors'], 1)
+        self.assertEqual(dispatcher.counts['dispatched'], 0)
+
+    def test_desktop_bounds(self):
+        self.assertEqual(desktop_bounds([(0, 0, 1920, 1080), (-1280, 200, 1280, 1024)]),
+                         (-1280, 0, 3200, 1224))
+
+if __name__ == '__main__':
+    unittest.main()
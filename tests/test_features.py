@@ -0,0 +1,43 @@
+import math
+import unittest
+import numpy as np
+from features import hand_features, HandFeatures
+from landmarks import HandLandmarks, NUM_LANDMARKS, THUMB_TIP, INDEX_TIP, PINKY_TIP
+from synthetic import hand_points
+
+def straight_hand():
+    """Fingers pointing straight up from the wrist, spaced along x"""
+    return hand_points(0.3, 0.7)[None]
+
+class TestHandFeatures(unittest.TestCase):
+    def test_distances_and_palm(self):
+        feats = HandFeatures(straight_hand())
+        self.assertEqual(feats.tip_distances.shape, (1, 5, 5))
+        self.assertAlmostEqual(float(feats.pair(THUMB_TIP, INDEX_TIP)[0]), 0.1, places=5)
+        self.assertAlmostEqual(float(feats.pair(THUMB_TIP, PINKY_TIP)[0]), 0.4, places=5)
+        self.assertTrue(np.allclose(feats.tip_distances[0], feats.tip_distances[0].T))
+        self.assertAlmostEqual(float(feats.palm_size[0]), math.hypot(0.0, 0.2), places=5)
+
+    def test_straight_and_bent_angles(self):
+        points = straight_hand()
+        feats = HandFeatures(points)
+        # PIP and DIP of a straight finger are 180 degrees
+        self.assertTrue(np.allclose(feats.angles[0, :, 1:], math.pi, atol=1e-3))
+        # Bend the index tip sideways by 90 degrees at the DIP
+        points[0, INDEX_TIP] = points[0, 7] + (0.05, 0, 0)
+        bent = HandFeatures(points)
+        self.assertAlmostEqual(float(bent.angles[0, 1, 2]), math.pi / 2, places=3)
+
+    def test_cached_per_frame(self):
+        hands = HandLandmarks(straight_hand(), ['right'])
+        first = hand_features(hands)
+        self.assertIsNone(first.velocity)
+        velocity = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.assertIs(hand_features(hands, velocity), first)
+        self.assertIs(first.velocity, velocity)
+        # A new frame gets new features
+        other = HandLandmarks(straight_hand(), ['right'])
+        self.assertIsNot(hand_features(other), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from filters import OneEuroFilter, LandmarkFilter
+from landmarks import HandLandmarks, NUM_LANDMARKS
+
+def hand_at(x, y, label='right'):
+    points = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+    points[0, :, 0] = x
+    points[0, :, 1] = y
+    return HandLandmarks(points, [label])
+
+class TestOneEuroFilter(unittest.TestCase):
+    def test_reduces_jitter_at_rest(self):
+        rng = np.random.default_rng(0)
+        f = OneEuroFilter(min_cutoff=1.0, beta=10.0)
+        raw, out = [], []
+        for i in range(120):
+            x = np.full((NUM_LANDMARKS, 3), 0.5, dtype=np.float32) + rng.normal(0, 0.003, (NUM_LANDMARKS, 3)).astype(np.float32)
+            raw.append(x[:, 0].copy())
+            out.append(f(x, i / 30.0)[:, 0].copy())
+        self.assertLess(np.std(out[30:]), np.std(raw[30:]) / 2)
+
+    def test_tracks_fast_motion_and_predicts(self):
+        f = OneEuroFilter(min_cutoff=1.0, beta=10.0)
+        for i in range(60):
+            t = i / 30.0
+            f(np.full((NUM_LANDMARKS, 3), 1.5 * t, dtype=np.float32), t)
+        t = 59 / 30.0
+        # Lag behind the true position is small and velocity is close to 1.5/s
+        self.assertLess(abs(float(f.x[0, 0]) - 1.5 * t), 0.03)
+        self.assertAlmostEqual(float(f.dx[0, 0]), 1.5, delta=0.1)
+        self.assertAlmostEqual(float(f.predict(0.05)[0, 0]), float(f.x[0, 0]) + 0.075, delta=0.01)
+
+class TestLandmarkFilter(unittest.TestCase):
+    def test_prediction_and_velocity(self):
+        lf = LandmarkFilter(predict_ms=50)
+        for i in range(30):
+            lf(hand_at(0.1 + 0.01 * i, 0.5), i / 30.0)
+        self.assertAlmostEqual(float(lf.velocity[0, 0, 0]), 0.3, delta=0.03)
+        lead = float(lf.predicted.points[0, 0, 0] - lf.filtered.points[0, 0, 0])
+        self.assertAlmostEqual(lead, 0.015, delta=0.003)
+
+    def test_state_dropped_when_hand_lost(self):
+        lf = LandmarkFilter()
+        lf(hand_at(0.2, 0.2), 0.0)
+        lf(HandLandmarks.empty(), 0.033)
+        out = lf(hand_at(0.8, 0.8), 0.066)
+        # Restarted from the new position instead of gliding from the old one
+        self.assertAlmostEqual(float(out.points[0, 0, 0]), 0.8, places=5)
+        self.assertEqual(float(lf.velocity[0, 0, 0]), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
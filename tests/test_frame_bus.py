@@ -0,0 +1,53 @@
+import os
+import unittest
+import numpy as np
+from frame_bus import FrameBusWriter, FrameBusReader
+from landmarks import HandLandmarks
+
+class TestFrameBus(unittest.TestCase):
+    def setUp(self):
+        self.name = f"atp_test_{os.getpid()}"
+        self.writer = FrameBusWriter(self.name, max_width=64, max_height=48, slots=3)
+        self.reader = FrameBusReader.attach(self.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def test_nothing_published(self):
+        self.assertIsNone(self.reader.read())
+
+    def test_round_trip_newest_frame(self):
+        points = np.random.rand(2, 21, 3).astype(np.float32)
+        for i in range(5):
+            frame = np.full((48, 64, 3), i, dtype=np.uint8)
+            self.writer.publish(frame, HandLandmarks(points + i, ['left', 'right']), timestamp=float(i))
+
+        item = self.reader.read()
+        self.assertEqual(item.seq, 5)
+        self.assertEqual(item.timestamp, 4.0)
+        self.assertTrue(np.all(item.frame == 4))
+        self.assertEqual(item.hands.labels, ('left', 'right'))
+        np.testing.assert_allclose(item.hands.points, points + 4)
+        # Already seen
+        self.assertIsNone(self.reader.read())
+
+    def test_oversized_frame_is_scaled(self):
+        self.writer.publish(np.zeros((96, 128, 3), dtype=np.uint8), None)
+        item = self.reader.read()
+        self.assertEqual(item.frame.shape, (48, 64, 3))
+        self.assertIsNone(item.hands)
+
+    def test_heartbeat(self):
+        self.assertTrue(self.reader.writer_alive)
+        self.reader.stale_ms = 50
+        self.writer._views.header['heartbeat'] -= 1.0  # a writer that hung a second ago
+        self.assertFalse(self.reader.writer_alive)
+        self.writer.beat()
+        self.assertTrue(self.reader.writer_alive)
+
+    def test_attach_missing_bus(self):
+        self.assertIsNone(FrameBusReader.attach(self.name + '_missing'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import threading
+from frame_grabber import FrameGrabber
+
+class FakeCapture:
+    """Produces numbered frames, optionally waiting for a go signal per frame"""
+    def __init__(self, gated=False):
+        self.n = 0
+        self.gate = threading.Semaphore(0) if gated else None
+
+    def read(self, out=None):
+        if self.gate is not None and not self.gate.acquire(timeout=0.05):
+            return False, None
+        self.n += 1
+        return True, self.n
+
+class TestFrameGrabber(unittest.TestCase):
+    def test_latest_frame_wins(self):
+        cap = FakeCapture(gated=True)
+        grabber = FrameGrabber(cap).start()
+        try:
+            for _ in range(3):
+                cap.gate.release()
+            # Wait until all three frames have been captured
+            for _ in range(100):
+                if grabber.frames_captured == 3:
+                    break
+                threading.Event().wait(0.01)
+
+            frame, ts = grabber.read(block=False)
+            self.assertEqual(frame, 3)
+            self.assertIsNotNone(ts)
+            self.assertEqual(grabber.frames_dropped, 2)
+        finally:
+            grabber.stop()
+
+    def test_non_blocking_read_without_new_frame(self):
+        cap = FakeCapture(gated=True)
+        grabber = FrameGrabber(cap).start()
+        try:
+            self.assertEqual(grabber.read(block=False), (None, None))
+            self.assertEqual(grabber.read(block=True, timeout=0.05), (None, None))
+
+            cap.gate.release()
+            frame, _ = grabber.read(block=True, timeout=1.0)
+            self.assertEqual(frame, 1)
+            # Same frame is never handed out twice
+            self.assertEqual(grabber.read(block=False), (None, None))
+        finally:
+            grabber.stop()
+
+    def test_buffers_are_recycled(self):
+        class BufferCapture:
+            def __init__(self):
+                self.gate = threading.Semaphore(0)
+                self.allocated = 0
+            def read(self, out=None):
+                if not self.gate.acquire(timeout=0.05):
+                    return False, None
+                if out is None:
+                    self.allocated += 1
+                    out = [0]
+                out[0] += 1
+                return True, out
+
+        cap = BufferCapture()
+        grabber = FrameGrabber(cap).start()
+        try:
+            for _ in range(20):
+                cap.gate.release()
+                frame, _ = grabber.read(block=True, timeout=1.0)
+                self.assertIsNotNone(frame)
+            self.assertLessEqual(cap.allocated, 3)
+        finally:
+            grabber.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from frame_sources import GeneratorSource, ImageDirectorySource, open_source, synthetic_frames
+
+class TestFrameSources(unittest.TestCase):
+    def test_generator_source_exhausts(self):
+        frames = [np.zeros((4, 4, 3), dtype=np.uint8) for _ in range(2)]
+        src = GeneratorSource(frames)
+        self.assertFalse(src.live)
+        self.assertTrue(src.read()[0])
+        self.assertTrue(src.read()[0])
+        self.assertEqual(src.read(), (False, None))
+        self.assertTrue(src.exhausted)
+
+    def test_image_directory_sorted(self):
+        with tempfile.TemporaryDirectory() as d:
+            for i in (2, 0, 1):
+                img = np.full((8, 8, 3), i * 10, dtype=np.uint8)
+                cv2.imwrite(os.path.join(d, f"frame_{i:03d}.png"), img)
+            src = open_source(d, speed=0)
+            self.assertIsInstance(src, ImageDirectorySource)
+            values = []
+            while True:
+                ret, frame = src.read()
+                if not ret:
+                    break
+                values.append(int(frame[0, 0, 0]))
+            self.assertEqual(values, [0, 10, 20])
+            self.assertTrue(src.exhausted)
+
+    def test_synthetic_spec(self):
+        src = open_source('synthetic:64x48', speed=0)
+        ret, frame = src.read()
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (48, 64, 3))
+        self.assertEqual(len(list(synthetic_frames(8, 8, count=3))), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,14 @@
+import os
+import tempfile
 import unittest
 import time
+import numpy as np
+from unittest import mock
 from gesturelogic import GestureEngine
+from dtw import Template, TemplateMatcher
+from landmarks import HandLandmarks
 from utils.config import Config
+from synthetic import hand_points
 
 class TestGestureEngine(unittest.TestCase):
     def setUp(self):
@@ -42,5 +49,86 @@ class TestGestureEngine(unittest.TestCase):
         # Check that no gesture was detected
         self.assertEqual(len(gestures), 0)
 
+def right_hand(pinch):
+    return HandLandmarks(hand_points(pinch=pinch)[None], ['right'])
+
+class TestBatchReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = Config(os.path.join(self.tmp.name, 'config.json'))
+        # Pinch on/off every 3 frames at 30 fps, so some clicks fall in the cooldown
+        self.frames = [right_hand(i % 6 >= 3) for i in range(60)]
+        self.timestamps = [100 + i / 30 for i in range(60)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batch_matches_live_clock(self):
+        ticks = iter(self.timestamps)
+        live = GestureEngine(self.config, clock=lambda: next(ticks))
+        live_events = [live.update(hands) for hands in self.frames]
+
+        batch = GestureEngine(self.config).update_batch(self.frames, self.timestamps)
+        self.assertEqual(batch, live_events)
+        clicks = [i for i, events in enumerate(batch) if events]
+        # Pinches are 0.2 s apart and COOLDOWN is 0.25 s, so every other one clicks
+        self.assertEqual(clicks, list(range(3, 60, 12)))
+
+    def test_timestamps_from_zero(self):
+        # Recordings start at t=0: the first click must not count as inside the cooldown
+        engine = GestureEngine(self.config)
+        from_zero = engine.update_batch(self.frames, [t - 100 for t in self.timestamps])
+        self.assertEqual([i for i, events in enumerate(from_zero) if events], list(range(3, 60, 12)))
+
+    def test_reset_replays_identically(self):
+        engine = GestureEngine(self.config)
+        first = engine.update_batch(self.frames, self.timestamps)
+        engine.reset()
+        self.assertEqual(engine.update_batch(self.frames, self.timestamps), first)
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            GestureEngine(self.config).update_batch(self.frames, self.timestamps[:-1])
+
+class TestTemplateConfidence(unittest.TestCase):
+    def test_accepted_match_passes_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Config(os.path.join(tmp, 'config.json'))
+            engine = GestureEngine(config)
+            template = Template('circle', 'screenshot', [(1, 0)] * 4)
+            engine.matcher = TemplateMatcher([template], 0.3)
+            for cost, expected in ((0.0, 1.0), (0.15, 0.8), (0.3, config.CONFIDENCE_THRESHOLD)):
+                with mock.patch.object(engine.matcher, 'push', lambda hand, feature: [(template, cost)]):
+                    (event,) = engine._match_templates('right', (1.0, 0.0))
+                self.assertAlmostEqual(event['confidence'], expected)
+                self.assertGreaterEqual(event['confidence'], config.CONFIDENCE_THRESHOLD)
+
+class TestCameraSwitch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = GestureEngine(Config(os.path.join(self.tmp.name, 'config.json')))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_switch(self, forget):
+        # A held pinch seen by one camera, then the same hand 0.4 further right in another
+        moved = HandLandmarks(hand_points(0.7, pinch=True)[None], ['right'])
+        events = self.engine.update_batch([right_hand(True)] * 5, [i / 30 for i in range(5)])
+        if forget:
+            self.engine.forget({'right'})
+        events += self.engine.update_batch([moved] * 5, [i / 30 for i in range(5, 10)])
+        return events, self.engine.hand_hist['right_0']['velocity']
+
+    def test_forget_restarts_motion(self):
+        events, velocity = self.run_switch(forget=True)
+        self.assertEqual(velocity, [0.0, 0.0])
+        # Pose state is kept: the pinch clicked once and the switch did not click again
+        self.assertEqual(sum(len(e) for e in events), 1)
+
+    def test_jump_without_forget(self):
+        _, velocity = self.run_switch(forget=False)
+        self.assertGreater(abs(velocity[0]), 1.0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from governor import LatencyGovernor, QualityLevel, build_levels
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+class FakeTracker:
+    nominal_fps = 30
+    def __init__(self):
+        self.calls = []
+    def configure_model(self, model_complexity, max_num_hands):
+        self.calls.append(('model', model_complexity, max_num_hands))
+    def set_capture_mode(self, width, height, fps=None):
+        self.calls.append(('capture', width, height, fps))
+
+class TestBuildLevels(unittest.TestCase):
+    def test_ladder_order(self):
+        levels = build_levels(640, 480, model_complexity=1, max_num_hands=2, min_fps=15)
+        self.assertEqual(levels[0], QualityLevel(640, 480, 1, 2, None))
+        self.assertEqual(levels[1], QualityLevel(640, 480, 0, 2, None))
+        self.assertEqual(levels[-1], QualityLevel(320, 240, 0, 1, 15))
+        # Lite model already: no duplicate first step
+        self.assertEqual(build_levels(640, 480)[1].width, 480)
+
+class TestLatencyGovernor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.log = []
+        self.gov = LatencyGovernor(build_levels(640, 480, 1), budget_ms=40, window=10,
+                                   up_after=5.0, settle=1.0, clock=self.clock,
+                                   log=self.log.append)
+
+    def feed(self, ms, frames, dt=1 / 30):
+        changed = None
+        for _ in range(frames):
+            self.clock.t += dt
+            changed = self.gov.update(ms) or changed
+        return changed
+
+    def test_steps_down_when_over_budget_and_logs(self):
+        self.assertIsNotNone(self.feed(60, 45))
+        self.assertEqual(self.gov.index, 1)
+        self.assertEqual(len(self.log), 1)
+        self.assertIn('over 40 ms budget', self.log[0])
+
+    def test_hysteresis_between_thresholds(self):
+        self.feed(60, 45)
+        # Between low (24 ms) and budget: stays put
+        self.feed(30, 600)
+        self.assertEqual(self.gov.index, 1)
+        # Clearly under: steps up only after up_after seconds
+        self.feed(10, 60)
+        self.assertEqual(self.gov.index, 1)
+        self.feed(10, 200)
+        self.assertEqual(self.gov.index, 0)
+
+    def test_backoff_after_bounce(self):
+        self.feed(60, 45)
+        self.feed(10, 250)
+        self.assertEqual(self.gov.index, 0)
+        self.feed(60, 20)  # level 0 immediately too slow again
+        self.assertEqual(self.gov.index, 1)
+        self.feed(10, 250)  # ~8 s: no longer enough
+        self.assertEqual(self.gov.index, 1)
+        self.feed(10, 150)
+        self.assertEqual(self.gov.index, 0)
+
+    def test_apply_only_pushes_changes(self):
+        tracker = FakeTracker()
+        self.feed(60, 45)  # model 1 -> 0
+        self.gov.apply(tracker)
+        self.assertEqual(tracker.calls, [('model', 0, 2)])
+        self.feed(60, 45)  # resolution step
+        self.gov.apply(tracker)
+        self.assertEqual(tracker.calls[-1], ('capture', 480, 360, 30))
+        self.gov.apply(tracker, force=True)
+        self.assertEqual(len(tracker.calls), 3)
+
+if __name__ == '__main__':
+    unittest.main()
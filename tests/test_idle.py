@@ -0,0 +1,41 @@
+import unittest
+from idle import IdleStateMachine
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+    def __call__(self):
+        return self.t
+
+class TestIdleStateMachine(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.power = IdleStateMachine(idle_after=5.0, clock=self.clock)
+
+    def test_sleep_after_timeout(self):
+        self.clock.t += 4.9
+        self.assertIsNone(self.power.update(False))
+        self.clock.t += 0.2
+        self.assertEqual(self.power.update(False), 'sleep')
+        self.assertTrue(self.power.idle)
+        self.assertIsNone(self.power.update(False))
+
+    def test_wake_on_first_hand_and_latency(self):
+        self.clock.t += 6
+        self.power.update(False)
+        self.clock.t += 10
+        frame_ts = self.clock.t
+        self.clock.t += 0.02
+        self.assertEqual(self.power.update(True, frame_ts), 'wake')
+        self.assertFalse(self.power.idle)
+
+        self.clock.t += 0.03
+        self.power.frame_processed()
+        stats = self.power.stats()
+        self.assertEqual(stats['wake_count'], 1)
+        self.assertAlmostEqual(stats['last_wake_latency_ms'], 50.0, places=1)
+        self.assertAlmostEqual(stats['time_in_state']['idle'], 10.02, places=2)
+        self.assertAlmostEqual(stats['time_in_state']['active'], 6.03, places=2)
+
+if __name__ == '__main__':
+    unittest.main()
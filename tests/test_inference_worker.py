@@ -0,0 +1,71 @@
+import types
+import unittest
+from inference_worker import InferenceWorker
+
+def point(x, y, z=0.0):
+    return types.SimpleNamespace(x=x, y=y, z=z)
+
+class StubHands:
+    """
+    Stands in for MediaPipe Hands in the worker process
+
+    Reports one right hand when the image is not black: x is the first
+    pixel's value / 255 and y the image height / 1000, so a test can tell
+    which buffer and size the worker read. Static models score 0.5.
+    """
+    def __init__(self, model_complexity, max_num_hands, static=False):
+        self.score = 0.5 if static else 0.9
+
+    def process(self, img):
+        if not img[0, 0, 0]:
+            return types.SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+        landmarks = types.SimpleNamespace(landmark=[point(img[0, 0, 0] / 255, img.shape[0] / 1000)] * 21)
+        handedness = types.SimpleNamespace(classification=[types.SimpleNamespace(label='Right', score=self.score)])
+        return types.SimpleNamespace(multi_hand_landmarks=[landmarks], multi_handedness=[handedness])
+
+    def close(self):
+        pass
+
+class TestInferenceWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = InferenceWorker(4, 4, model_factory=StubHands)
+
+    def tearDown(self):
+        self.worker.close()
+
+    def infer(self, height, width, value, static=False):
+        buf = self.worker.frame_buffer(height, width)
+        buf[:] = value
+        del buf
+        return self.worker.process(height, width, static=static)
+
+    def test_round_trip(self):
+        points, labels, scores = self.infer(4, 4, 51)
+        self.assertEqual(labels, ['right'])
+        self.assertEqual(points.shape, (1, 21, 3))
+        self.assertAlmostEqual(float(points[0, 8, 0]), 0.2)
+        self.assertAlmostEqual(float(points[0, 8, 1]), 0.004)
+        self.assertAlmostEqual(float(scores[0]), 0.9, places=5)
+        points, labels, _ = self.infer(4, 4, 0)
+        self.assertEqual(labels, [])
+        self.assertEqual(points.shape[0], 0)
+
+    def test_remap_after_resolution_change(self):
+        self.infer(4, 4, 51)
+        old = self.worker.frame_shm.name
+        points, labels, _ = self.infer(8, 16, 102)
+        self.assertNotEqual(self.worker.frame_shm.name, old)
+        self.assertEqual(labels, ['right'])
+        self.assertAlmostEqual(float(points[0, 0, 0]), 0.4)
+        self.assertAlmostEqual(float(points[0, 0, 1]), 0.008)
+
+    def test_static_model_and_configure(self):
+        _, _, scores = self.infer(4, 4, 51, static=True)
+        self.assertAlmostEqual(float(scores[0]), 0.5, places=5)
+        self.worker.configure(1, 1)
+        _, labels, scores = self.infer(4, 4, 51)
+        self.assertEqual(labels, ['right'])
+        self.assertAlmostEqual(float(scores[0]), 0.9, places=5)
+
+if __name__ == '__main__':
+    unittest.main()
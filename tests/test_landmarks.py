@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+from landmarks import HandLandmarks, as_landmarks, pair_distances, THUMB_TIP, INDEX_TIP
+
+class TestHandLandmarks(unittest.TestCase):
+    def test_from_lists_pads_z(self):
+        pts = [[i / 21.0, 0.5] for i in range(21)]
+        hands = HandLandmarks.from_lists([(pts, 'right')])
+        self.assertEqual(hands.points.shape, (1, 21, 3))
+        self.assertEqual(hands.points.dtype, np.float32)
+        self.assertTrue(np.all(hands.points[..., 2] == 0))
+        self.assertEqual(hands.keys(), ['right_0'])
+
+    def test_legacy_iteration(self):
+        points = np.zeros((2, 21, 3), dtype=np.float32)
+        hands = HandLandmarks(points, ['left', 'right'])
+        self.assertEqual([label for _, label in hands], ['left', 'right'])
+        self.assertEqual(len(hands), 2)
+        self.assertFalse(as_landmarks(None))
+
+    def test_pair_distances(self):
+        points = np.zeros((2, 21, 3), dtype=np.float32)
+        points[0, INDEX_TIP] = [0.3, 0.4, 0.9]  # z is ignored
+        points[1, INDEX_TIP] = [0.0, 0.1, 0.0]
+        d = pair_distances(points, [THUMB_TIP], [INDEX_TIP])
+        self.assertEqual(d.shape, (2, 1))
+        np.testing.assert_allclose(d[:, 0], [0.5, 0.1], rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
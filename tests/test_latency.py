@@ -0,0 +1,35 @@
+import unittest
+from latency import RollingPercentiles, LatencyTracer
+
+class TestRollingPercentiles(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(RollingPercentiles(10).summary())
+
+    def test_percentiles_over_window(self):
+        hist = RollingPercentiles(100)
+        for v in range(1, 101):
+            hist.add(v)
+        s = hist.summary()
+        self.assertAlmostEqual(s['p50'], 50.5)
+        self.assertAlmostEqual(s['p99'], 99.01)
+        self.assertEqual(s['max'], 100)
+        # Old samples roll out of the window
+        for _ in range(100):
+            hist.add(1000)
+        self.assertEqual(hist.summary()['p50'], 1000)
+        self.assertEqual(hist.summary()['count'], 200)
+
+class TestLatencyTracer(unittest.TestCase):
+    def test_stages_in_ms(self):
+        tracer = LatencyTracer()
+        trace = tracer.trace(10.000, 10.020, 10.025)
+        tracer.record_frame(trace)
+        tracer.record_injection(dict(trace, injection=10.030))
+        stats = tracer.stats()
+        self.assertAlmostEqual(stats['capture_to_inference']['p50'], 20.0)
+        self.assertAlmostEqual(stats['inference_to_engine']['p50'], 5.0)
+        self.assertAlmostEqual(stats['engine_to_injection']['p50'], 5.0)
+        self.assertAlmostEqual(stats['end_to_end']['p50'], 30.0)
+
+if __name__ == '__main__':
+    unittest.main()
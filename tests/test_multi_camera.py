@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from landmarks import HandLandmarks, NUM_LANDMARKS
+from multi_camera import fuse
+
+def hands(*entries):
+    points = np.zeros((len(entries), NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, (x, _, _) in enumerate(entries):
+        points[i, :, 0] = x
+    return HandLandmarks(points, [e[1] for e in entries],
+                         np.array([e[2] for e in entries], dtype=np.float32))
+
+class TestFuse(unittest.TestCase):
+    def test_best_score_per_label(self):
+        owner = {}
+        out, chosen = fuse([(0, hands((0.1, 'right', 0.7), (0.2, 'left', 0.9))),
+                            (1, hands((0.5, 'right', 0.95)))], owner)
+        self.assertEqual(out.labels, ('left', 'right'))
+        self.assertEqual(chosen, [0, 1])
+        self.assertAlmostEqual(float(out.points[1, 0, 0]), 0.5)
+
+    def test_sticky_within_margin(self):
+        owner = {'right': 0}
+        _, chosen = fuse([(0, hands((0.1, 'right', 0.85))),
+                          (1, hands((0.5, 'right', 0.9)))], owner)
+        self.assertEqual(chosen, [0])
+        _, chosen = fuse([(0, hands((0.1, 'right', 0.7))),
+                          (1, hands((0.5, 'right', 0.9)))], owner)
+        self.assertEqual(chosen, [1])
+        self.assertEqual(owner['right'], 1)
+
+    def test_reports_switched_labels(self):
+        owner, switched = {'right': 0, 'left': 0}, set()
+        fuse([(0, hands((0.1, 'right', 0.5), (0.2, 'left', 0.9))),
+              (1, hands((0.5, 'right', 0.9)))], owner, switched=switched)
+        self.assertEqual(switched, {'right'})
+        fuse([(1, hands((0.5, 'right', 0.9), (0.6, 'left', 0.9)))], {}, switched=switched)
+        self.assertEqual(switched, {'right'})  # first sighting is not a switch
+
+    def test_no_hands(self):
+        owner = {'left': 1}
+        out, chosen = fuse([(0, None), (1, None)], owner)
+        self.assertIsNone(out)
+        self.assertEqual(chosen, [])
+        self.assertEqual(owner, {})
+
+if __name__ == '__main__':
+    unittest.main()
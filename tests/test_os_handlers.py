@@ -0,0 +1,149 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import os_handlers
+from os_handlers import PactlAudio, AmixerSession, SysfsBacklight, find_backlight, resolve_backends
+from synthetic import fake_tool, fake_backlight
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def level(device):
+    """Brightness as the kernel would parse it (the file is overwritten in place)"""
+    return int(read(os.path.join(device, 'brightness')).split()[0])
+
+class TestSysfsBacklight(unittest.TestCase):
+    def test_relative_steps_and_clamping(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            device = fake_backlight(tmp)
+            self.assertEqual(find_backlight(tmp), device)
+            backlight = SysfsBacklight(device)
+            backlight.change(2)
+            self.assertEqual(level(device), 600)
+            backlight.change(-1)
+            backlight.change(-1)
+            self.assertEqual(level(device), 400)
+            backlight.change(9)
+            self.assertEqual(backlight.level, 1000)
+            backlight.set(25)
+            self.assertEqual(level(device), 250)
+            backlight.close()
+
+    def test_steps_from_outside_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            device = fake_backlight(tmp)
+            backlight = SysfsBacklight(device)
+            # e.g. the brightness keys or the desktop's slider
+            with open(os.path.join(device, 'brightness'), 'w') as f:
+                f.write('100\n')
+            backlight.change(1)
+            self.assertEqual(level(device), 200)
+            backlight.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Linux backends')
+    def test_resolved_before_tools(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fake_backlight(tmp)
+            backends = resolve_backends(which=lambda name: '/usr/bin/' + name, backlight_root=tmp)
+            self.assertEqual(backends['brightness'].name, 'sysfs')
+            backends = resolve_backends(which=lambda name: '/usr/bin/' + name,
+                                        backlight_root=os.path.join(tmp, 'missing'))
+            self.assertEqual(backends['brightness'].name, 'brightnessctl')
+            self.assertEqual(backends['media'].name,
+                             'mpris' if os_handlers.open_dbus_connection else 'playerctl')
+
+class FakeBus:
+    """Session bus with MPRIS players in the given playback states"""
+    def __init__(self, players):
+        self.players = players
+        self.calls = []
+
+    def send_and_get_reply(self, msg):
+        address, method, body = msg
+        if method == 'ListNames':
+            return mock.Mock(body=[['org.freedesktop.DBus'] +
+                                   ['org.mpris.MediaPlayer2.' + p for p in self.players]])
+        if method == 'Get':
+            return mock.Mock(body=[('s', self.players[address['bus_name'].split('.')[-1]])])
+        self.calls.append((address['bus_name'], method))
+        return mock.Mock(body=[])
+
+class FakeKeys:
+    def __init__(self):
+        self.calls = []
+    def play_pause(self):
+        self.calls.append('play_pause')
+        return True
+
+class TestMprisMedia(unittest.TestCase):
+    def setUp(self):
+        # Stand-ins for jeepney: addresses are dicts, messages (address, method, body)
+        patcher = mock.patch.multiple(
+            os_handlers, create=True,
+            open_dbus_connection=lambda bus: self.bus,
+            DBusAddress=lambda path, bus_name, interface: {'bus_name': bus_name},
+            new_method_call=lambda address, method, signature=None, body=(): (address, method, body))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def media(self, players, fallback=None):
+        self.bus = FakeBus(players)
+        return os_handlers.MprisMedia(fallback), self.bus
+
+    def test_prefers_playing_player(self):
+        media, bus = self.media({'chromium': 'Paused', 'spotify': 'Playing', 'vlc': 'Stopped'})
+        self.assertTrue(media.play_pause())
+        self.assertEqual(bus.calls, [('org.mpris.MediaPlayer2.spotify', 'PlayPause')])
+
+    def test_falls_back_without_players(self):
+        keys = FakeKeys()
+        media, _ = self.media({}, fallback=keys)
+        self.assertTrue(media.play_pause())
+        self.assertEqual(keys.calls, ['play_pause'])
+
+@unittest.skipIf(os.name == 'nt', 'shell script stand-ins')
+class TestCommandBackends(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Linux backends')
+    def test_close_backends(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fake_backlight(tmp)
+            amixer = fake_tool(tmp, 'amixer', 'cat > /dev/null')
+            which = lambda name: amixer if name == 'amixer' else None
+            with mock.patch.object(os_handlers, 'pulsectl', None), \
+                 mock.patch.object(os_handlers, '_backends', resolve_backends(which, tmp)):
+                backends = os_handlers.get_backends()
+                self.assertEqual(backends['audio'].name, 'amixer')
+                backends['audio'].change(1)
+                proc = backends['audio'].proc
+                with mock.patch.object(backends['brightness'], 'close',
+                                       wraps=backends['brightness'].close) as close_backlight:
+                    os_handlers.close_backends()
+                self.assertIsNone(os_handlers._backends)
+            self.assertIsNotNone(proc.poll())
+            close_backlight.assert_called_once_with()
+
+    def test_pactl_steps_are_one_call(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'calls')
+            audio = PactlAudio(fake_tool(tmp, 'pactl', f'echo "$@" >> {log}'))
+            self.assertTrue(audio.change(3))
+            self.assertTrue(audio.change(-1))
+            self.assertEqual(read(log).splitlines(), ['set-sink-volume @DEFAULT_SINK@ +15%',
+                                                      'set-sink-volume @DEFAULT_SINK@ -5%'])
+
+    def test_amixer_session_is_one_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'commands')
+            audio = AmixerSession(fake_tool(tmp, 'amixer', f'echo start >> {log}; cat >> {log}'))
+            audio.change(2)
+            audio.change(-1)
+            audio.toggle_mute()
+            audio.close()
+            self.assertEqual(read(log).splitlines(), ['start', 'set Master 10%+', 'set Master 5%-',
+                                                      'set Master toggle'])
+
+if __name__ == '__main__':
+    unittest.main()
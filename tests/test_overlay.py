@@ -0,0 +1,38 @@
+import threading
+import unittest
+import numpy as np
+from landmarks import HandLandmarks
+from overlay import OverlayRenderer
+
+class TestOverlayRenderer(unittest.TestCase):
+    def test_inactive_without_subscribers(self):
+        overlay = OverlayRenderer(fps=0)
+        self.assertFalse(overlay.active)
+        overlay.submit(np.zeros((4, 4, 3), dtype=np.uint8), None)
+        self.assertIsNone(overlay._buffer)
+
+    def test_renders_copy_on_own_thread(self):
+        overlay = OverlayRenderer(fps=0)
+        got = threading.Event()
+        seen = {}
+
+        def on_frame(frame, hands):
+            seen['thread'] = threading.current_thread().name
+            seen['frame'] = frame.copy()
+            got.set()
+
+        overlay.subscribe(on_frame)
+        try:
+            frame = np.zeros((48, 64, 3), dtype=np.uint8)
+            points = np.full((1, 21, 3), 0.5, dtype=np.float32)
+            overlay.submit(frame, HandLandmarks(points, ['right']))
+            self.assertTrue(got.wait(1.0))
+            self.assertEqual(seen['thread'], 'OverlayRenderer')
+            # Landmarks drawn on the renderer's copy, not the tracker's frame
+            self.assertGreater(seen['frame'].sum(), 0)
+            self.assertEqual(frame.sum(), 0)
+        finally:
+            overlay.unsubscribe(on_frame)
+
+if __name__ == '__main__':
+    unittest.main()
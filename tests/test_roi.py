@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from roi import HandRoi
+
+class TestHandRoi(unittest.TestCase):
+    def setUp(self):
+        self.roi = HandRoi(size=256, margin=0.25, min_fraction=0.2)
+
+    def test_no_region_without_hands(self):
+        self.assertIsNone(self.roi.region(1280, 720))
+        self.roi.update(None)
+        self.assertIsNone(self.roi.region(1280, 720))
+
+    def test_region_is_square_and_inside_frame(self):
+        pts = np.zeros((1, 21, 3), dtype=np.float32)
+        pts[0, :, 0] = np.linspace(0.90, 0.98, 21)
+        pts[0, :, 1] = np.linspace(0.10, 0.30, 21)
+        self.roi.update(pts)
+        x, y, w, h = self.roi.region(1280, 720)
+        self.assertEqual(w, h)
+        self.assertGreaterEqual(x, 0)
+        self.assertGreaterEqual(y, 0)
+        self.assertLessEqual(x + w, 1280)
+        self.assertLessEqual(y + h, 720)
+
+    def test_full_frame_box_falls_back(self):
+        pts = np.zeros((1, 21, 3), dtype=np.float32)
+        pts[0, :, 0] = np.linspace(0.0, 1.0, 21)
+        pts[0, :, 1] = np.linspace(0.0, 1.0, 21)
+        self.roi.update(pts)
+        self.assertIsNone(self.roi.region(640, 480))
+
+    def test_to_full_round_trip(self):
+        region = (400, 100, 200, 200)
+        full = np.array([[[0.5, 0.25, 0.1]]], dtype=np.float32)
+        # Same point expressed in crop coordinates
+        crop = np.array([[[(0.5 * 1280 - 400) / 200, (0.25 * 720 - 100) / 200, 0.1 * 1280 / 200]]],
+                        dtype=np.float32)
+        self.roi.to_full(crop, region, 1280, 720)
+        np.testing.assert_allclose(crop, full, rtol=1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from rules import RuleSet, load_rules, HAND_FLAGS
+from gesturelogic import GestureEngine
+from landmarks import HandLandmarks
+from utils.config import Config
+from synthetic import hand_points
+
+def open_hand(x0=0.3, pinch=False, tap3=False):
+    return hand_points(x0, pinch=pinch, tap3=tap3)
+
+_TMP = tempfile.TemporaryDirectory()
+
+def default_config():
+    """Defaults in a throwaway file, unaffected by other tests' config.json edits"""
+    return Config(os.path.join(_TMP.name, 'config.json'))
+
+def frame(*hands):
+    return HandLandmarks(np.stack([p for p, _ in hands]), [label for _, label in hands])
+
+class TestRuleSet(unittest.TestCase):
+    def test_preconditions_select_rules(self):
+        rules = RuleSet([
+            {'type': 'a', 'hand': 'right', 'on': 'pinch_ti'},
+            {'type': 'b', 'hand': 'right', 'when': 'palm', 'if': 'vx > 0.1'},
+            {'type': 'c', 'hand': 'left', 'on': 'pinch_ti'},
+        ])
+        pinch, palm = 1 << HAND_FLAGS.index('pinch_ti'), 1 << HAND_FLAGS.index('palm')
+        self.assertEqual([r.type for r in rules.candidates('right', pinch, pinch)], ['a'])
+        self.assertEqual(rules.candidates('right', pinch, 0), ())
+        self.assertEqual([r.type for r in rules.candidates('left', pinch, pinch)], ['c'])
+        # Variables are only built when a rule passes its preconditions
+        self.assertEqual(rules.evaluate('right', 0, 0, lambda: self.fail('built variables')), [])
+        self.assertEqual(rules.evaluate('right', palm, 0, {'vx': 0.2}), [{'type': 'b', 'confidence': 1.0}])
+        self.assertEqual(rules.evaluate('right', palm, 0, {'vx': 0.0}), [])
+
+    def test_rejects_unsafe_or_unknown(self):
+        for spec in ({'type': 'x', 'if': '__import__("os")'},
+                     {'type': 'x', 'if': 'vx.real > 0'},
+                     {'type': 'x', 'if': 'nope > 0'},
+                     {'type': 'x', 'on': 'not_a_flag'},
+                     {'type': 'x', 'hand': 'third'}):
+            with self.assertRaises(ValueError):
+                RuleSet([spec])
+
+    def test_config_constants(self):
+        rules = RuleSet([{'type': 'x', 'on': 'pinch_ti', 'confidence': 'conf(1 - d_ti / PINCH_THRESHOLD)'}], default_config())
+        bit = 1 << HAND_FLAGS.index('pinch_ti')
+        event, = rules.evaluate('right', bit, bit, {'d_ti': 0.0})
+        self.assertEqual(event['confidence'], 1.0)
+
+    def test_default_rules_compile(self):
+        rules = load_rules(None, default_config())
+        types = rules.types()
+        self.assertEqual(len(types), len(set(types)))
+        for t in ('left_click', 'right_click', 'middle_click', 'screenshot', 'app_switch',
+                  'task_view', 'show_desktop', 'volume_up', 'zoom_in', 'lock_screen'):
+            self.assertIn(t, types)
+
+class TestEngineRules(unittest.TestCase):
+    def setUp(self):
+        self.engine = GestureEngine(default_config())
+
+    def run_frames(self, *frames):
+        # Half a second apart: the hands move between poses without swiping
+        events = self.engine.update_batch(frames, [i * 0.5 for i in range(len(frames))])
+        return [[g['type'] for g in e] for e in events]
+
+    def test_right_pinch_clicks_then_drags(self):
+        still = frame((open_hand(), 'right'))
+        pinched = frame((open_hand(pinch=True), 'right'))
+        # Held past HOLD_TIME the pinch becomes a drag, once
+        self.assertEqual(self.run_frames(still, pinched, pinched, pinched),
+                         [[], ['left_click'], ['drag'], []])
+
+    def test_drag_released_when_hand_leaves(self):
+        still = frame((open_hand(), 'right'))
+        pinched = frame((open_hand(pinch=True), 'right'))
+        self.assertEqual(self.run_frames(still, pinched, pinched, None),
+                         [[], ['left_click'], ['drag'], ['drop']])
+        self.assertEqual(self.engine.release(), [])
+        # Pinch let go in view: the rule's own drop, no second release
+        self.engine.reset()
+        self.assertEqual(self.run_frames(still, pinched, pinched, still, None),
+                         [[], ['left_click'], ['drag'], ['drop'], []])
+
+    def test_left_pinch_is_volume(self):
+        still = frame((open_hand(), 'left'))
+        pinched = frame((open_hand(pinch=True), 'left'))
+        self.assertEqual(self.run_frames(still, pinched), [[], ['volume_up']])
+
+    def test_hands_together_locks(self):
+        apart = frame((open_hand(0.0), 'left'), (open_hand(0.5), 'right'))
+        together = frame((open_hand(0.3), 'left'), (open_hand(0.32), 'right'))
+        self.assertEqual(self.run_frames(apart, apart, together)[-1], ['lock_screen'])
+
+    def test_swipe_independent_of_frame_rate(self):
+        # Three-finger swipe right at 2.4 units/s, sampled at 15 and at 60 fps
+        for fps in (15, 60):
+            self.engine.reset()
+            times = [i / fps for i in range(int(0.4 * fps))]
+            frames = [frame((open_hand(0.1 + 2.4 * t, tap3=True), 'right')) for t in times]
+            fired = {g['type'] for events in self.engine.update_batch(frames, times) for g in events}
+            self.assertIn('app_switch', fired, f'{fps} fps')
+
+    def test_unsupported_types_dropped(self):
+        engine = GestureEngine(default_config(), supported={'left_click', 'drag'})
+        self.assertEqual(sorted(engine.rules.types()), ['drag', 'left_click'])
+        self.assertFalse(engine.rules.handles('both'))
+        still = frame((open_hand(), 'left'), (open_hand(0.6), 'right'))
+        pinched = frame((open_hand(pinch=True), 'left'), (open_hand(0.6, pinch=True), 'right'))
+        events = engine.update_batch([still, pinched], [0.0, 0.5])
+        self.assertEqual([[g['type'] for g in e] for e in events], [[], ['left_click']])
+
+if __name__ == '__main__':
+    unittest.main()
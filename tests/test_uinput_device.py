@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import uinput_device
+from uinput_device import (UInputDevice, read_events, SYN, EV_KEY, EV_REL, EV_ABS, REL_WHEEL,
+                           REL_WHEEL_HI_RES, ABS_X, ABS_Y, BUTTONS, KEYS)
+
+class TestUInputDevice(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'uinput')
+        self.device = UInputDevice(self.path, desktop=(0, 0, 800, 600), record=True)
+
+    def tearDown(self):
+        self.device.close()
+        self.tmp.cleanup()
+
+    def test_file_stand_in_records_events(self):
+        self.assertFalse(self.device.virtual)
+        self.device.click('right')
+        self.device.scroll(-2)
+        self.device.move_to(10, 20)
+        right = BUTTONS['right']
+        self.assertEqual(read_events(self.path), [
+            (EV_KEY, right, 1), SYN, (EV_KEY, right, 0), SYN,
+            (EV_REL, REL_WHEEL, -2), (EV_REL, REL_WHEEL_HI_RES, -240), SYN,
+            (EV_ABS, ABS_X, 10), (EV_ABS, ABS_Y, 20), SYN])
+        self.assertEqual(self.device.position(), (10.0, 20.0))
+
+    def test_hotkey_is_one_write(self):
+        with mock.patch.object(uinput_device.os, 'write', wraps=os.write) as write:
+            self.device.hotkey('ctrl', '+', presses=3)
+        self.assertEqual(write.call_count, 1)
+        ctrl, plus = KEYS['ctrl'], KEYS['+']
+        once = [(EV_KEY, ctrl, 1), SYN, (EV_KEY, plus, 1), SYN, (EV_KEY, plus, 0), SYN, (EV_KEY, ctrl, 0), SYN]
+        self.assertEqual(read_events(self.path), once * 3)
+
+    def test_unknown_key_sends_nothing(self):
+        with self.assertRaises(KeyError):
+            self.device.hotkey('ctrl', 'not_a_key')
+        self.assertEqual(read_events(self.path), [])
+
+    def test_never_creates_device_files(self):
+        missing = os.path.join(self.tmp.name, 'missing')
+        with self.assertRaises(FileNotFoundError):
+            UInputDevice(missing)
+        self.assertFalse(os.path.exists(missing))
+        # A regular file shadowing the node is neither used nor reported as available
+        with self.assertRaises(OSError):
+            UInputDevice(self.path)
+        self.assertFalse(uinput_device.uinput_available(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+import xtest_input
+from xtest_input import XTestInput
+
+X = xtest_input.X
+
+class FakeDisplay:
+    """Records fake input requests and flushes"""
+    def __init__(self):
+        self.events = []
+        self.flushes = 0
+    def xtest_fake_input(self, event_type, detail=0, x=0, y=0):
+        self.events.append((event_type, detail, x, y))
+    def keysym_to_keycode(self, keysym):
+        return keysym % 200 + 8
+    def flush(self):
+        self.flushes += 1
+
+@unittest.skipIf(X is None, 'python-xlib not installed')
+class TestXTestInput(unittest.TestCase):
+    def setUp(self):
+        self.display = FakeDisplay()
+        self.input = XTestInput(self.display)
+
+    def test_one_flush_per_action(self):
+        self.input.scroll(-3)
+        self.assertEqual(self.display.events, [(X.ButtonPress, 5, 0, 0), (X.ButtonRelease, 5, 0, 0)] * 3)
+        self.assertEqual(self.display.flushes, 1)
+        self.input.hotkey('ctrl', 'tab')
+        ctrl, tab = self.input._keycode('ctrl'), self.input._keycode('tab')
+        self.assertEqual([e[:2] for e in self.display.events[6:]],
+                         [(X.KeyPress, ctrl), (X.KeyPress, tab), (X.KeyRelease, tab), (X.KeyRelease, ctrl)])
+        self.assertEqual(self.display.flushes, 2)
+
+    def test_batch_flushes_once(self):
+        with self.input.batch():
+            for i in range(10):
+                self.input.move_to(i, 2 * i)
+            self.input.click('right')
+        self.assertEqual(self.display.flushes, 1)
+        self.assertEqual(self.display.events[9], (X.MotionNotify, False, 9, 18))
+        self.assertEqual(self.display.events[10:], [(X.ButtonPress, 3, 0, 0), (X.ButtonRelease, 3, 0, 0)])
+
+    def test_unknown_key(self):
+        with self.assertRaises(KeyError):
+            self.input.hotkey('not_a_key')
+        self.assertEqual(self.display.events, [])
+
+    def test_not_available_under_xwayland(self):
+        env = {'DISPLAY': ':0', 'WAYLAND_DISPLAY': 'wayland-0'}
+        with mock.patch.dict(xtest_input.os.environ, env, clear=True):
+            self.assertFalse(xtest_input.xtest_available())
+        with mock.patch.dict(xtest_input.os.environ, {'DISPLAY': ':0'}, clear=True):
+            self.assertTrue(xtest_input.xtest_available())
+
+if __name__ == '__main__':
+    unittest.main()
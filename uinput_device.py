@@ -0,0 +1,197 @@
+import os
+import stat
+import fcntl
+import struct
+import threading
+
+# Event types and codes (linux/input-event-codes.h)
+EV_SYN, EV_KEY, EV_REL, EV_ABS = 0x00, 0x01, 0x02, 0x03
+SYN_REPORT = 0
+SYN = (EV_SYN, SYN_REPORT, 0)
+REL_X, REL_Y, REL_HWHEEL, REL_WHEEL = 0x00, 0x01, 0x06, 0x08
+REL_WHEEL_HI_RES, REL_HWHEEL_HI_RES = 0x0b, 0x0c
+ABS_X, ABS_Y = 0x00, 0x01
+BUTTONS = {'left': 0x110, 'right': 0x111, 'middle': 0x112}
+WHEEL_HI_RES = 120  # high-resolution units per wheel notch
+
+# pyautogui key names -> key codes, for the shortcuts EventMapper sends
+KEYS = {
+    'esc': 1, '1': 2, '2': 3, '3': 4, '4': 5, '5': 6, '6': 7, '7': 8, '8': 9, '9': 10, '0': 11,
+    '-': 12, '=': 13, '+': 13,  # '+' is the =/+ key: ctrl+= zooms in like ctrl++
+    'backspace': 14, 'tab': 15,
+    'q': 16, 'w': 17, 'e': 18, 'r': 19, 't': 20, 'y': 21, 'u': 22, 'i': 23, 'o': 24, 'p': 25,
+    'enter': 28, 'return': 28, 'ctrl': 29, 'ctrlleft': 29,
+    'a': 30, 's': 31, 'd': 32, 'f': 33, 'g': 34, 'h': 35, 'j': 36, 'k': 37, 'l': 38,
+    'shift': 42, 'shiftleft': 42,
+    'z': 44, 'x': 45, 'c': 46, 'v': 47, 'b': 48, 'n': 49, 'm': 50,
+    'alt': 56, 'altleft': 56, 'space': 57,
+    'f1': 59, 'f2': 60, 'f3': 61, 'f4': 62, 'f5': 63, 'f6': 64, 'f7': 65, 'f8': 66, 'f9': 67,
+    'f10': 68, 'f11': 87, 'f12': 88,
+    'printscreen': 99, 'home': 102, 'up': 103, 'pageup': 104, 'left': 105, 'right': 106,
+    'end': 107, 'down': 108, 'pagedown': 109, 'delete': 111,
+    'volumemute': 113, 'volumedown': 114, 'volumeup': 115,
+    'win': 125, 'winleft': 125, 'super': 125, 'command': 125,
+    'nexttrack': 163, 'playpause': 164, 'prevtrack': 165,
+    'brightnessdown': 224, 'brightnessup': 225,
+}
+
+# struct input_event: timeval (ignored by uinput), type, code, value
+EVENT = struct.Struct('llHHi')
+# struct uinput_setup: input_id (bustype, vendor, product, version), name, ff_effects_max
+SETUP = struct.Struct('HHHH80sI')
+# struct uinput_abs_setup: code, input_absinfo (value, min, max, fuzz, flat, resolution)
+ABS_SETUP = struct.Struct('H2xiiiiii')
+BUS_VIRTUAL = 0x06
+
+
+def _ioc(direction, nr, size):
+    return direction << 30 | size << 16 | ord('U') << 8 | nr
+
+
+UI_DEV_CREATE = _ioc(0, 1, 0)
+UI_DEV_DESTROY = _ioc(0, 2, 0)
+UI_DEV_SETUP = _ioc(1, 3, SETUP.size)
+UI_ABS_SETUP = _ioc(1, 4, ABS_SETUP.size)
+UI_SET_EVBIT = _ioc(1, 100, 4)
+UI_SET_KEYBIT = _ioc(1, 101, 4)
+UI_SET_RELBIT = _ioc(1, 102, 4)
+UI_SET_ABSBIT = _ioc(1, 103, 4)
+
+
+def uinput_available(path='/dev/uinput'):
+    """True if the uinput character device exists and this user may write to it"""
+    try:
+        return stat.S_ISCHR(os.stat(path).st_mode) and os.access(path, os.W_OK)
+    except OSError:
+        return False
+
+
+def read_events(path):
+    """(type, code, value) tuples of every event written by a recording device"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [EVENT.unpack_from(data, i)[2:] for i in range(0, len(data) - EVENT.size + 1, EVENT.size)]
+
+
+class UInputDevice:
+    """
+    One virtual mouse + keyboard created through /dev/uinput.
+
+    Works the same under X11 and Wayland, with no helper process: each action
+    (a click, a hotkey, n wheel notches) is packed into input_event structs
+    and written with a single write() call.
+
+    With record=True the path is a regular file standing in for the device:
+    setup is skipped and the events are appended to it (see read_events()).
+
+    Key and button events are kept in separate SYN_REPORT frames, so a press
+    and its release are never merged into one report.
+    """
+
+    name = 'uinput'
+
+    def __init__(self, path='/dev/uinput', desktop=(0, 0, 1920, 1080), device_name='AirTouchPad',
+                 record=False):
+        """
+        Args:
+            path: uinput device node, or with record=True a file to write to
+            desktop: (x, y, width, height) spanned by absolute pointer motion
+            device_name: Name shown by evtest / libinput
+            record: Append events to a regular file (created if missing)
+                instead of driving a real device
+
+        Raises:
+            OSError: path cannot be opened, or is not a character device
+                while record is False
+        """
+        self.path = path
+        self.desktop = desktop
+        flags = os.O_WRONLY | os.O_NONBLOCK | os.O_APPEND
+        if record:
+            flags |= os.O_CREAT
+        self.fd = os.open(path, flags, 0o644)
+        self.virtual = stat.S_ISCHR(os.fstat(self.fd).st_mode)
+        if not self.virtual and not record:
+            # e.g. a stray regular /dev/uinput created while the module was not loaded
+            os.close(self.fd)
+            self.fd = None
+            raise OSError(f"{path} is not a uinput character device")
+        self._lock = threading.Lock()
+        x, y, width, height = desktop
+        self._position = (x + width // 2, y + height // 2)
+        if self.virtual:
+            self._create(device_name)
+
+    def _create(self, device_name):
+        for ev in (EV_KEY, EV_REL, EV_ABS, EV_SYN):
+            fcntl.ioctl(self.fd, UI_SET_EVBIT, ev)
+        for code in sorted(set(KEYS.values()) | set(BUTTONS.values())):
+            fcntl.ioctl(self.fd, UI_SET_KEYBIT, code)
+        for code in (REL_X, REL_Y, REL_WHEEL, REL_HWHEEL, REL_WHEEL_HI_RES, REL_HWHEEL_HI_RES):
+            fcntl.ioctl(self.fd, UI_SET_RELBIT, code)
+        x, y, width, height = self.desktop
+        for code, low, high in ((ABS_X, x, x + width - 1), (ABS_Y, y, y + height - 1)):
+            fcntl.ioctl(self.fd, UI_SET_ABSBIT, code)
+            fcntl.ioctl(self.fd, UI_ABS_SETUP, ABS_SETUP.pack(code, low, low, high, 0, 0, 0))
+        fcntl.ioctl(self.fd, UI_DEV_SETUP, SETUP.pack(BUS_VIRTUAL, 0x1209, 0xa17c, 1,
+                                                       device_name.encode()[:79], 0))
+        fcntl.ioctl(self.fd, UI_DEV_CREATE)
+
+    def send(self, events):
+        """Write (type, code, value) events with one write() call"""
+        data = b''.join(EVENT.pack(0, 0, type, code, value) for type, code, value in events)
+        with self._lock:  # the cursor thread and the dispatcher share the device
+            os.write(self.fd, data)
+
+    def click(self, button='left', clicks=1):
+        code = BUTTONS[button]
+        self.send([(EV_KEY, code, 1), SYN, (EV_KEY, code, 0), SYN] * clicks)
+
+    def mouse_down(self, button='left'):
+        self.send([(EV_KEY, BUTTONS[button], 1), SYN])
+
+    def mouse_up(self, button='left'):
+        self.send([(EV_KEY, BUTTONS[button], 0), SYN])
+
+    def scroll(self, notches):
+        """Vertical wheel; positive scrolls up"""
+        self.send([(EV_REL, REL_WHEEL, notches), (EV_REL, REL_WHEEL_HI_RES, notches * WHEEL_HI_RES), SYN])
+
+    def hscroll(self, notches):
+        """Horizontal wheel; positive scrolls right"""
+        self.send([(EV_REL, REL_HWHEEL, notches), (EV_REL, REL_HWHEEL_HI_RES, notches * WHEEL_HI_RES), SYN])
+
+    def hotkey(self, *keys, presses=1):
+        """Press keys in order and release them in reverse, `presses` times"""
+        codes = [KEYS[k.lower()] for k in keys]
+        events = []
+        for code in codes:
+            events += [(EV_KEY, code, 1), SYN]
+        for code in reversed(codes):
+            events += [(EV_KEY, code, 0), SYN]
+        self.send(events * presses)
+
+    def move(self, dx, dy):
+        """Relative pointer motion"""
+        self.send([(EV_REL, REL_X, int(dx)), (EV_REL, REL_Y, int(dy)), SYN])
+        self._position = (self._position[0] + int(dx), self._position[1] + int(dy))
+
+    def move_to(self, x, y):
+        """Absolute pointer position in desktop pixels"""
+        self.send([(EV_ABS, ABS_X, int(x)), (EV_ABS, ABS_Y, int(y)), SYN])
+        self._position = (int(x), int(y))
+
+    def position(self):
+        """Last position this device moved to (uinput cannot read the pointer)"""
+        return float(self._position[0]), float(self._position[1])
+
+    def close(self):
+        if self.fd is None:
+            return
+        if self.virtual:
+            try:
+                fcntl.ioctl(self.fd, UI_DEV_DESTROY)
+            except OSError:
+                pass
+        os.close(self.fd)
+        self.fd = None
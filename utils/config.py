@@ -3,14 +3,47 @@ class Config:
     DEFAULTS = {
         'CAP_WIDTH': 640,
         'CAP_HEIGHT': 480,
+        'CAP_FPS': 30,
         'PINCH_THRESHOLD': 0.04,
         'TWO_FINGER_THRESHOLD': 0.05,
         'HOLD_TIME': 0.35,
         'BUFFER_LEN': 8,
         'COOLDOWN': 0.25,
         'DEBUG_OVERLAY': True,
-        'SMOOTHING_FACTOR': 0.5,
-        'CONFIDENCE_THRESHOLD': 0.6
+        'FILTER_MIN_CUTOFF': 1.0,
+        'FILTER_BETA': 10.0,
+        'FILTER_D_CUTOFF': 5.0,
+        'PREDICT_MS': 0,
+        'CONFIDENCE_THRESHOLD': 0.6,
+        'GESTURE_RULES': 'gestures.json',
+        'TEMPLATE_FILE': 'templates.json',
+        'DTW_THRESHOLD': 0.3,
+        'THREADED_CAPTURE': True,
+        'INFERENCE_MODE': 'inprocess',
+        'ROI_MODE': False,
+        'ROI_SIZE': 256,
+        'ROI_MARGIN': 0.3,
+        'IDLE_MODE': True,
+        'IDLE_TIMEOUT': 5.0,
+        'IDLE_FPS': 5,
+        'IDLE_WIDTH': 320,
+        'IDLE_HEIGHT': 240,
+        'OVERLAY_FPS': 15,
+        'PUBLISH_FRAMES': False,
+        'LATENCY_GOVERNOR': True,
+        'LATENCY_BUDGET_MS': 40,
+        'GOVERNOR_MIN_FPS': 15,
+        'CURSOR_MODE': False,
+        'CURSOR_HAND': 'right',
+        'CURSOR_LANDMARK': 8,
+        'CURSOR_RATE': 120,
+        'CURSOR_SENSITIVITY': 1.5,
+        'CURSOR_ACCEL': 1.0,
+        'CURSOR_MIRROR': True,
+        'CURSOR_MONITOR': -1,
+        'DISPATCH_QUEUE_SIZE': 32,
+        'DISPATCH_MAX_AGE': 0.5,
+        'INPUT_BACKEND': 'auto'
     }
     def __init__(self, path=None):
         self.path = path or os.path.join(os.path.dirname(__file__), '..', 'config.json')
@@ -21,6 +54,8 @@ class Config:
         if os.path.exists(self.path):
             try:
                 with open(self.path,'r') as f: self._data = json.load(f)
+                # Keys added after the file was written fall back to defaults
+                for k,v in self.DEFAULTS.items(): self._data.setdefault(k, v)
             except Exception:
                 self._data = dict(self.DEFAULTS)
         else:
@@ -30,6 +65,9 @@ class Config:
             with open(self.path,'w') as f: json.dump(self._data,f,indent=2)
         except Exception as e:
             print('Failed to save config:', e)
+    def items(self):
+        """(key, value) pairs of every setting"""
+        return self._data.items()
     def __getattr__(self, name):
         if name in self._data: return self._data[name]
         raise AttributeError(name)
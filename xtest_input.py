@@ -0,0 +1,163 @@
+import os
+import threading
+import contextlib
+
+try:
+    from Xlib import X, XK
+    from Xlib import display as xdisplay
+except ImportError:
+    X = None
+
+from os_handlers import is_wayland
+
+BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+WHEEL = {'up': 4, 'down': 5, 'left': 6, 'right': 7}
+
+# pyautogui key names that are not X keysym names
+KEYSYMS = {
+    'ctrl': 'Control_L', 'ctrlleft': 'Control_L', 'ctrlright': 'Control_R',
+    'shift': 'Shift_L', 'shiftleft': 'Shift_L', 'shiftright': 'Shift_R',
+    'alt': 'Alt_L', 'altleft': 'Alt_L', 'altright': 'Alt_R',
+    'win': 'Super_L', 'winleft': 'Super_L', 'super': 'Super_L', 'command': 'Super_L',
+    'enter': 'Return', 'return': 'Return', 'tab': 'Tab', 'esc': 'Escape', 'space': 'space',
+    'backspace': 'BackSpace', 'delete': 'Delete', 'printscreen': 'Print',
+    'up': 'Up', 'down': 'Down', 'left': 'Left', 'right': 'Right',
+    'home': 'Home', 'end': 'End', 'pageup': 'Prior', 'pagedown': 'Next',
+    '+': 'plus', '-': 'minus', '=': 'equal',
+    'volumeup': 'XF86AudioRaiseVolume', 'volumedown': 'XF86AudioLowerVolume',
+    'volumemute': 'XF86AudioMute', 'playpause': 'XF86AudioPlay',
+    'nexttrack': 'XF86AudioNext', 'prevtrack': 'XF86AudioPrev',
+}
+
+
+def xtest_available():
+    """True if python-xlib is installed and an X display is set (not Wayland or XWayland)"""
+    return X is not None and bool(os.environ.get('DISPLAY')) and not is_wayland()
+
+
+class XTestInput:
+    """
+    X11 input through the XTEST extension on one held display connection.
+
+    Fake events are only queued in the client; they go out with flush(),
+    which does not wait for a reply. Each action flushes once, and inside
+    `with batch():` a whole burst (e.g. scroll notches or pointer moves)
+    is sent with a single flush.
+    """
+
+    name = 'xtest'
+
+    def __init__(self, display=None):
+        """
+        Args:
+            display: Xlib Display, or a display name (default $DISPLAY)
+        """
+        if display is None or isinstance(display, str):
+            display = xdisplay.Display(display)
+            if not display.has_extension('XTEST'):
+                display.close()
+                raise RuntimeError('X server has no XTEST extension')
+        self.display = display
+        self._keycodes = {}
+        self._lock = threading.RLock()
+        self._batching = 0
+
+    def _fake(self, event_type, detail=0, x=0, y=0):
+        self.display.xtest_fake_input(event_type, detail=detail, x=x, y=y)
+
+    def _keycode(self, key):
+        code = self._keycodes.get(key)
+        if code is None:
+            name = KEYSYMS.get(key.lower(), key)
+            keysym = XK.string_to_keysym(name)
+            code = self.display.keysym_to_keycode(keysym) if keysym else 0
+            if not code:
+                raise KeyError(key)
+            self._keycodes[key] = code
+        return code
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Queue every action inside the block and flush once at the end"""
+        with self._lock:
+            self._batching += 1
+            try:
+                yield self
+            finally:
+                self._batching -= 1
+                self.flush()
+
+    def flush(self):
+        if not self._batching:
+            self.display.flush()
+
+    def click(self, button='left', clicks=1):
+        with self._lock:
+            for _ in range(clicks):
+                self._fake(X.ButtonPress, BUTTONS[button])
+                self._fake(X.ButtonRelease, BUTTONS[button])
+            self.flush()
+
+    def mouse_down(self, button='left'):
+        with self._lock:
+            self._fake(X.ButtonPress, BUTTONS[button])
+            self.flush()
+
+    def mouse_up(self, button='left'):
+        with self._lock:
+            self._fake(X.ButtonRelease, BUTTONS[button])
+            self.flush()
+
+    def _wheel(self, button, notches):
+        with self._lock:
+            for _ in range(notches):
+                self._fake(X.ButtonPress, button)
+                self._fake(X.ButtonRelease, button)
+            self.flush()
+
+    def scroll(self, notches):
+        """Vertical wheel; positive scrolls up"""
+        self._wheel(WHEEL['up' if notches > 0 else 'down'], abs(notches))
+
+    def hscroll(self, notches):
+        """Horizontal wheel; positive scrolls right"""
+        self._wheel(WHEEL['right' if notches > 0 else 'left'], abs(notches))
+
+    def hotkey(self, *keys, presses=1):
+        """Press keys in order and release them in reverse, `presses` times"""
+        codes = [self._keycode(k) for k in keys]
+        with self._lock:
+            for _ in range(presses):
+                for code in codes:
+                    self._fake(X.KeyPress, code)
+                for code in reversed(codes):
+                    self._fake(X.KeyRelease, code)
+            self.flush()
+
+    def move(self, dx, dy):
+        """Relative pointer motion"""
+        with self._lock:
+            self._fake(X.MotionNotify, True, int(dx), int(dy))
+            self.flush()
+
+    def move_to(self, x, y):
+        """Absolute pointer position in root window pixels"""
+        with self._lock:
+            self._fake(X.MotionNotify, False, int(x), int(y))
+            self.flush()
+
+    def position(self):
+        """Pointer position (one round trip)"""
+        with self._lock:
+            pointer = self.display.screen().root.query_pointer()
+        return float(pointer.root_x), float(pointer.root_y)
+
+    def sync(self):
+        """Flush and wait until the server has processed everything sent"""
+        with self._lock:
+            self.display.sync()
+
+    def close(self):
+        if self.display is not None:
+            self.display.close()
+            self.display = None